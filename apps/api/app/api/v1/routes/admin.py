@@ -5,7 +5,7 @@ from decimal import Decimal
 from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
+from sqlalchemy import Date, String, cast, func, literal, null, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.app.core.config import Settings, get_settings
@@ -24,8 +24,6 @@ from apps.api.app.schemas.admin import (
     AdminSettingsRead,
     AdminPricingUpdate,
     AdminTransactionRead,
-    AdminUsageBucket,
-    AdminUsageBreakdownItem,
     AdminUsageAnalyticsRead,
     AdminUsageAnalyticsRowRead,
     AdminUsageSummaryRead,
@@ -68,7 +66,7 @@ async def get_pricing(
         items=[
             AdminPricingRead(
                 model_alias=row.model_alias,
-                multiplier=format_decimal(Decimal(str(row.multiplier))),
+                multiplier=format_decimal(row.multiplier),
                 pricing_version=row.pricing_version,
             )
             for row in rows
@@ -94,7 +92,7 @@ async def patch_pricing_multiplier(
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     return AdminPricingRead(
         model_alias=updated.model_alias,
-        multiplier=format_decimal(Decimal(str(updated.multiplier))),
+        multiplier=format_decimal(updated.multiplier),
         pricing_version=updated.pricing_version,
     )
 
@@ -119,29 +117,21 @@ async def get_usage_summary(
     if to_date is not None:
         conditions.append(func.date(LlmCallEvent.created_at) <= to_date)
 
-    totals_query = select(
-        func.coalesce(func.sum(LlmCallEvent.credits_burned), 0),
-        func.count(LlmCallEvent.id),
-        func.coalesce(func.sum(LlmCallEvent.output_tokens), 0),
+    # Totals, the per-model breakdown and the optional date buckets come back from one
+    # UNION ALL round-trip (a portable stand-in for GROUPING SETS, which SQLite lacks).
+    # Totals are the sum of the per-model groups, so they need no query of their own.
+    summary_query = select(
+        literal("model").label("kind"),
+        LlmCallEvent.model_alias.label("model_alias"),
+        cast(null(), Date).label("bucket"),
+        func.count(LlmCallEvent.id).label("call_count"),
+        func.coalesce(func.sum(LlmCallEvent.credits_burned), 0).label("credits_burned"),
+        func.coalesce(func.sum(LlmCallEvent.output_tokens), 0).label("output_tokens"),
     )
     if conditions:
-        totals_query = totals_query.where(*conditions)
-    totals_row = (await db.execute(totals_query)).one()
-    total_credits = Decimal(str(totals_row[0]))
-    total_calls = int(totals_row[1] or 0)
-    total_output_tokens = int(totals_row[2] or 0)
-
-    breakdown_query = select(
-        LlmCallEvent.model_alias,
-        func.count(LlmCallEvent.id),
-        func.coalesce(func.sum(LlmCallEvent.credits_burned), 0),
-    )
-    if conditions:
-        breakdown_query = breakdown_query.where(*conditions)
-    breakdown_query = breakdown_query.group_by(LlmCallEvent.model_alias).order_by(LlmCallEvent.model_alias.asc())
-    breakdown_rows = (await db.execute(breakdown_query)).all()
+        summary_query = summary_query.where(*conditions)
+    summary_query = summary_query.group_by(LlmCallEvent.model_alias)
 
-    daily_rows: list[tuple[object, int, Decimal]] = []
     if bucket in {"day", "week", "month"}:
         dialect = db.bind.dialect.name if db.bind is not None else ""
         if bucket == "day":
@@ -162,14 +152,23 @@ async def get_usage_summary(
                 bucket_expr = func.date(func.date_trunc("month", LlmCallEvent.created_at))
 
         daily_query = select(
+            literal("bucket"),
+            cast(null(), String),
             bucket_expr,
             func.count(LlmCallEvent.id),
             func.coalesce(func.sum(LlmCallEvent.credits_burned), 0),
+            literal(0),
         )
         if conditions:
             daily_query = daily_query.where(*conditions)
-        daily_query = daily_query.group_by(bucket_expr).order_by(bucket_expr.asc())
-        daily_rows = (await db.execute(daily_query)).all()
+        summary_query = union_all(summary_query, daily_query.group_by(bucket_expr))
+
+    summary_rows = (await db.execute(summary_query.order_by("kind", "model_alias", "bucket"))).all()
+    breakdown_rows = [row for row in summary_rows if row.kind == "model"]
+    daily_rows = [row for row in summary_rows if row.kind == "bucket"]
+    total_credits = sum((Decimal(str(row.credits_burned)) for row in breakdown_rows), Decimal("0"))
+    total_calls = sum(int(row.call_count) for row in breakdown_rows)
+    total_output_tokens = sum(int(row.output_tokens or 0) for row in breakdown_rows)
 
     def _bucket_to_date(value: object) -> date:
         if isinstance(value, date):
@@ -177,28 +176,32 @@ async def get_usage_summary(
         parsed = str(value)[:10]
         return date.fromisoformat(parsed)
 
-    return AdminUsageSummaryRead(
-        total_credits_burned=format_decimal(total_credits),
-        total_llm_calls=total_calls,
-        total_output_tokens=total_output_tokens,
-        from_date=from_date,
-        to_date=to_date,
-        breakdown=[
-            AdminUsageBreakdownItem(
-                model_alias=row[0],
-                call_count=int(row[1]),
-                credits_burned=format_decimal(Decimal(str(row[2]))),
-            )
-            for row in breakdown_rows
-        ],
-        daily=[
-            AdminUsageBucket(
-                date=_bucket_to_date(row[0]),
-                call_count=int(row[1]),
-                credits_burned=format_decimal(Decimal(str(row[2]))),
-            )
-            for row in daily_rows
-        ],
+    # One model_validate over plain dicts lets pydantic-core build the nested lists in a single
+    # pass instead of calling a Python-level __init__ per breakdown row and bucket.
+    return AdminUsageSummaryRead.model_validate(
+        {
+            "total_credits_burned": format_decimal(total_credits),
+            "total_llm_calls": total_calls,
+            "total_output_tokens": total_output_tokens,
+            "from_date": from_date,
+            "to_date": to_date,
+            "breakdown": [
+                {
+                    "model_alias": row.model_alias,
+                    "call_count": int(row.call_count),
+                    "credits_burned": format_decimal(Decimal(str(row.credits_burned))),
+                }
+                for row in breakdown_rows
+            ],
+            "daily": [
+                {
+                    "date": _bucket_to_date(row.bucket),
+                    "call_count": int(row.call_count),
+                    "credits_burned": format_decimal(Decimal(str(row.credits_burned))),
+                }
+                for row in daily_rows
+            ],
+        }
     )
 
 
@@ -360,21 +363,31 @@ async def get_wallet_for_user(
     _: dict[str, str] = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ) -> AdminWalletRead:
-    wallet = await db.scalar(select(CreditWallet).where(CreditWallet.user_id == user_id))
+    # Only the serialized columns are selected; the view never needs ORM instances.
+    wallet = (
+        await db.execute(select(CreditWallet.balance).where(CreditWallet.user_id == user_id))
+    ).first()
     if wallet is None:
         raise HTTPException(status_code=404, detail="Wallet not found.")
 
-    tx_rows = await db.scalars(
-        select(CreditTransaction)
+    tx_rows = await db.execute(
+        select(
+            CreditTransaction.id,
+            CreditTransaction.kind,
+            CreditTransaction.amount,
+            CreditTransaction.initiated_by,
+            CreditTransaction.note,
+            CreditTransaction.created_at,
+        )
         .where(CreditTransaction.user_id == user_id)
-        .order_by(CreditTransaction.created_at.desc())
+        .order_by(CreditTransaction.created_at.desc(), CreditTransaction.id.desc())
         .limit(10)
     )
     transactions = [
         AdminTransactionRead(
             id=row.id,
             kind=row.kind,
-            amount=format_decimal(Decimal(str(row.amount))),
+            amount=format_decimal(row.amount),
             initiated_by=row.initiated_by,
             note=row.note,
             created_at=row.created_at,
@@ -383,7 +396,7 @@ async def get_wallet_for_user(
     ]
     return AdminWalletRead(
         user_id=user_id,
-        balance=format_decimal(Decimal(str(wallet.balance))),
+        balance=format_decimal(wallet.balance),
         recent_transactions=transactions,
     )
 
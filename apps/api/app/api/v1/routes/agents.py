@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 import json
 from uuid import uuid4
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
@@ -19,8 +20,8 @@ router = APIRouter(prefix="/agents", tags=["agents"])
 
 def _parse_tool_permissions(raw: str) -> list[str]:
     try:
-        parsed = json.loads(raw)
-    except (TypeError, json.JSONDecodeError):
+        parsed = orjson.loads(raw)
+    except (TypeError, orjson.JSONDecodeError):
         return []
     if not isinstance(parsed, list):
         return []
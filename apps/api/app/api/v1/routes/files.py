@@ -12,7 +12,7 @@ from apps.api.app.db.models import UploadedFile
 from apps.api.app.db.session import get_db
 from apps.api.app.dependencies.arq import get_arq_redis
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.dependencies.rooms import get_owned_active_room_or_404
+from apps.api.app.dependencies.rooms import ensure_owned_active_room_or_404
 from apps.api.app.schemas.files import UploadedFileRead
 from apps.api.app.services.storage.supabase_storage import StorageService, get_storage_service
 
@@ -57,7 +57,7 @@ async def upload_room_file(
     arq_redis: ArqRedis = Depends(get_arq_redis),
 ) -> UploadedFileRead:
     user_id = current_user["user_id"]
-    await get_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
+    await ensure_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
 
     filename = (file.filename or "").strip()
     if not filename:
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-import json
 from uuid import uuid4
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from apps.api.app.db.models import Agent, Room, RoomAgent, User
 from apps.api.app.db.session import get_db
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.dependencies.rooms import get_owned_active_room_or_404
+from apps.api.app.dependencies.rooms import ensure_owned_active_room_or_404, get_owned_active_room_or_404
 from apps.api.app.schemas.agents import AgentRead
 from apps.api.app.schemas.rooms import (
     RoomAgentCreateRequest,
@@ -41,8 +41,8 @@ def _room_to_read(room: Room) -> RoomRead:
 
 def _agent_model_to_read(agent: Agent) -> AgentRead:
     try:
-        tool_permissions = json.loads(agent.tool_permissions_json)
-    except json.JSONDecodeError:
+        tool_permissions = orjson.loads(agent.tool_permissions_json)
+    except orjson.JSONDecodeError:
         tool_permissions = []
     if not isinstance(tool_permissions, list):
         tool_permissions = []
@@ -158,7 +158,8 @@ async def patch_room_mode(
     user_id = current_user["user_id"]
     room = await get_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
 
-    requested_mode = payload.mode.strip().lower()
+    # payload.mode arrives stripped (StrippedStr); the set literal compiles to a frozenset lookup.
+    requested_mode = payload.mode.lower()
     if requested_mode not in {"manual", "roundtable", "orchestrator"}:
         raise HTTPException(
             status_code=422,
@@ -180,7 +181,7 @@ async def create_room_agent(
     db: AsyncSession = Depends(get_db),
 ) -> RoomAgentRead:
     user_id = current_user["user_id"]
-    await get_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
+    await ensure_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
     agent = await db.scalar(
         select(Agent).where(
             Agent.id == payload.agent_id,
@@ -228,7 +229,7 @@ async def list_room_agents(
     db: AsyncSession = Depends(get_db),
 ) -> list[RoomAgentRead]:
     user_id = current_user["user_id"]
-    await get_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
+    await ensure_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
 
     result = await db.scalars(
         select(RoomAgent)
@@ -251,7 +252,7 @@ async def delete_room_agent(
     db: AsyncSession = Depends(get_db),
 ) -> Response:
     user_id = current_user["user_id"]
-    await get_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
+    await ensure_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
 
     agent = await db.scalar(
         select(RoomAgent).where(
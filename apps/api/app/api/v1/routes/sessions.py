@@ -4,18 +4,20 @@ from dataclasses import dataclass
 import json
 from collections.abc import AsyncIterator
 from decimal import Decimal
+from heapq import merge
 import logging
 import re
 import time
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import StreamingResponse
-from sqlalchemy import case, func, select
+from sqlalchemy import case, func, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from apps.api.app.core.config import get_settings
 from apps.api.app.db.models import (
@@ -29,9 +31,10 @@ from apps.api.app.db.models import (
     Turn,
     TurnContextAudit,
 )
-from apps.api.app.db.session import get_db
+from apps.api.app.db.session import get_db, get_session_factory
+from apps.api.app.dependencies.arq import get_arq_redis_pool
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.dependencies.rooms import get_owned_active_room_or_404
+from apps.api.app.dependencies.rooms import ensure_owned_active_room_or_404
 from apps.api.app.schemas.chat import SessionRead, TurnCreateRequest, TurnRead
 from apps.api.app.schemas.chat import (
     SessionMessageListRead,
@@ -78,7 +81,9 @@ from apps.api.app.services.usage.meter import (
 from apps.api.app.services.usage.recorder import UsageRecord, UsageRecorder, get_usage_recorder
 
 router = APIRouter(tags=["sessions"])
-_TAG_PATTERN = re.compile(r"@([a-zA-Z0-9_]+)")
+_TAG_PATTERN = re.compile(r"@([A-Za-z0-9_]+)", re.ASCII)
+# Stored message role -> prompt role; tool rows are replayed as assistant context, others skipped.
+_HISTORY_ROLES: dict[str, str] = {"user": "user", "assistant": "assistant", "tool": "assistant"}
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -92,6 +97,19 @@ class _SelectedAgent:
     tool_permissions: tuple[str, ...]
 
 
+def _history_content(message: Message, current_agent_key: str | None) -> str:
+    # Other agents' shared replies carry a speaker tag so the current agent can tell them apart.
+    if (
+        message.role == "assistant"
+        and message.visibility == "shared"
+        and current_agent_key is not None
+        and message.source_agent_key is not None
+        and message.source_agent_key != current_agent_key
+    ):
+        return f"[{message.agent_name or message.source_agent_key}]: {message.content}"
+    return message.content
+
+
 def _session_to_read(session: Session) -> SessionRead:
     return SessionRead(
         id=session.id,
@@ -187,7 +205,8 @@ def _build_context_manager() -> ContextManager:
 
 
 def _sse_event(payload: dict[str, object]) -> str:
-    return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    # Emitted once per streamed token chunk; orjson keeps non-ASCII unescaped like ensure_ascii=False.
+    return f"data: {orjson.dumps(payload).decode('utf-8')}\n\n"
 
 
 async def _redis_incr_with_ttl(redis_pool: object, key: str, ttl_seconds: int) -> int:
@@ -247,7 +266,7 @@ async def create_session(
     db: AsyncSession = Depends(get_db),
 ) -> SessionRead:
     user_id = current_user["user_id"]
-    await get_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
+    await ensure_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
 
     session = Session(
         id=str(uuid4()),
@@ -255,10 +274,10 @@ async def create_session(
         agent_id=None,
         started_by_user_id=user_id,
         deleted_at=None,
+        created_at=datetime.now(timezone.utc),
     )
     db.add(session)
     await db.commit()
-    await db.refresh(session)
     return _session_to_read(session)
 
 
@@ -269,7 +288,7 @@ async def list_sessions(
     db: AsyncSession = Depends(get_db),
 ) -> list[SessionRead]:
     user_id = current_user["user_id"]
-    await get_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
+    await ensure_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
 
     result = await db.scalars(
         select(Session)
@@ -297,10 +316,10 @@ async def create_agent_session(
         agent_id=agent_id,
         started_by_user_id=user_id,
         deleted_at=None,
+        created_at=datetime.now(timezone.utc),
     )
     db.add(session)
     await db.commit()
-    await db.refresh(session)
     return _session_to_read(session)
 
 
@@ -332,7 +351,7 @@ async def delete_session(
     db: AsyncSession = Depends(get_db),
 ) -> Response:
     user_id = current_user["user_id"]
-    await get_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
+    await ensure_owned_active_room_or_404(db, room_id=room_id, user_id=user_id)
 
     session = await db.scalar(
         select(Session).where(
@@ -431,6 +450,7 @@ async def create_turn(
     request: Request,
     current_user: dict[str, str] = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
     mode_executor: TurnExecutor = Depends(get_mode_executor),
     llm_gateway: LlmGateway = Depends(get_llm_gateway),
     usage_recorder: UsageRecorder = Depends(get_usage_recorder),
@@ -438,7 +458,7 @@ async def create_turn(
 ) -> TurnRead:
     user_id = current_user["user_id"]
     settings = get_settings()
-    await check_turn_rate_limit(user_id, getattr(request.app.state, "arq_redis", None), settings)
+    await check_turn_rate_limit(user_id, await get_arq_redis_pool(request.app), settings)
     session, room, standalone_agent = await _get_owned_active_session_or_404(
         db, session_id=session_id, user_id=user_id
     )
@@ -563,6 +583,12 @@ async def create_turn(
 
     context_manager = _build_context_manager()
     next_turn_index = int(await db.scalar(select(func.max(Turn.turn_index)).where(Turn.session_id == session.id)) or 0)
+    # Nothing is staged yet, so end the read transaction without a commit and hand the
+    # pooled connection back while LLM calls run; the write phase checks out a fresh one.
+    # Loaded rows stay usable detached because nothing below lazy-loads relationships.
+    # Tools get the session factory rather than this session, so a tool call cannot
+    # re-open its transaction and pin a connection across the remaining LLM calls.
+    await db.close()
 
     share_same_turn_outputs = turn_mode == "roundtable"
     prior_roundtable_outputs: list[GatewayMessage] = []
@@ -590,35 +616,23 @@ async def create_turn(
             private_limit = max(settings.agent_private_context_turns_keep, 0) * 2
             if private_limit > 0 and len(private) > private_limit:
                 private = private[-private_limit:]
-            combined = sorted(shared + private, key=lambda item: (item.created_at, item.id))
+            # history_rows is ordered by (created_at, id), so both halves already are too and a
+            # linear merge reproduces the full sort.
+            combined = list(merge(shared, private, key=lambda item: (item.created_at, item.id)))
         else:
             combined = [item for item in history_rows if item.visibility == "shared"]
 
-        output: list[HistoryMessage] = []
-        for message in combined:
-            if message.role not in {"user", "assistant", "tool"}:
-                continue
-            role = "user" if message.role == "user" else "assistant"
-            content = message.content
-            if (
-                room is not None
-                and message.role == "assistant"
-                and message.visibility == "shared"
-                and current_agent_key is not None
-                and message.source_agent_key is not None
-                and message.source_agent_key != current_agent_key
-            ):
-                content = f"[{message.agent_name or message.source_agent_key}]: {message.content}"
-
-            output.append(
-                HistoryMessage(
-                    id=message.id,
-                    role=role,
-                    content=content,
-                    turn_id=message.turn_id,
-                )
+        tagging_agent_key = current_agent_key if room is not None else None
+        return [
+            HistoryMessage(
+                id=message.id,
+                role=role,
+                content=_history_content(message, tagging_agent_key),
+                turn_id=message.turn_id,
             )
-        return output
+            for message in combined
+            if (role := _HISTORY_ROLES.get(message.role)) is not None
+        ]
 
     async def _invoke_selected_agent(selected_agent: _SelectedAgent) -> tuple[str, bool]:
         nonlocal primary_context, turn_status
@@ -680,7 +694,7 @@ async def create_turn(
 
         try:
             gateway_response = await mode_executor.run_turn(
-                db,
+                session_factory,
                 TurnExecutionInput(
                     model_alias=selected_agent_alias,
                     messages=request_messages,
@@ -840,7 +854,7 @@ async def create_turn(
             )
     else:
         assistant_output_text = (
-            "\n\n".join([f"{entry_agent.name}: {content}" for entry_agent, content in assistant_entries])
+            "\n\n".join(f"{entry_agent.name}: {content}" for entry_agent, content in assistant_entries)
             if multi_agent_mode
             else (assistant_entries[0][1] if assistant_entries else "")
         )
@@ -850,18 +864,53 @@ async def create_turn(
             f"{assistant_output_text}\n\n---\n\n{synthesis_block}" if assistant_output_text else synthesis_block
         )
 
-    turn = Turn(
-        id=str(uuid4()),
-        session_id=session.id,
-        turn_index=next_turn_index + 1,
-        mode=turn_mode,
-        user_input=payload.message,
-        assistant_output=assistant_output_text,
-        status=turn_status,
-    )
-    db.add(turn)
+    # Both summarizer steps are LLM round-trips, so they run before the Turn insert opens the
+    # write transaction; the write phase below is DB statements only, ending in one commit.
+    summary: SessionSummary | None = None
+    if primary_context.generated_summary_text:
+        generated = await generate_summary_text(
+            raw_summary_text=primary_context.generated_summary_text,
+            gateway=llm_gateway,
+            model_alias=settings.summarizer_model_alias,
+        )
+        summary_used_fallback = generated.used_fallback
+        structure = await extract_summary_structure(
+            summary_text=generated.summary_text,
+            gateway=llm_gateway,
+            model_alias=settings.summarizer_model_alias,
+        )
+        summary = SessionSummary(
+            id=str(uuid4()),
+            session_id=session.id,
+            from_message_id=primary_context.summary_from_message_id,
+            to_message_id=primary_context.summary_to_message_id,
+            summary_text=generated.summary_text,
+            key_facts_json=json.dumps(structure.key_facts),
+            open_questions_json=json.dumps(structure.open_questions),
+            decisions_json=json.dumps(structure.decisions),
+            action_items_json=json.dumps(structure.action_items),
+        )
+
+    turn_id = str(uuid4())
+    turn_index = next_turn_index + 1
     try:
-        await db.flush()
+        # INSERT ... RETURNING surfaces the unique (session_id, turn_index) conflict and the
+        # server-assigned created_at in one round-trip, replacing add + flush + refresh.
+        turn_created_at = (
+            await db.execute(
+                insert(Turn)
+                .values(
+                    id=turn_id,
+                    session_id=session.id,
+                    turn_index=turn_index,
+                    mode=turn_mode,
+                    user_input=payload.message,
+                    assistant_output=assistant_output_text,
+                    status=turn_status,
+                )
+                .returning(Turn.created_at)
+            )
+        ).scalar_one()
     except IntegrityError as exc:
         await db.rollback()
         raise HTTPException(
@@ -871,7 +920,7 @@ async def create_turn(
 
     user_message = Message(
         id=str(uuid4()),
-        turn_id=turn.id,
+        turn_id=turn_id,
         session_id=session.id,
         role="user",
         visibility="shared",
@@ -887,7 +936,7 @@ async def create_turn(
             db.add(
                 Message(
                     id=str(uuid4()),
-                    turn_id=turn.id,
+                    turn_id=turn_id,
                     session_id=session.id,
                     role="assistant",
                     visibility="private",
@@ -901,7 +950,7 @@ async def create_turn(
             db.add(
                 Message(
                     id=str(uuid4()),
-                    turn_id=turn.id,
+                    turn_id=turn_id,
                     session_id=session.id,
                     role="tool",
                     visibility="private",
@@ -913,12 +962,13 @@ async def create_turn(
                 )
             )
 
-    for entry_agent, entry_content in assistant_entries:
-        db.add(
+    message_session_id = session.id
+    db.add_all(
+        [
             Message(
                 id=str(uuid4()),
-                turn_id=turn.id,
-                session_id=session.id,
+                turn_id=turn_id,
+                session_id=message_session_id,
                 role="assistant",
                 visibility="shared",
                 agent_key=entry_agent.agent_key,
@@ -927,12 +977,14 @@ async def create_turn(
                 mode=turn_mode,
                 content=entry_content,
             )
-        )
+            for entry_agent, entry_content in assistant_entries
+        ]
+    )
     if manager_synthesis_text:
         db.add(
             Message(
                 id=str(uuid4()),
-                turn_id=turn.id,
+                turn_id=turn_id,
                 session_id=session.id,
                 role="assistant",
                 visibility="shared",
@@ -944,34 +996,12 @@ async def create_turn(
             )
         )
 
-    if primary_context.generated_summary_text:
-        generated = await generate_summary_text(
-            raw_summary_text=primary_context.generated_summary_text,
-            gateway=llm_gateway,
-            model_alias=settings.summarizer_model_alias,
-        )
-        summary_used_fallback = generated.used_fallback
-        structure = await extract_summary_structure(
-            summary_text=generated.summary_text,
-            gateway=llm_gateway,
-            model_alias=settings.summarizer_model_alias,
-        )
-        summary = SessionSummary(
-            id=str(uuid4()),
-            session_id=session.id,
-            from_message_id=primary_context.summary_from_message_id,
-            to_message_id=primary_context.summary_to_message_id,
-            summary_text=generated.summary_text,
-            key_facts_json=json.dumps(structure.key_facts),
-            open_questions_json=json.dumps(structure.open_questions),
-            decisions_json=json.dumps(structure.decisions),
-            action_items_json=json.dumps(structure.action_items),
-        )
+    if summary is not None:
         db.add(summary)
 
     audit = TurnContextAudit(
         id=str(uuid4()),
-        turn_id=turn.id,
+        turn_id=turn_id,
         session_id=session.id,
         model_alias=model_alias_marker,
         model_context_limit=primary_context.model_context_limit,
@@ -987,6 +1017,7 @@ async def create_turn(
     )
     db.add(audit)
 
+    turn_credits_burned: list[float] = []
     for (
         usage_agent_id,
         usage_model_alias,
@@ -1011,7 +1042,7 @@ async def create_turn(
                 user_id=user_id,
                 room_id=session.room_id,
                 session_id=session.id,
-                turn_id=turn.id,
+                turn_id=turn_id,
                 model_alias=usage_model_alias,
                 provider_model=usage_provider_model,
                 input_tokens_fresh=usage_input_fresh,
@@ -1024,14 +1055,17 @@ async def create_turn(
                 agent_id=usage_agent_id,
             ),
         )
-        debit_result = await wallet_service.stage_debit(
+        turn_credits_burned.append(credits_burned)
+    if turn_credits_burned:
+        # One wallet update for the whole turn, still one ledger row per LLM call.
+        debit_results = await wallet_service.stage_debits(
             db,
             user_id=user_id,
-            credits_burned=credits_burned,
-            reference_id=turn.id,
-            note=f"turn:{turn.id}",
+            credits_burned=turn_credits_burned,
+            reference_id=turn_id,
+            note=f"turn:{turn_id}",
         )
-        last_debit_balance = debit_result.new_balance
+        last_debit_balance = debit_results[-1].new_balance
 
     for agent_key, tool_calls in tool_event_entries:
         for tool_call in tool_calls:
@@ -1041,7 +1075,7 @@ async def create_turn(
                     user_id=user_id,
                     room_id=session.room_id,
                     session_id=session.id,
-                    turn_id=turn.id,
+                    turn_id=turn_id,
                     agent_key=agent_key,
                     tool_name=tool_call.tool_name,
                     tool_input_json=tool_call.input_json,
@@ -1061,7 +1095,6 @@ async def create_turn(
             status_code=409,
             detail="Turn creation conflicted with concurrent writes. Please retry.",
         ) from exc
-    await db.refresh(turn)
 
     if last_debit_balance is None:
         balance_after = None
@@ -1071,13 +1104,13 @@ async def create_turn(
         low_balance = last_debit_balance < Decimal(str(settings.low_balance_threshold))
 
     return TurnRead(
-        id=turn.id,
-        session_id=turn.session_id,
-        turn_index=turn.turn_index,
-        mode=turn.mode,
-        user_input=turn.user_input,
-        assistant_output=turn.assistant_output or "",
-        status=turn.status,
+        id=turn_id,
+        session_id=session.id,
+        turn_index=turn_index,
+        mode=turn_mode,
+        user_input=payload.message,
+        assistant_output=assistant_output_text,
+        status=turn_status,
         model_alias_used=model_alias_marker,
         summary_triggered=primary_context.summary_triggered,
         prune_triggered=primary_context.prune_triggered,
@@ -1085,7 +1118,7 @@ async def create_turn(
         balance_after=balance_after,
         low_balance=low_balance,
         summary_used_fallback=summary_used_fallback,
-        created_at=turn.created_at,
+        created_at=turn_created_at,
     )
 
 
@@ -1102,7 +1135,7 @@ async def create_turn_stream(
 ) -> StreamingResponse:
     user_id = current_user["user_id"]
     settings = get_settings()
-    await check_turn_rate_limit(user_id, getattr(request.app.state, "arq_redis", None), settings)
+    await check_turn_rate_limit(user_id, await get_arq_redis_pool(request.app), settings)
     session, room, standalone_agent = await _get_owned_active_session_or_404(
         db, session_id=session_id, user_id=user_id
     )
@@ -1229,6 +1262,8 @@ async def create_turn_stream(
             or 0
         )
     next_turn_index = int(await db.scalar(select(func.max(Turn.turn_index)).where(Turn.session_id == session.id)) or 0)
+    # Release the pooled connection before streaming; it is re-acquired for the write phase.
+    await db.close()
     context_manager = _build_context_manager()
     share_same_turn_outputs = turn_mode == "roundtable"
 
@@ -1243,34 +1278,23 @@ async def create_turn_stream(
             private_limit = max(settings.agent_private_context_turns_keep, 0) * 2
             if private_limit > 0 and len(private) > private_limit:
                 private = private[-private_limit:]
-            combined = sorted(shared + private, key=lambda item: (item.created_at, item.id))
+            # history_rows is ordered by (created_at, id), so both halves already are too and a
+            # linear merge reproduces the full sort.
+            combined = list(merge(shared, private, key=lambda item: (item.created_at, item.id)))
         else:
             combined = [item for item in history_rows if item.visibility == "shared"]
 
-        output: list[HistoryMessage] = []
-        for message in combined:
-            if message.role not in {"user", "assistant", "tool"}:
-                continue
-            role = "user" if message.role == "user" else "assistant"
-            content = message.content
-            if (
-                room is not None
-                and message.role == "assistant"
-                and message.visibility == "shared"
-                and current_agent_key is not None
-                and message.source_agent_key is not None
-                and message.source_agent_key != current_agent_key
-            ):
-                content = f"[{message.agent_name or message.source_agent_key}]: {message.content}"
-            output.append(
-                HistoryMessage(
-                    id=message.id,
-                    role=role,
-                    content=content,
-                    turn_id=message.turn_id,
-                )
+        tagging_agent_key = current_agent_key if room is not None else None
+        return [
+            HistoryMessage(
+                id=message.id,
+                role=role,
+                content=_history_content(message, tagging_agent_key),
+                turn_id=message.turn_id,
             )
-        return output
+            for message in combined
+            if (role := _HISTORY_ROLES.get(message.role)) is not None
+        ]
 
     async def _stream_turn() -> AsyncIterator[str]:
         prior_roundtable_outputs: list[GatewayMessage] = []
@@ -1531,7 +1555,7 @@ async def create_turn_stream(
                 )
         else:
             assistant_output_text = (
-                "\n\n".join([f"{entry_agent.name}: {content}" for entry_agent, content in assistant_entries])
+                "\n\n".join(f"{entry_agent.name}: {content}" for entry_agent, content in assistant_entries)
                 if multi_agent_mode
                 else (assistant_entries[0][1] if assistant_entries else "")
             )
@@ -1541,22 +1565,49 @@ async def create_turn_stream(
                 f"{assistant_output_text}\n\n---\n\n{synthesis_block}" if assistant_output_text else synthesis_block
             )
 
-        turn = Turn(
-            id=str(uuid4()),
-            session_id=session.id,
-            turn_index=next_turn_index + 1,
-            mode=turn_mode,
-            user_input=payload.message,
-            assistant_output=assistant_output_text,
-            status=turn_status,
+        # Summarize before the Turn insert so neither LLM round-trip runs inside the write transaction.
+        summary: SessionSummary | None = None
+        if primary_context.generated_summary_text:
+            generated = await generate_summary_text(
+                raw_summary_text=primary_context.generated_summary_text,
+                gateway=llm_gateway,
+                model_alias=settings.summarizer_model_alias,
+            )
+            summary_used_fallback = generated.used_fallback
+            structure = await extract_summary_structure(
+                summary_text=generated.summary_text,
+                gateway=llm_gateway,
+                model_alias=settings.summarizer_model_alias,
+            )
+            summary = SessionSummary(
+                id=str(uuid4()),
+                session_id=session.id,
+                from_message_id=primary_context.summary_from_message_id,
+                to_message_id=primary_context.summary_to_message_id,
+                summary_text=generated.summary_text,
+                key_facts_json=json.dumps(structure.key_facts),
+                open_questions_json=json.dumps(structure.open_questions),
+                decisions_json=json.dumps(structure.decisions),
+                action_items_json=json.dumps(structure.action_items),
+            )
+
+        turn_id = str(uuid4())
+        await db.execute(
+            insert(Turn).values(
+                id=turn_id,
+                session_id=session.id,
+                turn_index=next_turn_index + 1,
+                mode=turn_mode,
+                user_input=payload.message,
+                assistant_output=assistant_output_text,
+                status=turn_status,
+            )
         )
-        db.add(turn)
-        await db.flush()
 
         db.add(
             Message(
                 id=str(uuid4()),
-                turn_id=turn.id,
+                turn_id=turn_id,
                 session_id=session.id,
                 role="user",
                 visibility="shared",
@@ -1567,12 +1618,13 @@ async def create_turn_stream(
                 content=payload.message,
             )
         )
-        for entry_agent, entry_content in assistant_entries:
-            db.add(
+        message_session_id = session.id
+        db.add_all(
+            [
                 Message(
                     id=str(uuid4()),
-                    turn_id=turn.id,
-                    session_id=session.id,
+                    turn_id=turn_id,
+                    session_id=message_session_id,
                     role="assistant",
                     visibility="shared",
                     agent_key=entry_agent.agent_key,
@@ -1581,12 +1633,14 @@ async def create_turn_stream(
                     mode=turn_mode,
                     content=entry_content,
                 )
-            )
+                for entry_agent, entry_content in assistant_entries
+            ]
+        )
         if manager_synthesis_text:
             db.add(
                 Message(
                     id=str(uuid4()),
-                    turn_id=turn.id,
+                    turn_id=turn_id,
                     session_id=session.id,
                     role="assistant",
                     visibility="shared",
@@ -1598,36 +1652,13 @@ async def create_turn_stream(
                 )
             )
 
-        if primary_context.generated_summary_text:
-            generated = await generate_summary_text(
-                raw_summary_text=primary_context.generated_summary_text,
-                gateway=llm_gateway,
-                model_alias=settings.summarizer_model_alias,
-            )
-            summary_used_fallback = generated.used_fallback
-            structure = await extract_summary_structure(
-                summary_text=generated.summary_text,
-                gateway=llm_gateway,
-                model_alias=settings.summarizer_model_alias,
-            )
-            db.add(
-                SessionSummary(
-                    id=str(uuid4()),
-                    session_id=session.id,
-                    from_message_id=primary_context.summary_from_message_id,
-                    to_message_id=primary_context.summary_to_message_id,
-                    summary_text=generated.summary_text,
-                    key_facts_json=json.dumps(structure.key_facts),
-                    open_questions_json=json.dumps(structure.open_questions),
-                    decisions_json=json.dumps(structure.decisions),
-                    action_items_json=json.dumps(structure.action_items),
-                )
-            )
+        if summary is not None:
+            db.add(summary)
 
         db.add(
             TurnContextAudit(
                 id=str(uuid4()),
-                turn_id=turn.id,
+                turn_id=turn_id,
                 session_id=session.id,
                 model_alias=model_alias_marker,
                 model_context_limit=primary_context.model_context_limit,
@@ -1643,6 +1674,7 @@ async def create_turn_stream(
             )
         )
 
+        turn_credits_burned: list[float] = []
         for (
             usage_agent_id,
             usage_model_alias,
@@ -1667,7 +1699,7 @@ async def create_turn_stream(
                     user_id=user_id,
                     room_id=session.room_id,
                     session_id=session.id,
-                    turn_id=turn.id,
+                    turn_id=turn_id,
                     model_alias=usage_model_alias,
                     provider_model=usage_provider_model,
                     input_tokens_fresh=usage_input_fresh,
@@ -1680,21 +1712,23 @@ async def create_turn_stream(
                     agent_id=usage_agent_id,
                 ),
             )
-            debit_result = await wallet_service.stage_debit(
+            turn_credits_burned.append(credits_burned)
+        if turn_credits_burned:
+            # One wallet update for the whole turn, still one ledger row per LLM call.
+            debit_results = await wallet_service.stage_debits(
                 db,
                 user_id=user_id,
-                credits_burned=credits_burned,
-                reference_id=turn.id,
-                note=f"turn:{turn.id}",
+                credits_burned=turn_credits_burned,
+                reference_id=turn_id,
+                note=f"turn:{turn_id}",
             )
-            last_debit_balance = debit_result.new_balance
+            last_debit_balance = debit_results[-1].new_balance
 
         await db.commit()
-        await db.refresh(turn)
 
         done_payload: dict[str, object] = {
             "type": "done",
-            "turn_id": turn.id,
+            "turn_id": turn_id,
             "provider_model": usage_entries[-1][2] if usage_entries else (active_agent.model_alias if active_agent else "unknown"),
             "summary_used_fallback": summary_used_fallback,
         }
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+from datetime import datetime
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, lambda_stmt, select, tuple_
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from apps.api.app.core.config import Settings, get_settings
-from apps.api.app.db.models import CreditTransaction, LlmCallEvent
-from apps.api.app.db.session import get_db
+from apps.api.app.db.models import CreditTransaction, CreditWallet, LlmCallEvent
+from apps.api.app.db.session import get_db_readonly, get_readonly_session_factory
 from apps.api.app.dependencies.auth import get_current_user
 from apps.api.app.schemas.users import (
+    ListCursorRead,
     TransactionListRead,
     TransactionRead,
     UsageEventRead,
@@ -26,6 +31,106 @@ from apps.api.app.utils.decimal_format import format_decimal
 router = APIRouter(prefix="/users", tags=["users"])
 
 
+async def _count_and_page(
+    db: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    count_stmt: StatementLambdaElement,
+    page_stmt: StatementLambdaElement,
+) -> tuple[int, list]:
+    # An AsyncSession cannot run two statements at once, so the COUNT goes through a
+    # short-lived second session and both round-trips overlap on separate connections.
+    async with session_factory() as count_db:
+        total, page = await asyncio.gather(count_db.scalar(count_stmt), db.execute(page_stmt))
+    return int(total or 0), page.all()
+
+
+async def _fetch_page(
+    db: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    count_stmt: StatementLambdaElement,
+    page_stmt: StatementLambdaElement,
+    limit: int,
+    include_total: bool,
+) -> tuple[int | None, list, bool]:
+    # Fetch one extra row to learn whether another page exists; the COUNT over the user's
+    # full history only runs when the caller explicitly asks for it.
+    fetch_limit = limit + 1
+    page_stmt += lambda stmt: stmt.limit(fetch_limit)
+    if include_total:
+        total, rows = await _count_and_page(db, session_factory, count_stmt=count_stmt, page_stmt=page_stmt)
+    else:
+        total, rows = None, (await db.execute(page_stmt)).all()
+    has_more = len(rows) > limit
+    return total, rows[:limit], has_more
+
+
+def _apply_cursor(
+    stmt: StatementLambdaElement,
+    *,
+    created_at_column,
+    id_column,
+    cursor_created_at: datetime | None,
+    cursor_id: str | None,
+) -> StatementLambdaElement:
+    # Keyset pagination: seek past the last (created_at, id) seen instead of OFFSET-scanning.
+    if cursor_created_at is None and cursor_id is None:
+        return stmt
+    if cursor_created_at is None or cursor_id is None:
+        raise HTTPException(status_code=422, detail="cursor_created_at and cursor_id must be provided together")
+    return stmt + (
+        lambda s: s.where(tuple_(created_at_column, id_column) < tuple_(cursor_created_at, cursor_id))
+    )
+
+
+def _next_cursor(rows: list, has_more: bool) -> ListCursorRead | None:
+    if not has_more or not rows:
+        return None
+    last = rows[-1]
+    return ListCursorRead(created_at=last.created_at, id=last.id)
+
+
+async def _list_version(db: AsyncSession, user_id: str):
+    # Every usage event and ledger row is committed in the same transaction as the wallet
+    # upsert in WalletService._stage_balance_change, which stamps updated_at on each write.
+    # Row timestamps cannot pin the lists: created_at is set before commit, so a row that
+    # commits late can land below a newer-stamped tip.
+    return (
+        await db.execute(
+            lambda_stmt(
+                lambda: select(CreditWallet.balance, CreditWallet.updated_at).where(CreditWallet.user_id == user_id)
+            )
+        )
+    ).first()
+
+
+def _list_etag(request: Request, user_id: str, version) -> str:
+    # The path separates the lists and the query string separates pages and options.
+    version_key = f"{version.balance}|{version.updated_at.isoformat()}" if version is not None else "empty"
+    digest = hashlib.sha256(
+        f"{user_id}|{version_key}|{request.url.path}|{request.url.query}".encode("utf-8")
+    ).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {candidate.strip() for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+def _not_modified(request: Request, etag: str) -> Response | None:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "private, no-cache"})
+    return None
+
+
+def _set_list_cache_headers(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
 def _compute_credits_to_grant(*, amount_usd: float, credits_per_usd: float) -> float:
     return round(amount_usd * credits_per_usd, 2)
 
@@ -33,13 +138,19 @@ def _compute_credits_to_grant(*, amount_usd: float, credits_per_usd: float) -> f
 @router.get("/me/wallet", response_model=WalletRead)
 async def get_my_wallet(
     current_user: dict[str, str] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_readonly),
     wallet_service: WalletService = Depends(get_wallet_service),
 ) -> WalletRead:
     user_id = current_user["user_id"]
-    wallet = await wallet_service.get_or_create_wallet(db, user_id=user_id)
-    await db.commit()
+    cached_balance = wallet_service.balance_cache.get(user_id)
+    if cached_balance is not None:
+        return WalletRead(user_id=user_id, balance=format_decimal(cached_balance))
+
+    wallet, created = await wallet_service.ensure_wallet(db, user_id=user_id)
+    if created:
+        await db.commit()
     balance = wallet.balance if wallet.balance is not None else Decimal("0")
+    wallet_service.balance_cache.set(user_id, balance)
     return WalletRead(user_id=user_id, balance=format_decimal(balance))
 
 
@@ -83,60 +194,125 @@ async def create_top_up_intent(
 
 @router.get("/me/usage", response_model=UsageListRead)
 async def get_my_usage(
+    request: Request,
+    response: Response,
     limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
+    cursor_created_at: datetime | None = Query(default=None),
+    cursor_id: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
     current_user: dict[str, str] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> UsageListRead:
+    db: AsyncSession = Depends(get_db_readonly),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_readonly_session_factory),
+) -> UsageListRead | Response:
     user_id = current_user["user_id"]
-    total = int(await db.scalar(select(func.count(LlmCallEvent.id)).where(LlmCallEvent.user_id == user_id)) or 0)
-    rows = await db.scalars(
-        select(LlmCallEvent)
-        .where(LlmCallEvent.user_id == user_id)
-        .order_by(LlmCallEvent.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+    page_stmt = _apply_cursor(
+        # Column projection: rows come back as plain tuples, skipping ORM instance construction.
+        # lambda_stmt caches the clause tree per call site; per-request values become bound params.
+        lambda_stmt(
+            lambda: select(
+                LlmCallEvent.id,
+                LlmCallEvent.model_alias,
+                LlmCallEvent.credits_burned,
+                LlmCallEvent.created_at,
+            ).where(LlmCallEvent.user_id == user_id)
+        ),
+        created_at_column=LlmCallEvent.created_at,
+        id_column=LlmCallEvent.id,
+        cursor_created_at=cursor_created_at,
+        cursor_id=cursor_id,
     )
+    # Read before the page, so a write landing in between only makes the ETag stale-early.
+    etag = _list_etag(request, user_id, await _list_version(db, user_id))
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    total, rows, has_more = await _fetch_page(
+        db,
+        session_factory,
+        count_stmt=lambda_stmt(lambda: select(func.count(LlmCallEvent.id)).where(LlmCallEvent.user_id == user_id)),
+        page_stmt=page_stmt + (lambda s: s.order_by(LlmCallEvent.created_at.desc(), LlmCallEvent.id.desc())),
+        limit=limit,
+        include_total=include_total,
+    )
+    _set_list_cache_headers(response, etag)
     events = [
         UsageEventRead(
             id=row.id,
             model_alias=row.model_alias,
-            credits_burned=format_decimal(Decimal(str(row.credits_burned))),
+            credits_burned=format_decimal(row.credits_burned),
             created_at=row.created_at,
         )
-        for row in rows.all()
+        for row in rows
     ]
-    return UsageListRead(events=events, total=total)
+    return UsageListRead(
+        events=events,
+        total=total,
+        has_more=has_more,
+        next_cursor=_next_cursor(rows, has_more),
+    )
 
 
 @router.get("/me/transactions", response_model=TransactionListRead)
 async def get_my_transactions(
+    request: Request,
+    response: Response,
     limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
+    cursor_created_at: datetime | None = Query(default=None),
+    cursor_id: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
     current_user: dict[str, str] = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
-) -> TransactionListRead:
+    db: AsyncSession = Depends(get_db_readonly),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_readonly_session_factory),
+) -> TransactionListRead | Response:
     user_id = current_user["user_id"]
-    total = int(
-        await db.scalar(select(func.count(CreditTransaction.id)).where(CreditTransaction.user_id == user_id)) or 0
+    page_stmt = _apply_cursor(
+        lambda_stmt(
+            lambda: select(
+                CreditTransaction.id,
+                CreditTransaction.kind,
+                CreditTransaction.amount,
+                CreditTransaction.initiated_by,
+                CreditTransaction.note,
+                CreditTransaction.reference_id,
+                CreditTransaction.created_at,
+            ).where(CreditTransaction.user_id == user_id)
+        ),
+        created_at_column=CreditTransaction.created_at,
+        id_column=CreditTransaction.id,
+        cursor_created_at=cursor_created_at,
+        cursor_id=cursor_id,
     )
-    rows = await db.scalars(
-        select(CreditTransaction)
-        .where(CreditTransaction.user_id == user_id)
-        .order_by(CreditTransaction.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+    # Read before the page, so a write landing in between only makes the ETag stale-early.
+    etag = _list_etag(request, user_id, await _list_version(db, user_id))
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    total, rows, has_more = await _fetch_page(
+        db,
+        session_factory,
+        count_stmt=lambda_stmt(
+            lambda: select(func.count(CreditTransaction.id)).where(CreditTransaction.user_id == user_id)
+        ),
+        page_stmt=page_stmt + (lambda s: s.order_by(CreditTransaction.created_at.desc(), CreditTransaction.id.desc())),
+        limit=limit,
+        include_total=include_total,
     )
+    _set_list_cache_headers(response, etag)
     transactions = [
         TransactionRead(
             id=row.id,
             kind=row.kind,
-            amount=format_decimal(Decimal(str(row.amount))),
+            amount=format_decimal(row.amount),
             initiated_by=row.initiated_by,
             note=row.note,
             reference_id=row.reference_id,
             created_at=row.created_at,
         )
-        for row in rows.all()
+        for row in rows
     ]
-    return TransactionListRead(transactions=transactions, total=total)
+    return TransactionListRead(
+        transactions=transactions,
+        total=total,
+        has_more=has_more,
+        next_cursor=_next_cursor(rows, has_more),
+    )
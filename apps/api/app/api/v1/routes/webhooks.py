@@ -1,13 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.app.core.config import Settings, get_settings
-from apps.api.app.db.models import CreditTransaction
 from apps.api.app.db.session import get_db
 from apps.api.app.services.billing.stripe_client import construct_webhook_event
 from apps.api.app.services.billing.wallet import WalletService, get_wallet_service
@@ -15,6 +15,12 @@ from apps.api.app.services.billing.wallet import WalletService, get_wallet_servi
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 _LOGGER = logging.getLogger(__name__)
 
+_HANDLED_EVENT_TYPE = "payment_intent.succeeded"
+# Stripe events are a few KB; reject anything far larger before reading or verifying it.
+_MAX_WEBHOOK_BYTES = 256 * 1024
+# Signature verification and parsing are CPU-bound; above this size they run off the event loop.
+_VERIFY_IN_THREAD_BYTES = 64 * 1024
+
 
 @router.post("/stripe")
 async def stripe_webhook(
@@ -23,29 +29,49 @@ async def stripe_webhook(
     settings: Settings = Depends(get_settings),
     wallet_service: WalletService = Depends(get_wallet_service),
 ) -> dict[str, str]:
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > _MAX_WEBHOOK_BYTES:
+        raise HTTPException(status_code=413, detail="webhook payload too large")
     payload = await request.body()
+    if len(payload) > _MAX_WEBHOOK_BYTES:
+        raise HTTPException(status_code=413, detail="webhook payload too large")
     sig_header = request.headers.get("Stripe-Signature", "")
 
+    try:
+        unverified_event = orjson.loads(payload)
+    except orjson.JSONDecodeError:
+        unverified_event = None
+    unverified_type = unverified_event.get("type") if isinstance(unverified_event, dict) else None
+    if isinstance(unverified_type, str) and unverified_type != _HANDLED_EVENT_TYPE:
+        # Event types we drop have no side effects, so skip the signature check for them.
+        # The handled type is still verified below before anything is written.
+        return {"status": "ignored"}
+
     if settings.stripe_webhook_secret:
         try:
-            event = construct_webhook_event(
-                payload=payload,
-                sig_header=sig_header,
-                secret=settings.stripe_webhook_secret,
-            )
+            if len(payload) > _VERIFY_IN_THREAD_BYTES:
+                event = await asyncio.to_thread(
+                    construct_webhook_event,
+                    payload=payload,
+                    sig_header=sig_header,
+                    secret=settings.stripe_webhook_secret,
+                )
+            else:
+                event = construct_webhook_event(
+                    payload=payload,
+                    sig_header=sig_header,
+                    secret=settings.stripe_webhook_secret,
+                )
         except Exception as exc:
             raise HTTPException(status_code=400, detail="invalid stripe signature") from exc
     else:
         _LOGGER.warning("stripe webhook secret is not configured; signature verification skipped.")
-        try:
-            import json
-
-            event = json.loads(payload.decode("utf-8"))
-        except Exception as exc:
-            raise HTTPException(status_code=422, detail="malformed webhook payload") from exc
+        if unverified_event is None:
+            raise HTTPException(status_code=422, detail="malformed webhook payload")
+        event = unverified_event
 
     event_type = event.get("type") if isinstance(event, dict) else getattr(event, "type", None)
-    if event_type != "payment_intent.succeeded":
+    if event_type != _HANDLED_EVENT_TYPE:
         return {"status": "ignored"}
 
     if isinstance(event, dict):
@@ -64,13 +90,9 @@ async def stripe_webhook(
     except (TypeError, ValueError) as exc:
         raise HTTPException(status_code=422, detail="malformed webhook metadata") from exc
 
-    existing = await db.scalar(
-        select(CreditTransaction).where(CreditTransaction.reference_id == str(payment_intent_id))
-    )
-    if existing is not None:
-        return {"status": "already_processed"}
-
-    await wallet_service.stage_grant(
+    # stage_grant_once plus the unique grant reference_id make Stripe retries idempotent in
+    # the same transaction as the grant, so there is no out-of-band claim that could go stale.
+    result = await wallet_service.stage_grant_once(
         db=db,
         user_id=str(user_id),
         amount=credits,
@@ -78,6 +100,8 @@ async def stripe_webhook(
         reference_id=str(payment_intent_id),
         initiated_by=None,
     )
+    if result is None:
+        return {"status": "already_processed"}
     await db.commit()
     return {"status": "ok"}
 
@@ -14,7 +14,7 @@ class Settings:
     supabase_url: str
     supabase_anon_key: str | None
     supabase_service_role_key: str
-    api_cors_allowed_origins: list[str]
+    api_cors_allowed_origins: frozenset[str]
     openrouter_api_key: str | None
     openrouter_base_url: str
     context_max_output_tokens: int
@@ -42,6 +42,7 @@ class Settings:
     rate_limit_turns_per_hour: int
     orchestrator_max_depth: int
     orchestrator_max_specialist_invocations: int
+    auth_cache_ttl_seconds: int
 
 
 def _int_env(name: str, default: int) -> int:
@@ -80,7 +81,8 @@ def get_settings() -> Settings:
     if not supabase_service_role_key:
         raise RuntimeError("SUPABASE_SERVICE_ROLE_KEY must be set.")
     raw_origins = os.getenv("API_CORS_ALLOWED_ORIGINS", "")
-    api_cors_allowed_origins = [origin.strip() for origin in raw_origins.split(",") if origin.strip()]
+    # CORSMiddleware checks `origin in allow_origins` on every cross-origin request.
+    api_cors_allowed_origins = frozenset(origin.strip() for origin in raw_origins.split(",") if origin.strip())
     raw_admin_user_ids = os.getenv("ADMIN_USER_IDS", "")
     admin_user_ids = tuple(user_id.strip() for user_id in raw_admin_user_ids.split(",") if user_id.strip())
 
@@ -116,4 +118,5 @@ def get_settings() -> Settings:
         rate_limit_turns_per_hour=_int_env("RATE_LIMIT_TURNS_PER_HOUR", 60),
         orchestrator_max_depth=_int_env("ORCHESTRATOR_MAX_DEPTH", 3),
         orchestrator_max_specialist_invocations=_int_env("ORCHESTRATOR_MAX_SPECIALIST_INVOCATIONS", 12),
+        auth_cache_ttl_seconds=_int_env("AUTH_CACHE_TTL_SECONDS", 30),
     )
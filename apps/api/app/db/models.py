@@ -9,6 +9,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -340,6 +341,15 @@ class CreditTransaction(Base):
             "kind IN ('grant', 'debit', 'refund')",
             name="ck_credit_transactions_kind",
         ),
+        # Debits share the turn id as reference_id, so uniqueness only applies to grants
+        # (Stripe payment intent ids); this backs webhook idempotency with one index probe.
+        Index(
+            "uq_credit_transactions_grant_reference_id",
+            "reference_id",
+            unique=True,
+            postgresql_where=text("kind = 'grant' AND reference_id IS NOT NULL"),
+            sqlite_where=text("kind = 'grant' AND reference_id IS NOT NULL"),
+        ),
     )
 
     id: Mapped[str] = mapped_column(String(64), primary_key=True)
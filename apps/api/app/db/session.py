@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 import os
+import re
 from collections.abc import AsyncIterator
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 
-_engine: AsyncEngine | None = None
-_session_factory: async_sessionmaker[AsyncSession] | None = None
+# Turn requests hold connections only around DB phases, but LLM-heavy traffic still
+# fans out wide; defaults are sized for that and can be tuned per deployment.
+_DEFAULT_POOL_SIZE = 20
+_DEFAULT_MAX_OVERFLOW = 40
+_DEFAULT_POOL_TIMEOUT_SECONDS = 10
+_DEFAULT_POOL_RECYCLE_SECONDS = 1800
+_POOL_MODES = ("internal", "external")
+_POSTGRES_DSN_SCHEME = re.compile(r"^postgresql(?:\+psycopg)?://")
 
 
 def _raw_database_pool_url() -> str:
@@ -17,36 +26,91 @@ def _raw_database_pool_url() -> str:
     return database_pool_url
 
 
+def _int_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise RuntimeError(f"{name} must be an integer.") from exc
+
+
+def _pool_mode() -> str:
+    mode = (os.getenv("DATABASE_POOL_MODE") or "internal").strip().lower()
+    if mode not in _POOL_MODES:
+        raise RuntimeError("DATABASE_POOL_MODE must be 'internal' or 'external'.")
+    return mode
+
+
+def _pool_kwargs() -> dict[str, object]:
+    if _pool_mode() == "external":
+        # PgBouncer already pools server connections; a second client-side pool only
+        # pins idle connections and hides PgBouncer's own queueing.
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": _int_env("DATABASE_POOL_SIZE", _DEFAULT_POOL_SIZE),
+        "max_overflow": _int_env("DATABASE_MAX_OVERFLOW", _DEFAULT_MAX_OVERFLOW),
+        "pool_timeout": _int_env("DATABASE_POOL_TIMEOUT_SECONDS", _DEFAULT_POOL_TIMEOUT_SECONDS),
+        "pool_recycle": _int_env("DATABASE_POOL_RECYCLE_SECONDS", _DEFAULT_POOL_RECYCLE_SECONDS),
+    }
+
+
 def _to_async_driver(dsn: str) -> str:
-    if dsn.startswith("postgresql+psycopg://"):
-        return dsn
-    if dsn.startswith("postgresql://"):
-        return dsn.replace("postgresql://", "postgresql+psycopg://", 1)
-    raise RuntimeError("DATABASE_POOL_URL must use a PostgreSQL DSN.")
-
-
-def get_engine() -> AsyncEngine:
-    global _engine
-    if _engine is None:
-        _engine = create_async_engine(_to_async_driver(_raw_database_pool_url()), pool_pre_ping=True)
-    return _engine
-
-
-def get_session_factory() -> async_sessionmaker[AsyncSession]:
-    global _session_factory
-    if _session_factory is None:
-        _session_factory = async_sessionmaker(
-            bind=get_engine(),
-            class_=AsyncSession,
-            expire_on_commit=False,
-            autoflush=False,
-            autocommit=False,
-        )
-    return _session_factory
-
-
-async def get_db() -> AsyncIterator[AsyncSession]:
-    session_factory = get_session_factory()
-    async with session_factory() as session:
+    async_dsn, matched = _POSTGRES_DSN_SCHEME.subn("postgresql+psycopg://", dsn, count=1)
+    if not matched:
+        raise RuntimeError("DATABASE_POOL_URL must use a PostgreSQL DSN.")
+    return async_dsn
+
+
+def create_engine_from_env() -> AsyncEngine:
+    return create_async_engine(
+        _to_async_driver(_raw_database_pool_url()),
+        pool_pre_ping=True,
+        **_pool_kwargs(),
+        # DATABASE_POOL_URL points at PgBouncer in transaction mode, which cannot
+        # route server-side prepared statements back to the same backend.
+        connect_args={"prepare_threshold": None},
+    )
+
+
+def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+        autocommit=False,
+    )
+
+
+def create_readonly_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # Shares the engine's pool; AUTOCOMMIT lets each read run as its own implicit transaction,
+    # saving the BEGIN and ROLLBACK round-trips a per-request transaction would cost.
+    return create_session_factory(engine.execution_options(isolation_level="AUTOCOMMIT"))
+
+
+def get_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    # Built once in the app lifespan; request handlers only read it off app.state.
+    session_factory = getattr(request.app.state, "session_factory", None)
+    if session_factory is None:
+        raise RuntimeError("Database session factory is not initialized; check DATABASE_POOL_URL.")
+    return session_factory
+
+
+async def get_db(request: Request) -> AsyncIterator[AsyncSession]:
+    async with get_session_factory(request)() as session:
         yield session
 
+
+def get_readonly_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    session_factory = getattr(request.app.state, "readonly_session_factory", None)
+    if session_factory is None:
+        raise RuntimeError("Database session factory is not initialized; check DATABASE_POOL_URL.")
+    return session_factory
+
+
+async def get_db_readonly(request: Request) -> AsyncIterator[AsyncSession]:
+    """Session for read-only GET handlers; any write it issues commits immediately."""
+    async with get_readonly_session_factory(request)() as session:
+        yield session
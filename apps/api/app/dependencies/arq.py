@@ -1,12 +1,64 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import logging
+import time
+
+from arq import create_pool
 from arq.connections import ArqRedis
-from fastapi import HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request
+
+_LOGGER = logging.getLogger(__name__)
+
+# create_pool retries for several seconds when Redis is down; don't pay that on every request.
+_ARQ_CONNECT_RETRY_AFTER_SECONDS = 30.0
+
+
+def _recently_failed(app: FastAPI) -> bool:
+    failed_at = getattr(app.state, "arq_redis_failed_at", None)
+    return failed_at is not None and time.monotonic() - failed_at < _ARQ_CONNECT_RETRY_AFTER_SECONDS
 
 
-def get_arq_redis(request: Request) -> ArqRedis:
-    redis_pool = getattr(request.app.state, "arq_redis", None)
+async def get_arq_redis_pool(app: FastAPI) -> ArqRedis | None:
+    """Return the app's ARQ pool, opening it on first use.
+
+    The lifespan only stores the parsed RedisSettings, so cold starts that never touch
+    Redis skip the connect + PING. Returns None when Redis is not configured or the last
+    connect attempt failed recently; callers already treat a missing pool as degraded mode.
+    """
+    redis_pool = getattr(app.state, "arq_redis", None)
+    if redis_pool is not None:
+        return redis_pool
+    redis_settings = getattr(app.state, "arq_redis_settings", None)
+    if redis_settings is None:
+        return None
+    if _recently_failed(app):
+        return None
+
+    lock = getattr(app.state, "arq_redis_lock", None)
+    if lock is None:
+        lock = app.state.arq_redis_lock = asyncio.Lock()
+    async with lock:
+        # Re-check both under the lock: waiters queued behind a failed attempt would
+        # otherwise each run their own connect in turn.
+        if app.state.arq_redis is None:
+            if _recently_failed(app):
+                return None
+            try:
+                # This runs on the request path, so fail fast and leave retrying to the
+                # backoff window instead of sleeping through arq's connect retries.
+                app.state.arq_redis = await create_pool(dataclasses.replace(redis_settings, conn_retries=0))
+            except Exception as exc:
+                app.state.arq_redis_failed_at = time.monotonic()
+                _LOGGER.warning("ARQ pool connect failed: %s", exc)
+                return None
+            app.state.arq_redis_failed_at = None
+    return app.state.arq_redis
+
+
+async def get_arq_redis(request: Request) -> ArqRedis:
+    redis_pool = await get_arq_redis_pool(request.app)
     if redis_pool is None:
         raise HTTPException(status_code=503, detail="Background queue is unavailable.")
     return redis_pool
-
@@ -1,21 +1,132 @@
 from __future__ import annotations
 
-from fastapi import Header, HTTPException
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
 
+import httpx
+import orjson
+from fastapi import HTTPException, Request
+
+from apps.api.app.core.config import get_settings
 from apps.api.app.services.auth.supabase_auth import verify_supabase_bearer_token
+from apps.api.app.utils.ttl_cache import TTLCache
 
+_LOGGER = logging.getLogger(__name__)
 
-def get_current_user(authorization: str | None = Header(default=None)) -> dict[str, str]:
-    if not authorization or not authorization.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing Bearer token.")
-    token = authorization.split(" ", 1)[1].strip()
-    if not token:
-        raise HTTPException(status_code=401, detail="Missing Bearer token.")
+# Verified identities are reused briefly so repeat requests skip the Supabase round-trip.
+# Failed verifications are never cached.
+_VERIFIED_USER_CACHE_MAX_TTL_SECONDS = 300
+_verified_user_cache: TTLCache[str, dict[str, str]] = TTLCache(
+    ttl_seconds=_VERIFIED_USER_CACHE_MAX_TTL_SECONDS,
+    maxsize=10_000,
+)
+
+
+def _token_cache_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+def _unverified_token_expiry(token: str) -> float | None:
+    # Only used to stop a cached identity from outliving its token; Supabase already
+    # verified the signature before anything is cached.
+    try:
+        payload_segment = token.split(".")[1]
+        payload = json.loads(base64.urlsafe_b64decode(payload_segment + "=" * (-len(payload_segment) % 4)))
+    except (IndexError, ValueError, binascii.Error):
+        return None
+    exp = payload.get("exp") if isinstance(payload, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def _cache_ttl_seconds(token: str) -> float:
+    ttl_seconds = float(get_settings().auth_cache_ttl_seconds)
+    expires_at = _unverified_token_expiry(token)
+    if expires_at is not None:
+        ttl_seconds = min(ttl_seconds, expires_at - time.time())
+    return ttl_seconds
+
+
+def _shared_cache_key(cache_key: str) -> str:
+    return f"auth:user:{cache_key}"
+
+
+async def _shared_cache_get(redis_pool: object | None, cache_key: str) -> dict[str, str] | None:
+    # Redis is an L2 shared by every worker process; any Redis failure just means a miss.
+    if redis_pool is None:
+        return None
     try:
-        user = verify_supabase_bearer_token(token)
+        raw = await redis_pool.get(_shared_cache_key(cache_key))
+    except Exception as exc:
+        _LOGGER.warning("auth shared cache read skipped: Redis error: %s", exc)
+        return None
+    if raw is None:
+        return None
+    try:
+        cached_user = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    return cached_user if isinstance(cached_user, dict) else None
+
+
+async def _shared_cache_set(
+    redis_pool: object | None,
+    cache_key: str,
+    current_user: dict[str, str],
+    ttl_seconds: float,
+) -> None:
+    if redis_pool is None or ttl_seconds < 1:
+        return
+    try:
+        await redis_pool.set(_shared_cache_key(cache_key), orjson.dumps(current_user), ex=int(ttl_seconds))
+    except Exception as exc:
+        _LOGGER.warning("auth shared cache write skipped: Redis error: %s", exc)
+
+
+async def authenticate_bearer_token(
+    token: str,
+    http_client: httpx.AsyncClient | None = None,
+    redis_pool: object | None = None,
+    redis_pool_getter: Callable[[], Awaitable[object | None]] | None = None,
+) -> dict[str, str]:
+    cache_key = _token_cache_key(token)
+    cached_user = _verified_user_cache.get(cache_key)
+    if cached_user is not None:
+        return cached_user
+
+    # The getter may open the Redis pool, so it only runs once the in-process cache misses.
+    if redis_pool is None and redis_pool_getter is not None:
+        redis_pool = await redis_pool_getter()
+    cached_user = await _shared_cache_get(redis_pool, cache_key)
+    if cached_user is not None:
+        _verified_user_cache.set(cache_key, cached_user, ttl_seconds=_cache_ttl_seconds(token))
+        return cached_user
+
+    try:
+        user = await verify_supabase_bearer_token(token, http_client=http_client)
     except ValueError as exc:
         raise HTTPException(status_code=401, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Auth verification failed: {exc}") from exc
-    return {"user_id": user["id"], "email": user.get("email") or ""}
+    current_user = {"user_id": user["id"], "email": user.get("email") or ""}
 
+    ttl_seconds = _cache_ttl_seconds(token)
+    _verified_user_cache.set(cache_key, current_user, ttl_seconds=ttl_seconds)
+    await _shared_cache_set(redis_pool, cache_key, current_user, ttl_seconds)
+    return current_user
+
+
+async def get_current_user(request: Request) -> dict[str, str]:
+    # BearerAuthMiddleware resolves the token once per request; this only reads its outcome.
+    state = request.scope.get("state") or {}
+    auth_error = state.get("auth_error")
+    if auth_error is not None:
+        raise auth_error
+    current_user = state.get("user")
+    if current_user is None:
+        raise HTTPException(status_code=401, detail="Missing Bearer token.")
+    return current_user
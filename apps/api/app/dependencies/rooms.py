@@ -18,3 +18,17 @@ async def get_owned_active_room_or_404(db: AsyncSession, *, room_id: str, user_i
     if room is None:
         raise HTTPException(status_code=404, detail="Room not found.")
     return room
+
+
+async def ensure_owned_active_room_or_404(db: AsyncSession, *, room_id: str, user_id: str) -> None:
+    # Ownership-only check for routes that never read the room row: selecting just the id
+    # lets Postgres answer from ix_rooms_owner_active_id without a heap fetch.
+    found = await db.scalar(
+        select(Room.id).where(
+            Room.id == room_id,
+            Room.owner_user_id == user_id,
+            Room.deleted_at.is_(None),
+        )
+    )
+    if found is None:
+        raise HTTPException(status_code=404, detail="Room not found.")
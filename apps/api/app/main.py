@@ -1,11 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
 import logging
 from contextlib import asynccontextmanager
 
-from arq import create_pool
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from apps.api.app.api.v1.routes.auth import router as auth_router
@@ -18,25 +18,67 @@ from apps.api.app.api.v1.routes.sessions import router as sessions_router
 from apps.api.app.api.v1.routes.users import router as users_router
 from apps.api.app.api.v1.routes.webhooks import router as webhooks_router
 from apps.api.app.core.config import get_settings
+from apps.api.app.db.session import (
+    create_engine_from_env,
+    create_readonly_session_factory,
+    create_session_factory,
+)
+from apps.api.app.middleware.bearer_auth import BearerAuthMiddleware
+from apps.api.app.services.auth.supabase_auth import build_auth_http_client
 from apps.api.app.workers.arq_worker import redis_settings_from_env
+from pantheon_llm import aclose_http_client as aclose_llm_http_client
 
 _LOGGER = logging.getLogger(__name__)
 
+_API_V1_PREFIX = "/api/v1"
+# Single source of truth for what the API serves; order matches route registration.
+_ROUTERS: tuple[tuple[APIRouter, str], ...] = (
+    (health_router, _API_V1_PREFIX),
+    (auth_router, _API_V1_PREFIX),
+    (admin_router, _API_V1_PREFIX),
+    (agents_router, _API_V1_PREFIX),
+    (rooms_router, _API_V1_PREFIX),
+    (files_router, _API_V1_PREFIX),
+    (sessions_router, _API_V1_PREFIX),
+    (users_router, _API_V1_PREFIX),
+    (webhooks_router, ""),
+)
+# Routes under /api/v1 that do not depend on get_current_user; everything else there
+# rejects anonymous requests in BearerAuthMiddleware before routing.
+_PUBLIC_API_PATHS = frozenset({f"{_API_V1_PREFIX}/health", f"{_API_V1_PREFIX}/graph-check"})
+
 
 @asynccontextmanager
 async def _lifespan(app: FastAPI):
+    app.state.db_engine = None
+    app.state.session_factory = None
+    app.state.readonly_session_factory = None
+    try:
+        db_engine = create_engine_from_env()
+    except RuntimeError as exc:
+        _LOGGER.warning("Database engine startup skipped: %s", exc)
+    else:
+        app.state.db_engine = db_engine
+        app.state.session_factory = create_session_factory(db_engine)
+        app.state.readonly_session_factory = create_readonly_session_factory(db_engine)
+
+    app.state.auth_http_client = build_auth_http_client()
+
+    # The ARQ pool itself is opened on first use (dependencies.arq.get_arq_redis_pool).
     app.state.arq_redis = None
+    app.state.arq_redis_settings = None
+    app.state.arq_redis_failed_at = None
+    app.state.arq_redis_lock = asyncio.Lock()
     try:
-        redis_settings = redis_settings_from_env()
+        app.state.arq_redis_settings = redis_settings_from_env()
     except RuntimeError as exc:
         _LOGGER.warning("ARQ pool startup skipped: %s", exc)
-    else:
-        app.state.arq_redis = await create_pool(redis_settings)
     try:
         yield
     finally:
         redis_pool = getattr(app.state, "arq_redis", None)
         if redis_pool is not None:
+            app.state.arq_redis = None
             aclose = getattr(redis_pool, "aclose", None)
             if callable(aclose):
                 await aclose()
@@ -46,11 +88,28 @@ async def _lifespan(app: FastAPI):
                     maybe_awaitable = close()
                     if inspect.isawaitable(maybe_awaitable):
                         await maybe_awaitable
+        auth_http_client = getattr(app.state, "auth_http_client", None)
+        if auth_http_client is not None:
+            app.state.auth_http_client = None
+            await auth_http_client.aclose()
+        await aclose_llm_http_client()
+        db_engine = getattr(app.state, "db_engine", None)
+        if db_engine is not None:
+            app.state.session_factory = None
+            app.state.readonly_session_factory = None
+            app.state.db_engine = None
+            await db_engine.dispose()
 
 
 def create_app() -> FastAPI:
     app = FastAPI(title="Pantheon API", version="0.1.0", lifespan=_lifespan)
     settings = get_settings()
+    # Registered before CORS so CORS stays outermost and answers preflights without auth work.
+    app.add_middleware(
+        BearerAuthMiddleware,
+        protected_prefix=f"{_API_V1_PREFIX}/",
+        public_paths=_PUBLIC_API_PATHS,
+    )
     if settings.api_cors_allowed_origins:
         app.add_middleware(
             CORSMiddleware,
@@ -59,15 +118,8 @@ def create_app() -> FastAPI:
             allow_methods=["*"],
             allow_headers=["*"],
         )
-    app.include_router(health_router, prefix="/api/v1")
-    app.include_router(auth_router, prefix="/api/v1")
-    app.include_router(admin_router, prefix="/api/v1")
-    app.include_router(agents_router, prefix="/api/v1")
-    app.include_router(rooms_router, prefix="/api/v1")
-    app.include_router(files_router, prefix="/api/v1")
-    app.include_router(sessions_router, prefix="/api/v1")
-    app.include_router(users_router, prefix="/api/v1")
-    app.include_router(webhooks_router)
+    for router, prefix in _ROUTERS:
+        app.include_router(router, prefix=prefix)
     return app
 
 
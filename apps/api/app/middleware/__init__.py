@@ -0,0 +1,8 @@
+"""ASGI middleware for the API app.
+
+Middleware here is written as plain ASGI classes (``__init__(app)`` plus
+``async __call__(scope, receive, send)``). Do not subclass Starlette's base HTTP
+middleware or use FastAPI's function-style ``http`` middleware decorator: both
+wrap every request in extra tasks and buffer streaming responses. CI rejects
+them under ``apps/api/app``.
+"""
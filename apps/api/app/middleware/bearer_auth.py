@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from functools import partial
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from apps.api.app.dependencies.arq import get_arq_redis_pool
+from apps.api.app.dependencies.auth import authenticate_bearer_token
+
+# Prebuilt once: anonymous probes of protected paths never reach routing or HTTPException.
+_MISSING_TOKEN_BODY = b'{"detail":"Missing Bearer token."}'
+_MISSING_TOKEN_HEADERS = (
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(_MISSING_TOKEN_BODY)).encode("ascii")),
+)
+
+
+async def _send_missing_token(send: Send) -> None:
+    # Outer middleware (CORS) appends to the headers list in place, so each response gets a copy.
+    await send({"type": "http.response.start", "status": 401, "headers": list(_MISSING_TOKEN_HEADERS)})
+    await send({"type": "http.response.body", "body": _MISSING_TOKEN_BODY})
+
+
+def _bearer_token(scope: Scope) -> str | None:
+    # Slice the raw header bytes; only a non-empty token is ever decoded.
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            if not value.startswith(b"Bearer "):
+                return None
+            token = value[7:].strip()
+            return token.decode("latin-1") if token else None
+    return None
+
+
+class BearerAuthMiddleware:
+    """Resolve the Bearer token once per request and leave the outcome in scope state.
+
+    Requests without a token under ``protected_prefix`` (other than ``public_paths``)
+    get the same 401 ``get_current_user`` would raise, sent straight from here.
+    Everything else passes through; verification failures are stored rather than
+    raised so they surface through FastAPI's normal HTTPException handling.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        protected_prefix: str | None = None,
+        public_paths: frozenset[str] = frozenset(),
+    ) -> None:
+        self.app = app
+        self.protected_prefix = protected_prefix
+        self.public_paths = public_paths
+
+    def _rejects_anonymous(self, scope: Scope) -> bool:
+        if self.protected_prefix is None or scope.get("method") == "OPTIONS":
+            return False
+        path = scope.get("path", "")
+        return path.startswith(self.protected_prefix) and path not in self.public_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = _bearer_token(scope)
+        if token is None and self._rejects_anonymous(scope):
+            await _send_missing_token(send)
+            return
+        if token is not None:
+            state = scope.setdefault("state", {})
+            app = scope.get("app")
+            app_state = getattr(app, "state", None)
+            try:
+                state["user"] = await authenticate_bearer_token(
+                    token,
+                    http_client=getattr(app_state, "auth_http_client", None),
+                    redis_pool_getter=partial(get_arq_redis_pool, app) if app_state is not None else None,
+                )
+            except HTTPException as exc:
+                state["auth_error"] = exc
+        await self.app(scope, receive, send)
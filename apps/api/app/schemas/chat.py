@@ -5,6 +5,8 @@ from typing import Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from apps.api.app.schemas.common import StrippedStr
+
 TurnMode = Literal["manual", "tag", "roundtable", "orchestrator"]
 SessionMode = Literal["manual", "tag", "roundtable", "orchestrator", "standalone"]
 
@@ -27,24 +29,14 @@ class SessionRead(BaseModel):
 class TurnCreateRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    message: str = Field(min_length=1)
-    model_alias_override: str | None = Field(default=None, max_length=64)
-
-    @field_validator("message")
-    @classmethod
-    def validate_message(cls, value: str) -> str:
-        trimmed = value.strip()
-        if not trimmed:
-            raise ValueError("message must not be blank.")
-        return trimmed
+    message: StrippedStr = Field(min_length=1)
+    model_alias_override: StrippedStr | None = Field(default=None, max_length=64)
 
     @field_validator("model_alias_override")
     @classmethod
     def validate_alias(cls, value: str | None) -> str | None:
-        if value is None:
-            return None
-        trimmed = value.strip()
-        return trimmed or None
+        # Already stripped by StrippedStr; a blank override means "no override".
+        return value or None
 
 
 class TurnRead(BaseModel):
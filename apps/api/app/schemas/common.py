@@ -1 +1,11 @@
-﻿"""Week 1 scaffold placeholder."""
+"""Shared schema types."""
+
+from __future__ import annotations
+
+from typing import Annotated
+
+from pydantic import StringConstraints
+
+# Whitespace is stripped inside pydantic-core before any Field(min_length/max_length)
+# constraint runs, so min_length=1 also rejects blank strings without a Python validator.
+StrippedStr = Annotated[str, StringConstraints(strip_whitespace=True)]
@@ -3,8 +3,9 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
 from apps.api.app.schemas.agents import AgentRead
+from apps.api.app.schemas.common import StrippedStr
 
 RoomMode = Literal["manual", "tag", "roundtable", "orchestrator"]
 
@@ -12,18 +13,10 @@ RoomMode = Literal["manual", "tag", "roundtable", "orchestrator"]
 class RoomCreateRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    name: str = Field(min_length=1, max_length=200)
+    name: StrippedStr = Field(min_length=1, max_length=200)
     goal: str | None = Field(default=None)
     current_mode: RoomMode = "orchestrator"
 
-    @field_validator("name")
-    @classmethod
-    def validate_name(cls, value: str) -> str:
-        trimmed = value.strip()
-        if not trimmed:
-            raise ValueError("name must not be blank.")
-        return trimmed
-
 
 class RoomRead(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -41,31 +34,15 @@ class RoomRead(BaseModel):
 class RoomModeUpdateRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    mode: str = Field(min_length=1, max_length=32)
-
-    @field_validator("mode")
-    @classmethod
-    def validate_mode_non_blank(cls, value: str) -> str:
-        trimmed = value.strip()
-        if not trimmed:
-            raise ValueError("mode must not be blank.")
-        return trimmed
+    mode: StrippedStr = Field(min_length=1, max_length=32)
 
 
 class RoomAgentCreateRequest(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
-    agent_id: str = Field(min_length=1, max_length=64)
+    agent_id: StrippedStr = Field(min_length=1, max_length=64)
     position: int | None = Field(default=None, ge=1)
 
-    @field_validator("agent_id")
-    @classmethod
-    def validate_non_blank_string(cls, value: str) -> str:
-        trimmed = value.strip()
-        if not trimmed:
-            raise ValueError("must not be blank.")
-        return trimmed
-
 
 class RoomAgentRead(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -21,11 +21,20 @@ class UsageEventRead(BaseModel):
     created_at: datetime
 
 
+class ListCursorRead(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    created_at: datetime
+    id: str
+
+
 class UsageListRead(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     events: list[UsageEventRead]
-    total: int
+    total: int | None = None
+    has_more: bool = False
+    next_cursor: ListCursorRead | None = None
 
 
 class TransactionRead(BaseModel):
@@ -44,7 +53,9 @@ class TransactionListRead(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     transactions: list[TransactionRead]
-    total: int
+    total: int | None = None
+    has_more: bool = False
+    next_cursor: ListCursorRead | None = None
 
 
 class WalletTopUpCreate(BaseModel):
@@ -1,20 +1,132 @@
 from __future__ import annotations
 
+import logging
+import time
+from functools import lru_cache
 from typing import Any
 
-from supabase import create_client
+import httpx
+import jwt
 
 from apps.api.app.core.config import get_settings
 
+_LOGGER = logging.getLogger(__name__)
 
-def verify_supabase_bearer_token(token: str) -> dict[str, Any]:
-    settings = get_settings()
-    client = create_client(settings.supabase_url, settings.supabase_service_role_key)
-    result = client.auth.get_user(token)
-    user = getattr(result, "user", None)
-    if user is None:
+_AUTH_HTTP_TIMEOUT_SECONDS = 5.0
+_JWKS_CACHE_TTL_SECONDS = 600.0
+# An unknown kid usually means Supabase rotated keys; refetch, but not more often than this.
+_JWKS_MIN_REFRESH_INTERVAL_SECONDS = 30.0
+_ASYMMETRIC_ALGORITHMS = ["ES256", "RS256"]
+_SUPABASE_AUDIENCE = "authenticated"
+
+_JWKS_CACHE: dict[str, Any] = {"keys": None, "fetched_at": 0.0}
+
+
+def build_auth_http_client() -> httpx.AsyncClient:
+    # One pooled client per app keeps TLS sessions to Supabase warm across requests; HTTP/2
+    # multiplexes concurrent verifications over those few connections.
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=_AUTH_HTTP_TIMEOUT_SECONDS,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+    )
+
+
+@lru_cache(maxsize=1)
+def _auth_base_url() -> str:
+    # Settings are fixed for the process lifetime, so derive the issuer URL once.
+    return f"{get_settings().supabase_url.rstrip('/')}/auth/v1"
+
+
+async def _fetch_jwks(http_client: httpx.AsyncClient) -> dict[str, jwt.PyJWK]:
+    response = await http_client.get(f"{_auth_base_url()}/.well-known/jwks.json")
+    response.raise_for_status()
+    jwk_set = jwt.PyJWKSet.from_dict(response.json())
+    return {key.key_id: key for key in jwk_set.keys if key.key_id}
+
+
+async def _signing_keys(http_client: httpx.AsyncClient, *, force_refresh: bool = False) -> dict[str, jwt.PyJWK]:
+    keys = _JWKS_CACHE["keys"]
+    age = time.monotonic() - _JWKS_CACHE["fetched_at"]
+    if keys is not None:
+        if age < _JWKS_CACHE_TTL_SECONDS and not force_refresh:
+            return keys
+        if force_refresh and age < _JWKS_MIN_REFRESH_INTERVAL_SECONDS:
+            return keys
+    try:
+        keys = await _fetch_jwks(http_client)
+    except (httpx.HTTPError, ValueError, jwt.PyJWKError) as exc:
+        # Keep serving the previous key set; callers fall back to the remote check without one.
+        _LOGGER.warning("Supabase JWKS refresh failed: %s", exc)
+        return _JWKS_CACHE["keys"] or {}
+    _JWKS_CACHE["keys"] = keys
+    _JWKS_CACHE["fetched_at"] = time.monotonic()
+    return keys
+
+
+async def _signing_key_for(http_client: httpx.AsyncClient, token: str) -> jwt.PyJWK | None:
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.DecodeError as exc:
+        raise ValueError("Invalid or expired token.") from exc
+    if header.get("alg") not in _ASYMMETRIC_ALGORITHMS:
+        # Legacy HS256 projects sign with a secret only Supabase holds.
+        return None
+    kid = header.get("kid")
+    keys = await _signing_keys(http_client)
+    if kid not in keys:
+        keys = await _signing_keys(http_client, force_refresh=True)
+    return keys.get(kid)
+
+
+async def _verify_remotely(http_client: httpx.AsyncClient, token: str) -> dict[str, Any]:
+    response = await http_client.get(
+        f"{_auth_base_url()}/user",
+        headers={
+            "Authorization": f"Bearer {token}",
+            "apikey": get_settings().supabase_service_role_key,
+        },
+    )
+    if response.status_code in (401, 403):
         raise ValueError("Invalid or expired token.")
+    response.raise_for_status()
+    user = response.json()
+    if not isinstance(user, dict) or not user.get("id"):
+        raise ValueError("Invalid or expired token.")
+    return {
+        "id": str(user["id"]),
+        "email": user.get("email"),
+    }
+
+
+async def _verify(http_client: httpx.AsyncClient, token: str) -> dict[str, Any]:
+    signing_key = await _signing_key_for(http_client, token)
+    if signing_key is None:
+        return await _verify_remotely(http_client, token)
+    try:
+        claims = jwt.decode(
+            token,
+            key=signing_key.key,
+            algorithms=_ASYMMETRIC_ALGORITHMS,
+            audience=_SUPABASE_AUDIENCE,
+            issuer=_auth_base_url(),
+            options={"require": ["exp", "sub"]},
+        )
+    except jwt.InvalidTokenError as exc:
+        raise ValueError("Invalid or expired token.") from exc
     return {
-        "id": str(user.id),
-        "email": user.email,
+        "id": str(claims["sub"]),
+        "email": claims.get("email"),
     }
+
+
+async def verify_supabase_bearer_token(
+    token: str,
+    http_client: httpx.AsyncClient | None = None,
+) -> dict[str, Any]:
+    # Tokens signed with a published asymmetric key are verified in-process against the
+    # cached JWKS; anything else goes to Supabase's /user endpoint.
+    if http_client is None:
+        async with build_auth_http_client() as transient_client:
+            return await _verify(transient_client, token)
+    return await _verify(http_client, token)
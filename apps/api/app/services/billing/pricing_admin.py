@@ -7,9 +7,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.app.db.models import ModelPricing, PricingVersion
 from apps.api.app.services.usage.meter import reload_pricing_cache
+from apps.api.app.utils.ttl_cache import TTLCache
+
+# The active version changes on the order of days; pricing edits go through
+# update_model_multiplier, which drops this entry in the process that made them.
+_ACTIVE_PRICING_VERSION_KEY = "active"
+_active_pricing_version_cache: TTLCache[str, str] = TTLCache(ttl_seconds=60.0, maxsize=1)
 
 
 async def get_active_pricing_version(db: AsyncSession) -> str:
+    cached_version = _active_pricing_version_cache.get(_ACTIVE_PRICING_VERSION_KEY)
+    if cached_version is not None:
+        return cached_version
+
     active_version = await db.scalar(
         select(PricingVersion.version)
         .where(PricingVersion.is_active.is_(True))
@@ -18,6 +28,7 @@ async def get_active_pricing_version(db: AsyncSession) -> str:
     )
     if active_version is None:
         raise ValueError("No active pricing version configured.")
+    _active_pricing_version_cache.set(_ACTIVE_PRICING_VERSION_KEY, active_version)
     return active_version
 
 
@@ -48,6 +59,7 @@ async def update_model_multiplier(
     row.multiplier = Decimal(str(new_multiplier))
     await db.commit()
     await db.refresh(row)
+    _active_pricing_version_cache.invalidate(_ACTIVE_PRICING_VERSION_KEY)
 
     active_rows = await list_model_pricing(db, pricing_version=pricing_version)
     reload_pricing_cache(
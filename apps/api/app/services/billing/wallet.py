@@ -1,20 +1,31 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
-from uuid import uuid4
 
-from sqlalchemy import select
+from sqlalchemy import event, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.api.app.db.models import CreditTransaction, CreditWallet
+from apps.api.app.utils.ids import uuid7
+from apps.api.app.utils.ttl_cache import TTLCache
 
 # Precision contract:
 # - credit_transactions.amount: Numeric(18,8) -> ledger truth, full precision
 # - llm_call_events.credits_burned: Numeric(20,4) -> usage summary, display precision
 # These are intentionally different. Do not normalize across them.
 
+_PENDING_BALANCE_INVALIDATIONS = "wallet_pending_balance_invalidations"
+
+
+def _dialect_insert(db: AsyncSession):
+    dialect = db.bind.dialect.name if db.bind is not None else ""
+    return sqlite_insert if dialect == "sqlite" else pg_insert
+
 
 @dataclass(frozen=True)
 class DebitResult:
@@ -25,19 +36,32 @@ class DebitResult:
 
 
 class WalletService:
+    def __init__(self) -> None:
+        # Invalidation only reaches this process; the TTL bounds staleness across workers.
+        self.balance_cache: TTLCache[str, Decimal] = TTLCache(ttl_seconds=2.0, maxsize=10_000)
+
     async def get_or_create_wallet(self, db: AsyncSession, user_id: str) -> CreditWallet:
+        wallet, _ = await self.ensure_wallet(db, user_id=user_id)
+        return wallet
+
+    async def ensure_wallet(self, db: AsyncSession, user_id: str) -> tuple[CreditWallet, bool]:
+        # The created flag lets read paths skip committing when no row was staged.
         wallet = await db.scalar(select(CreditWallet).where(CreditWallet.user_id == user_id))
         if wallet is not None:
-            return wallet
-
-        wallet = CreditWallet(
-            id=str(uuid4()),
-            user_id=user_id,
-            balance=Decimal("0"),
+            return wallet, False
+
+        # Concurrent first requests for a new user race on the user_id unique key; ON CONFLICT
+        # lets the loser read the winner's row in one extra probe instead of failing the flush.
+        inserted = await db.scalar(
+            _dialect_insert(db)(CreditWallet)
+            .values(id=str(uuid7()), user_id=user_id, balance=Decimal("0"))
+            .on_conflict_do_nothing(index_elements=[CreditWallet.user_id])
+            .returning(CreditWallet)
         )
-        db.add(wallet)
-        await db.flush()
-        return wallet
+        if inserted is not None:
+            return inserted, True
+        wallet = await db.scalar(select(CreditWallet).where(CreditWallet.user_id == user_id))
+        return wallet, False
 
     # initiated_by convention:
     # - Debits leave initiated_by=None for system-driven turns.
@@ -52,22 +76,85 @@ class WalletService:
         reference_id: str | None = None,
         note: str | None = None,
     ) -> DebitResult:
-        wallet = await self.get_or_create_wallet(db, user_id=user_id)
-        debit_amount = Decimal(str(max(credits_burned, 0.0)))
-        current_balance = wallet.balance if wallet.balance is not None else Decimal("0")
-        new_balance = current_balance - debit_amount
-        wallet.balance = new_balance
-        # Keep updated_at deterministic even if debit path is refactored to core UPDATE statements later.
-        wallet.updated_at = datetime.now(timezone.utc)
-
-        transaction_id = str(uuid4())
-        db.add(
-            CreditTransaction(
+        results = await self.stage_debits(
+            db,
+            user_id=user_id,
+            credits_burned=[credits_burned],
+            reference_id=reference_id,
+            note=note,
+        )
+        return results[0]
+
+    async def stage_debits(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        credits_burned: Sequence[float],
+        reference_id: str | None = None,
+        note: str | None = None,
+    ) -> list[DebitResult]:
+        """Stage several debits with one wallet update and one ledger row per amount.
+
+        A multi-agent turn burns credits once per LLM call; coalescing them takes the wallet
+        row lock once. Each result carries the running balance after its own debit.
+        """
+        debit_amounts = [Decimal(str(max(amount, 0.0))) for amount in credits_burned]
+        if not debit_amounts:
+            return []
+        wallet = await self._stage_balance_change(db, user_id=user_id, delta=-sum(debit_amounts))
+
+        # Ledger rows are append-only, so they skip the ORM unit of work and go out as one
+        # executemany instead of being tracked in the identity map until flush.
+        transaction_rows: list[dict[str, object]] = []
+        results: list[DebitResult] = []
+        running_balance = wallet.balance + sum(debit_amounts)
+        for debit_amount in debit_amounts:
+            running_balance -= debit_amount
+            transaction_id = str(uuid7())
+            transaction_rows.append(
+                {
+                    "id": transaction_id,
+                    "wallet_id": wallet.id,
+                    "user_id": user_id,
+                    "amount": -debit_amount,
+                    "kind": "debit",
+                    "reference_id": reference_id,
+                    "note": note,
+                }
+            )
+            results.append(
+                DebitResult(
+                    success=True,
+                    new_balance=running_balance,
+                    transaction_id=transaction_id,
+                    error=None,
+                )
+            )
+        await db.execute(insert(CreditTransaction), transaction_rows)
+        return results
+
+    async def stage_grant(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        amount: float,
+        note: str | None = None,
+        reference_id: str | None = None,
+        initiated_by: str | None = None,
+    ) -> DebitResult:
+        grant_amount = Decimal(str(max(amount, 0.0)))
+        wallet = await self._stage_balance_change(db, user_id=user_id, delta=grant_amount)
+        new_balance = wallet.balance
+
+        transaction_id = str(uuid7())
+        await db.execute(
+            insert(CreditTransaction).values(
                 id=transaction_id,
                 wallet_id=wallet.id,
                 user_id=user_id,
-                amount=-debit_amount,
-                kind="debit",
+                amount=grant_amount,
+                kind="grant",
+                initiated_by=initiated_by,
                 reference_id=reference_id,
                 note=note,
             )
@@ -79,26 +166,24 @@ class WalletService:
             error=None,
         )
 
-    async def stage_grant(
+    async def stage_grant_once(
         self,
         db: AsyncSession,
         user_id: str,
         amount: float,
+        reference_id: str,
         note: str | None = None,
-        reference_id: str | None = None,
         initiated_by: str | None = None,
-    ) -> DebitResult:
+    ) -> DebitResult | None:
+        """Stage a grant keyed by reference_id; returns None if that grant already exists."""
         grant_amount = Decimal(str(max(amount, 0.0)))
         wallet = await self.get_or_create_wallet(db, user_id=user_id)
-        current_balance = wallet.balance if wallet.balance is not None else Decimal("0")
-        new_balance = current_balance + grant_amount
-        wallet.balance = new_balance
-        wallet.updated_at = datetime.now(timezone.utc)
-
-        transaction_id = str(uuid4())
-        db.add(
-            CreditTransaction(
-                id=transaction_id,
+        # Idempotency lives in the INSERT itself via uq_credit_transactions_grant_reference_id,
+        # so there is no SELECT-then-INSERT race window.
+        transaction_id = await db.scalar(
+            _dialect_insert(db)(CreditTransaction)
+            .values(
+                id=str(uuid7()),
                 wallet_id=wallet.id,
                 user_id=user_id,
                 amount=grant_amount,
@@ -107,14 +192,60 @@ class WalletService:
                 reference_id=reference_id,
                 note=note,
             )
+            .on_conflict_do_nothing(
+                index_elements=[CreditTransaction.reference_id],
+                index_where=text("kind = 'grant' AND reference_id IS NOT NULL"),
+            )
+            .returning(CreditTransaction.id)
         )
+        if transaction_id is None:
+            return None
+
+        wallet = await self._stage_balance_change(db, user_id=user_id, delta=grant_amount)
         return DebitResult(
             success=True,
-            new_balance=new_balance,
+            new_balance=wallet.balance,
             transaction_id=transaction_id,
             error=None,
         )
 
+    async def _stage_balance_change(self, db: AsyncSession, *, user_id: str, delta: Decimal) -> CreditWallet:
+        # One atomic upsert replaces SELECT-then-UPDATE: it creates the wallet on first use, and
+        # concurrent changes for the same user serialize on the row instead of losing updates.
+        # That row lock (held until commit) is the only wallet lock; an advisory or FOR UPDATE
+        # lock would add a round-trip without closing any remaining race.
+        # populate_existing refreshes a wallet the session already holds, so pending ORM edits
+        # are flushed first rather than overwritten.
+        now = datetime.now(timezone.utc)
+        await db.flush()
+        wallet = await db.scalar(
+            _dialect_insert(db)(CreditWallet)
+            .values(id=str(uuid7()), user_id=user_id, balance=delta, updated_at=now)
+            .on_conflict_do_update(
+                index_elements=[CreditWallet.user_id],
+                set_={"balance": CreditWallet.balance + delta, "updated_at": now},
+            )
+            .returning(CreditWallet),
+            execution_options={"populate_existing": True},
+        )
+        self._invalidate_balance_after_commit(db, user_id)
+        return wallet
+
+    def _invalidate_balance_after_commit(self, db: AsyncSession, user_id: str) -> None:
+        # Invalidating at staging time would let a concurrent read re-cache the old committed
+        # balance before this commit lands, so the entry is dropped once the change is visible.
+        # A rolled-back change leaves the hook armed for the session's next commit, which is
+        # harmless: invalidation only ever forces a fresh read.
+        pending: set[str] | None = db.info.get(_PENDING_BALANCE_INVALIDATIONS)
+        if pending is None:
+            pending = db.info[_PENDING_BALANCE_INVALIDATIONS] = set()
+            event.listen(db.sync_session, "after_commit", self._invalidate_pending_balances, once=True)
+        pending.add(user_id)
+
+    def _invalidate_pending_balances(self, session) -> None:
+        for user_id in session.info.pop(_PENDING_BALANCE_INVALIDATIONS, ()):
+            self.balance_cache.invalidate(user_id)
+
 
 _wallet_service = WalletService()
 
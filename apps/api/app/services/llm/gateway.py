@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 from dataclasses import dataclass
-from math import ceil
 from collections.abc import AsyncIterator
 from typing import Any, Literal, Protocol
 
@@ -13,6 +12,8 @@ from pantheon_llm.openrouter_langchain import SUPPORTED_LLMS, get_chat_model
 
 MessageRole = Literal["system", "user", "assistant"]
 
+_STREAM_QUEUE_MAXSIZE = 64
+
 
 @dataclass(frozen=True)
 class GatewayMessage:
@@ -54,8 +55,47 @@ class LlmGateway(Protocol):
     async def stream(self, request: GatewayRequest) -> StreamingContext: ...
 
 
-def _estimate_tokens(text: str) -> int:
-    return max(1, ceil(len(text) / 4 * 1.25))
+# Token fallbacks for providers that omit usage; shared with the ReAct executor and the
+# context manager.
+def estimate_tokens(text: str) -> int:
+    # len() is O(1), so this needs no cache.
+    return estimate_tokens_for_length(len(text))
+
+
+def estimate_tokens_for_length(char_count: int) -> int:
+    # ceil(char_count / 4 * 1.25) in integer arithmetic.
+    return max(1, (char_count * 5 + 15) // 16)
+
+
+def estimate_messages_tokens(messages: list[GatewayMessage]) -> int:
+    return sum(estimate_tokens(message.content) for message in messages)
+
+
+def read_usage_metadata(usage_metadata: dict[str, Any]) -> tuple[int, int, int, int]:
+    """Return (input, output, total, cached) token counts, 0 where the provider sent none."""
+    input_details: dict[str, Any] = usage_metadata.get("input_token_details") or {}
+    return (
+        int(usage_metadata.get("input_tokens") or 0),
+        int(usage_metadata.get("output_tokens") or 0),
+        int(usage_metadata.get("total_tokens") or 0),
+        int(input_details.get("cache_read") or input_details.get("cached_tokens") or 0),
+    )
+
+
+def _content_parts(content: list[Any]) -> list[str]:
+    parts: list[str] = []
+    for item in content:
+        if isinstance(item, str):
+            parts.append(item)
+        elif isinstance(item, dict):
+            text_part = item.get("text")
+            if isinstance(text_part, str):
+                parts.append(text_part)
+        else:
+            maybe_text = getattr(item, "text", None)
+            if isinstance(maybe_text, str):
+                parts.append(maybe_text)
+    return parts
 
 
 def _extract_text(response: object) -> str:
@@ -67,59 +107,36 @@ def _extract_text(response: object) -> str:
     if isinstance(content, str):
         return content.strip()
     if isinstance(content, list):
-        chunks: list[str] = []
-        for item in content:
-            if isinstance(item, str):
-                chunks.append(item)
-            elif isinstance(item, dict) and isinstance(item.get("text"), str):
-                chunks.append(item["text"])
-            else:
-                maybe_text = getattr(item, "text", None)
-                if isinstance(maybe_text, str):
-                    chunks.append(maybe_text)
-        return " ".join(piece.strip() for piece in chunks if piece and piece.strip()).strip()
+        # Each piece is stripped once; the joined result needs no outer strip.
+        stripped_parts = [stripped for stripped in (part.strip() for part in _content_parts(content)) if stripped]
+        return " ".join(stripped_parts)
     return str(content).strip()
 
 
 def _extract_delta(chunk: object) -> str:
+    # Stream chunks are almost always plain strings, so that check runs first.
     content = getattr(chunk, "content", "")
     if isinstance(content, str):
         return content
     if isinstance(content, list):
-        parts: list[str] = []
-        for item in content:
-            if isinstance(item, str):
-                parts.append(item)
-            elif isinstance(item, dict):
-                text_part = item.get("text")
-                if isinstance(text_part, str):
-                    parts.append(text_part)
-            else:
-                maybe_text = getattr(item, "text", None)
-                if isinstance(maybe_text, str):
-                    parts.append(maybe_text)
-        return "".join(parts)
+        return "".join(_content_parts(content))
     return ""
 
 
+def _to_langchain_message(message: GatewayMessage) -> SystemMessage | HumanMessage | AIMessage:
+    if message.role == "system":
+        return SystemMessage(content=message.content)
+    if message.role == "assistant":
+        return AIMessage(content=message.content)
+    return HumanMessage(content=message.content)
+
+
 def _to_langchain_messages(messages: list[GatewayMessage]) -> list[SystemMessage | HumanMessage | AIMessage]:
-    converted: list[SystemMessage | HumanMessage | AIMessage] = []
-    for message in messages:
-        if message.role == "system":
-            converted.append(SystemMessage(content=message.content))
-        elif message.role == "assistant":
-            converted.append(AIMessage(content=message.content))
-        else:
-            converted.append(HumanMessage(content=message.content))
-    return converted
+    return [_to_langchain_message(message) for message in messages]
 
 
 class OpenRouterLlmGateway:
     async def generate(self, request: GatewayRequest) -> GatewayResponse:
-        if request.model_alias not in SUPPORTED_LLMS:
-            supported = ", ".join(sorted(SUPPORTED_LLMS.keys()))
-            raise ValueError(f"Unknown model alias '{request.model_alias}'. Supported: {supported}")
-
         llm = get_chat_model(alias=request.model_alias, max_tokens=request.max_output_tokens)
         response = await llm.ainvoke(_to_langchain_messages(request.messages))
 
@@ -129,16 +146,12 @@ class OpenRouterLlmGateway:
 
         provider_model = str(response_metadata.get("model_name") or SUPPORTED_LLMS[request.model_alias].model_id)
 
-        input_tokens = int(usage_metadata.get("input_tokens") or 0)
-        output_tokens = int(usage_metadata.get("output_tokens") or 0)
-        total_tokens = int(usage_metadata.get("total_tokens") or 0)
-        input_details: dict[str, Any] = usage_metadata.get("input_token_details") or {}
-        cached_tokens = int(input_details.get("cache_read") or input_details.get("cached_tokens") or 0)
+        input_tokens, output_tokens, total_tokens, cached_tokens = read_usage_metadata(usage_metadata)
 
         if input_tokens <= 0:
-            input_tokens = sum(_estimate_tokens(message.content) for message in request.messages)
+            input_tokens = estimate_messages_tokens(request.messages)
         if output_tokens <= 0:
-            output_tokens = _estimate_tokens(text)
+            output_tokens = estimate_tokens(text)
         if total_tokens <= 0:
             total_tokens = input_tokens + output_tokens
 
@@ -157,46 +170,48 @@ class OpenRouterLlmGateway:
         )
 
     async def stream(self, request: GatewayRequest) -> StreamingContext:
-        if request.model_alias not in SUPPORTED_LLMS:
-            supported = ", ".join(sorted(SUPPORTED_LLMS.keys()))
-            raise ValueError(f"Unknown model alias '{request.model_alias}'. Supported: {supported}")
-
         llm = get_chat_model(alias=request.model_alias, max_tokens=request.max_output_tokens)
         usage_future: asyncio.Future[GatewayUsage] = asyncio.get_running_loop().create_future()
         provider_model_future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
 
-        async def _iter_chunks() -> AsyncIterator[str]:
-            output_parts: list[str] = []
+        stream_errors: list[Exception] = []
+
+        async def _produce(queue: asyncio.Queue[str | None]) -> None:
+            # The assembled text is only needed for its length, so deltas are counted, not kept.
+            output_chars = 0
             input_tokens = 0
             output_tokens = 0
             total_tokens = 0
             cached_tokens = 0
             provider_model = SUPPORTED_LLMS[request.model_alias].model_id
+            provider_model_seen = False
             try:
                 async for chunk in llm.astream(_to_langchain_messages(request.messages)):
-                    response_metadata = getattr(chunk, "response_metadata", {}) or {}
-                    usage_metadata = getattr(chunk, "usage_metadata", {}) or {}
-                    if response_metadata.get("model_name"):
-                        provider_model = str(response_metadata["model_name"])
+                    # Model name and usage arrive on a handful of chunks; the per-token chunks in
+                    # between only pay one attribute read each.
+                    if not provider_model_seen:
+                        response_metadata = getattr(chunk, "response_metadata", None)
+                        model_name = response_metadata.get("model_name") if response_metadata else None
+                        if model_name:
+                            provider_model = str(model_name)
+                            provider_model_seen = True
+                    usage_metadata = getattr(chunk, "usage_metadata", None)
                     if usage_metadata:
-                        input_tokens = int(usage_metadata.get("input_tokens") or input_tokens or 0)
-                        output_tokens = int(usage_metadata.get("output_tokens") or output_tokens or 0)
-                        total_tokens = int(usage_metadata.get("total_tokens") or total_tokens or 0)
-                        input_details: dict[str, Any] = usage_metadata.get("input_token_details") or {}
-                        cached_tokens = int(
-                            input_details.get("cache_read") or input_details.get("cached_tokens") or cached_tokens or 0
-                        )
+                        chunk_input, chunk_output, chunk_total, chunk_cached = read_usage_metadata(usage_metadata)
+                        input_tokens = chunk_input or input_tokens
+                        output_tokens = chunk_output or output_tokens
+                        total_tokens = chunk_total or total_tokens
+                        cached_tokens = chunk_cached or cached_tokens
 
                     delta = _extract_delta(chunk)
                     if delta:
-                        output_parts.append(delta)
-                        yield delta
+                        output_chars += len(delta)
+                        await queue.put(delta)
 
-                assembled_text = "".join(output_parts)
                 if input_tokens <= 0:
-                    input_tokens = sum(_estimate_tokens(message.content) for message in request.messages)
+                    input_tokens = estimate_messages_tokens(request.messages)
                 if output_tokens <= 0:
-                    output_tokens = _estimate_tokens(assembled_text)
+                    output_tokens = estimate_tokens_for_length(output_chars)
                 if total_tokens <= 0:
                     total_tokens = input_tokens + output_tokens
 
@@ -211,11 +226,28 @@ class OpenRouterLlmGateway:
                 if not provider_model_future.done():
                     provider_model_future.set_result(provider_model)
             except Exception as exc:
+                stream_errors.append(exc)
                 if not usage_future.done():
                     usage_future.set_exception(exc)
                 if not provider_model_future.done():
                     provider_model_future.set_exception(exc)
-                raise
+            await queue.put(None)
+
+        async def _iter_chunks() -> AsyncIterator[str]:
+            # A producer task keeps reading OpenRouter while the consumer is busy writing the
+            # previous delta; the bounded queue caps how far it can run ahead.
+            queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=_STREAM_QUEUE_MAXSIZE)
+            producer = asyncio.create_task(_produce(queue))
+            try:
+                while (delta := await queue.get()) is not None:
+                    yield delta
+                if stream_errors:
+                    raise stream_errors[0]
+            finally:
+                # A consumer that stops early (client disconnect) must not leave the upstream
+                # stream running and burning tokens.
+                if not producer.done():
+                    producer.cancel()
 
         return StreamingContext(
             chunks=_iter_chunks(),
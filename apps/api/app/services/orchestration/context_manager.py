@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from bisect import bisect_left
 from dataclasses import dataclass
-from math import ceil, floor
+from itertools import accumulate
 from typing import Literal, Sequence
 
+from apps.api.app.services.llm.gateway import estimate_tokens, estimate_tokens_for_length
+
 
 ContextRole = Literal["system", "user", "assistant"]
 
@@ -65,10 +68,33 @@ class ContextManager:
 
     @staticmethod
     def estimate_tokens_text(text: str) -> int:
-        return max(1, ceil(len(text) / 4 * 1.25))
+        return estimate_tokens(text)
 
     def estimate_tokens(self, messages: Sequence[ContextMessage]) -> int:
-        return sum(self.estimate_tokens_text(message.content) for message in messages)
+        return sum(self.estimate_token_counts(messages))
+
+    @staticmethod
+    def estimate_token_counts(messages: Sequence[ContextMessage | HistoryMessage]) -> list[int]:
+        # Bulk form for whole histories: no per-message method lookup or float math.
+        return list(map(estimate_tokens_for_length, map(len, (message.content for message in messages))))
+
+    @staticmethod
+    def _assemble_messages(
+        system_messages: Sequence[ContextMessage],
+        generated_summary_message: ContextMessage | None,
+        latest_summary_message: ContextMessage | None,
+        history_messages: Sequence[HistoryMessage],
+        user_input: str,
+    ) -> list[ContextMessage]:
+        # Assembled once, in final order: system, new summary, prior summary, history, user.
+        messages = list(system_messages)
+        if generated_summary_message is not None:
+            messages.append(generated_summary_message)
+        if latest_summary_message is not None:
+            messages.append(latest_summary_message)
+        messages.extend(ContextMessage(role=item.role, content=item.content) for item in history_messages)
+        messages.append(ContextMessage(role="user", content=user_input))
+        return messages
 
     def prepare(
         self,
@@ -81,8 +107,9 @@ class ContextManager:
         user_input: str,
     ) -> ContextPreparation:
         model_limit = max(model_context_limit, 2048)
-        output_reserve = min(self.max_output_tokens, floor(model_limit * 0.20))
-        overhead_reserve = max(1024, floor(model_limit * 0.05))
+        # 20% and 5% of the limit, floored, without float math.
+        output_reserve = min(self.max_output_tokens, model_limit // 5)
+        overhead_reserve = max(1024, model_limit // 20)
         input_budget = model_limit - output_reserve - overhead_reserve
         if input_budget <= 0:
             raise ContextBudgetExceeded(
@@ -91,13 +118,43 @@ class ContextManager:
                 estimated_tokens=0,
             )
 
-        base_messages: list[ContextMessage] = list(system_messages)
-        if latest_summary_text:
-            base_messages.append(ContextMessage(role="system", content=f"Session summary: {latest_summary_text}"))
+        latest_summary_message = (
+            ContextMessage(role="system", content=f"Session summary: {latest_summary_text}")
+            if latest_summary_text
+            else None
+        )
+        # Every phase below shares the same base and user messages, and history messages only
+        # ever drop out, so each message is estimated once and phases are priced by arithmetic.
+        base_tokens = self.estimate_tokens(system_messages) + self.estimate_tokens_text(user_input)
+        if latest_summary_message is not None:
+            base_tokens += self.estimate_tokens_text(latest_summary_message.content)
+        history_tokens = self.estimate_token_counts(history_messages)
+        estimated_before = base_tokens + sum(history_tokens)
 
-        raw_history_messages = [ContextMessage(role=item.role, content=item.content) for item in history_messages]
-        before_messages = [*base_messages, *raw_history_messages, ContextMessage(role="user", content=user_input)]
-        estimated_before = self.estimate_tokens(before_messages)
+        should_summarize = (
+            estimated_before >= int(input_budget * self.summary_trigger_ratio)
+            or turn_count_since_last_summary >= self.mandatory_summary_turn
+        )
+        if not should_summarize and estimated_before < int(input_budget * self.prune_trigger_ratio):
+            # Common early-conversation case: nothing to summarize, prune or reject.
+            return ContextPreparation(
+                messages=self._assemble_messages(
+                    system_messages, None, latest_summary_message, history_messages, user_input
+                ),
+                model_context_limit=model_limit,
+                input_budget=input_budget,
+                output_reserve=output_reserve,
+                overhead_reserve=overhead_reserve,
+                estimated_input_tokens_before=estimated_before,
+                estimated_input_tokens_after_summary=estimated_before,
+                estimated_input_tokens_after_prune=estimated_before,
+                summary_triggered=False,
+                prune_triggered=False,
+                overflow_rejected=False,
+                generated_summary_text=None,
+                summary_from_message_id=None,
+                summary_to_message_id=None,
+            )
 
         summary_triggered = False
         prune_triggered = False
@@ -105,12 +162,8 @@ class ContextManager:
         summary_from_message_id: str | None = None
         summary_to_message_id: str | None = None
 
-        working_history = list(history_messages)
-
-        should_summarize = (
-            estimated_before >= int(input_budget * self.summary_trigger_ratio)
-            or turn_count_since_last_summary >= self.mandatory_summary_turn
-        )
+        working_history: Sequence[HistoryMessage] = history_messages
+        working_tokens = history_tokens
 
         if should_summarize:
             summarize_cutoff = max(len(working_history) - (self.recent_turns_to_keep * 2), 0)
@@ -124,45 +177,38 @@ class ContextManager:
                 # Structured summary fields (facts/decisions/open questions/action items) are deferred.
                 generated_summary_text = summary_payload[:1200]
                 working_history = working_history[summarize_cutoff:]
+                working_tokens = working_tokens[summarize_cutoff:]
 
-        summary_messages = [ContextMessage(role=item.role, content=item.content) for item in working_history]
-        after_summary_messages = [*base_messages, *summary_messages, ContextMessage(role="user", content=user_input)]
-        if generated_summary_text:
-            after_summary_messages.insert(
-                len(system_messages),
-                ContextMessage(role="system", content=f"Session summary: {generated_summary_text}"),
-            )
-        estimated_after_summary = self.estimate_tokens(after_summary_messages)
+        generated_summary_message = (
+            ContextMessage(role="system", content=f"Session summary: {generated_summary_text}")
+            if generated_summary_text
+            else None
+        )
+        summary_tokens = (
+            self.estimate_tokens_text(generated_summary_message.content) if generated_summary_message is not None else 0
+        )
+        estimated_after_summary = base_tokens + summary_tokens + sum(working_tokens)
+        estimated_after_prune = estimated_after_summary
 
         if estimated_after_summary >= int(input_budget * self.prune_trigger_ratio):
             prune_triggered = True
-            pruned = list(working_history)
-            while pruned:
-                prune_index = next(
-                    (idx for idx, item in enumerate(pruned) if item.role == "assistant"),
-                    0,
-                )
-                pruned.pop(prune_index)
-                candidate_messages = [ContextMessage(role=item.role, content=item.content) for item in pruned]
-                candidate = [*base_messages, *candidate_messages, ContextMessage(role="user", content=user_input)]
-                if generated_summary_text:
-                    candidate.insert(
-                        len(system_messages),
-                        ContextMessage(role="system", content=f"Session summary: {generated_summary_text}"),
-                    )
-                if self.estimate_tokens(candidate) <= input_budget:
-                    working_history = pruned
-                    break
-
-        final_history_messages = [ContextMessage(role=item.role, content=item.content) for item in working_history]
-        final_messages = [*base_messages, *final_history_messages, ContextMessage(role="user", content=user_input)]
-        if generated_summary_text:
-            final_messages.insert(
-                len(system_messages),
-                ContextMessage(role="system", content=f"Session summary: {generated_summary_text}"),
-            )
+            # Assistant messages go first (earliest first), then whatever is left from the front.
+            # Every message costs at least one token, so the running total of evicted tokens is
+            # strictly increasing and the shortest sufficient eviction prefix can be bisected.
+            eviction_order = [idx for idx, item in enumerate(working_history) if item.role == "assistant"]
+            eviction_order.extend(idx for idx, item in enumerate(working_history) if item.role != "assistant")
+            evicted_totals = list(accumulate(working_tokens[idx] for idx in eviction_order))
+            # At least one message is evicted once pruning triggers, even if already under budget.
+            cutoff = bisect_left(evicted_totals, estimated_after_summary - input_budget)
+            if cutoff < len(evicted_totals):
+                evicted = set(eviction_order[: cutoff + 1])
+                working_history = [item for idx, item in enumerate(working_history) if idx not in evicted]
+                estimated_after_prune = estimated_after_summary - evicted_totals[cutoff]
+
+        final_messages = self._assemble_messages(
+            system_messages, generated_summary_message, latest_summary_message, working_history, user_input
+        )
 
-        estimated_after_prune = self.estimate_tokens(final_messages)
         overflow_rejected = estimated_after_prune > input_budget
         if overflow_rejected:
             raise ContextBudgetExceeded(
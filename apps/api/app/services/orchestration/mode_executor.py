@@ -1,17 +1,19 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import inspect
 import logging
+import operator
 import time
+from contextvars import ContextVar
 from dataclasses import dataclass
 from functools import lru_cache
-from typing import Protocol, TypedDict
+from typing import Annotated, Protocol, TypedDict
 
+import orjson
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, StateGraph
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from apps.api.app.services.llm.gateway import (
     GatewayMessage,
@@ -29,6 +31,11 @@ from apps.api.app.services.tools.search_tool import SearchTool, TOOL_NAME as SEA
 
 _LOGGER = logging.getLogger(__name__)
 _POSTGRES_CHECKPOINTER_SETUP_DONE = False
+# The turn's session factory reaches the file_read node through this rather than a graph
+# closure, so compiled graphs stay session-free and can be cached per tool set.
+_TURN_SESSION_FACTORY: ContextVar[async_sessionmaker[AsyncSession] | None] = ContextVar(
+    "turn_session_factory", default=None
+)
 
 
 class TurnExecutionState(TypedDict, total=False):
@@ -44,7 +51,9 @@ class TurnExecutionState(TypedDict, total=False):
     tool_query: str | None
     room_id: str
     file_id_trigger: str | None
-    tool_events: list[dict[str, object]]
+    # Nodes return only their new events; the reducer appends them without copying the list.
+    # messages stays last-value: each turn's input must replace, not extend, a reused thread.
+    tool_events: Annotated[list[dict[str, object]], operator.add]
 
 
 @dataclass(frozen=True)
@@ -76,7 +85,9 @@ class ToolCallRecord:
 
 
 class TurnExecutor(Protocol):
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput: ...
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput: ...
 
 
 class LangGraphModeExecutor:
@@ -91,27 +102,37 @@ class LangGraphModeExecutor:
         self._file_read_tool = file_read_tool or get_file_read_tool()
         self._graphs: dict[tuple[str, ...], object] = {}
 
-    def _extract_search_query(self, messages: list[GatewayMessage]) -> str | None:
-        user_messages = [message.content.strip() for message in messages if message.role == "user" and message.content.strip()]
-        for latest in reversed(user_messages):
+    def _extract_tool_triggers(self, messages: list[GatewayMessage]) -> tuple[str | None, str | None]:
+        """Return (search_query, file_id) from the newest user messages carrying each trigger.
+
+        One newest-first pass serves both triggers and stops once each has been decided.
+        """
+        search_query: str | None = None
+        file_id: str | None = None
+        search_found = False
+        file_found = False
+        for message in reversed(messages):
+            if message.role != "user":
+                continue
+            latest = message.content.strip()
+            if not latest:
+                continue
             lowered = latest.lower()
-            if lowered.startswith("search:"):
-                query = latest.split(":", 1)[1].strip()
-                return query or None
-            if lowered.startswith("search for "):
-                query = latest[len("search for ") :].strip()
-                return query or None
-        return None
-
-    def _extract_file_id(self, messages: list[GatewayMessage]) -> str | None:
-        user_messages = [message.content.strip() for message in messages if message.role == "user" and message.content.strip()]
-        for latest in reversed(user_messages):
-            if latest.lower().startswith("file:"):
-                file_id = latest.split(":", 1)[1].strip()
-                return file_id or None
-        return None
-
-    def _compile_graph(self, allowed_tools: set[str], db: AsyncSession | None = None):
+            if not search_found:
+                if lowered.startswith("search:"):
+                    search_query = latest.split(":", 1)[1].strip() or None
+                    search_found = True
+                elif lowered.startswith("search for "):
+                    search_query = latest[len("search for ") :].strip() or None
+                    search_found = True
+            if not file_found and lowered.startswith("file:"):
+                file_id = latest.split(":", 1)[1].strip() or None
+                file_found = True
+            if search_found and file_found:
+                break
+        return search_query, file_id
+
+    def _compile_graph(self, allowed_tools: set[str]):
         async def call_model(state: TurnExecutionState) -> TurnExecutionState:
             response = await self._llm_gateway.generate(
                 GatewayRequest(
@@ -129,10 +150,12 @@ class LangGraphModeExecutor:
                 "usage_total_tokens": response.usage.total_tokens,
             }
 
-        async def maybe_search(state: TurnExecutionState) -> TurnExecutionState:
+        # Each tool step returns (added_messages, added_tool_events) so the steps can run alone
+        # as graph nodes or concurrently under run_tools without clobbering each other's state.
+        async def search_step(state: TurnExecutionState) -> tuple[list[GatewayMessage], list[dict[str, object]]]:
             query = state.get("tool_query")
             if not query:
-                return {}
+                return [], []
             started = time.monotonic()
             try:
                 results = await self._search_tool.search(query=query, max_results=5)
@@ -144,95 +167,109 @@ class LangGraphModeExecutor:
                     snippet = item.snippet or ""
                     lines.append(f"- {title} | {url} | {snippet}")
                 tool_text = "\n".join(lines) if lines else "- No search results returned."
-                enriched_messages = [
-                    *state["messages"],
-                    GatewayMessage(
-                        role="system",
-                        content=f"Tool({SEARCH_TOOL_NAME}) results for query '{query}':\n{tool_text}",
-                    ),
-                ]
+                tool_message = GatewayMessage(
+                    role="system",
+                    content=f"Tool({SEARCH_TOOL_NAME}) results for query '{query}':\n{tool_text}",
+                )
                 tool_event = {
                     "tool_name": SEARCH_TOOL_NAME,
-                    "input_json": json.dumps({"query": query}),
-                    "output_json": json.dumps({"result_count": len(results)}),
+                    "input_json": orjson.dumps({"query": query}).decode(),
+                    "output_json": orjson.dumps({"result_count": len(results)}).decode(),
                     "status": "success",
                     "latency_ms": latency_ms,
                 }
-                existing_events = state.get("tool_events") or []
-                return {"messages": enriched_messages, "tool_events": [*existing_events, tool_event]}
+                return [tool_message], [tool_event]
             except Exception as exc:
                 latency_ms = int((time.monotonic() - started) * 1000)
                 tool_event = {
                     "tool_name": SEARCH_TOOL_NAME,
-                    "input_json": json.dumps({"query": query}),
-                    "output_json": json.dumps({"error": str(exc)}),
+                    "input_json": orjson.dumps({"query": query}).decode(),
+                    "output_json": orjson.dumps({"error": str(exc)}).decode(),
                     "status": "error",
                     "latency_ms": latency_ms,
                 }
-                existing_events = state.get("tool_events") or []
-                return {"tool_events": [*existing_events, tool_event]}
+                return [], [tool_event]
 
-        async def maybe_file_read(state: TurnExecutionState) -> TurnExecutionState:
+        async def file_read_step(state: TurnExecutionState) -> tuple[list[GatewayMessage], list[dict[str, object]]]:
             file_id = state.get("file_id_trigger")
             if not file_id:
-                return {}
+                return [], []
             room_id = state.get("room_id") or ""
+            session_factory = _TURN_SESSION_FACTORY.get()
             started = time.monotonic()
             try:
-                if db is None:
+                if session_factory is None:
                     raise RuntimeError("DB session unavailable for file_read tool.")
-                result = await self._file_read_tool.read(file_id=file_id, room_id=room_id, db=db)
+                async with session_factory() as db:
+                    result = await self._file_read_tool.read(file_id=file_id, room_id=room_id, db=db)
             except Exception as exc:
                 latency_ms = int((time.monotonic() - started) * 1000)
                 tool_event = {
                     "tool_name": FILE_READ_TOOL_NAME,
-                    "input_json": json.dumps({"file_id": file_id}),
-                    "output_json": json.dumps({"error": str(exc)}),
+                    "input_json": orjson.dumps({"file_id": file_id}).decode(),
+                    "output_json": orjson.dumps({"error": str(exc)}).decode(),
                     "status": "error",
                     "latency_ms": latency_ms,
                 }
-                existing_events = state.get("tool_events") or []
-                return {"tool_events": [*existing_events, tool_event]}
+                return [], [tool_event]
 
             latency_ms = int((time.monotonic() - started) * 1000)
             if result.status == "completed":
-                enriched_messages = [
-                    *state["messages"],
-                    GatewayMessage(
-                        role="system",
-                        content=f"Tool({FILE_READ_TOOL_NAME}) content for file '{file_id}':\n{result.content or ''}",
-                    ),
-                ]
+                tool_message = GatewayMessage(
+                    role="system",
+                    content=f"Tool({FILE_READ_TOOL_NAME}) content for file '{file_id}':\n{result.content or ''}",
+                )
                 tool_event = {
                     "tool_name": FILE_READ_TOOL_NAME,
-                    "input_json": json.dumps({"file_id": file_id}),
-                    "output_json": json.dumps({"chars": len(result.content or "")}),
+                    "input_json": orjson.dumps({"file_id": file_id}).decode(),
+                    "output_json": orjson.dumps({"chars": len(result.content or "")}).decode(),
                     "status": "success",
                     "latency_ms": latency_ms,
                 }
-                existing_events = state.get("tool_events") or []
-                return {"messages": enriched_messages, "tool_events": [*existing_events, tool_event]}
+                return [tool_message], [tool_event]
 
             tool_event = {
                 "tool_name": FILE_READ_TOOL_NAME,
-                "input_json": json.dumps({"file_id": file_id}),
-                "output_json": json.dumps({"error": result.error, "result_status": result.status}),
+                "input_json": orjson.dumps({"file_id": file_id}).decode(),
+                "output_json": orjson.dumps({"error": result.error, "result_status": result.status}).decode(),
                 "status": "error",
                 "latency_ms": latency_ms,
             }
-            existing_events = state.get("tool_events") or []
-            return {"tool_events": [*existing_events, tool_event]}
+            return [], [tool_event]
+
+        def apply_tool_steps(
+            state: TurnExecutionState,
+            *steps: tuple[list[GatewayMessage], list[dict[str, object]]],
+        ) -> TurnExecutionState:
+            added_messages = [message for step_messages, _ in steps for message in step_messages]
+            added_events = [event for _, step_events in steps for event in step_events]
+            update: TurnExecutionState = {}
+            if added_messages:
+                update["messages"] = [*state["messages"], *added_messages]
+            if added_events:
+                update["tool_events"] = added_events
+            return update
+
+        async def maybe_search(state: TurnExecutionState) -> TurnExecutionState:
+            return apply_tool_steps(state, await search_step(state))
+
+        async def maybe_file_read(state: TurnExecutionState) -> TurnExecutionState:
+            return apply_tool_steps(state, await file_read_step(state))
+
+        async def run_tools(state: TurnExecutionState) -> TurnExecutionState:
+            # Search and file read are independent, so pre-model latency is the slower of the
+            # two rather than their sum; results merge in the fixed search, file_read order.
+            search_result, file_read_result = await asyncio.gather(search_step(state), file_read_step(state))
+            return apply_tool_steps(state, search_result, file_read_result)
 
         graph = StateGraph(TurnExecutionState)
         has_search = SEARCH_TOOL_NAME in allowed_tools
         has_file_read = FILE_READ_TOOL_NAME in allowed_tools
         if has_search and has_file_read:
-            graph.add_node("maybe_search", maybe_search)
-            graph.add_node("maybe_file_read", maybe_file_read)
+            graph.add_node("run_tools", run_tools)
             graph.add_node("call_model", call_model)
-            graph.set_entry_point("maybe_search")
-            graph.add_edge("maybe_search", "maybe_file_read")
-            graph.add_edge("maybe_file_read", "call_model")
+            graph.set_entry_point("run_tools")
+            graph.add_edge("run_tools", "call_model")
             graph.add_edge("call_model", END)
         elif has_search:
             graph.add_node("maybe_search", maybe_search)
@@ -250,32 +287,51 @@ class LangGraphModeExecutor:
             graph.add_node("call_model", call_model)
             graph.set_entry_point("call_model")
             graph.add_edge("call_model", END)
-        return graph.compile(checkpointer=_build_checkpointer())
+        return graph.compile(checkpointer=_get_checkpointer())
 
-    def _get_compiled_graph(self, allowed_tools: set[str], db: AsyncSession | None = None):
-        if FILE_READ_TOOL_NAME in allowed_tools:
-            return self._compile_graph(allowed_tools, db=db)
+    def _get_compiled_graph(self, allowed_tools: set[str]):
         key = tuple(sorted(allowed_tools))
         graph = self._graphs.get(key)
         if graph is None:
-            graph = self._compile_graph(allowed_tools, db=None)
+            graph = self._compile_graph(allowed_tools)
             self._graphs[key] = graph
         return graph
 
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput:
-        allowed_tools = {name.strip().lower() for name in payload.allowed_tool_names if name and name.strip()}
-        graph = self._get_compiled_graph(allowed_tools, db=db)
-        result = await graph.ainvoke(
-            {
-                "model_alias": payload.model_alias,
-                "messages": payload.messages,
-                "max_output_tokens": payload.max_output_tokens,
-                "tool_query": self._extract_search_query(payload.messages),
-                "room_id": payload.room_id,
-                "file_id_trigger": self._extract_file_id(payload.messages),
-            },
-            config={"configurable": {"thread_id": payload.thread_id}},
+    async def _direct_call(self, payload: TurnExecutionInput) -> TurnExecutionOutput:
+        response = await self._llm_gateway.generate(
+            GatewayRequest(
+                model_alias=payload.model_alias,
+                messages=payload.messages,
+                max_output_tokens=payload.max_output_tokens,
+            )
         )
+        return TurnExecutionOutput(text=response.text, provider_model=response.provider_model, usage=response.usage)
+
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput:
+        allowed_tools = {name.strip().lower() for name in payload.allowed_tool_names if name and name.strip()}
+        graph = self._get_compiled_graph(allowed_tools)
+        if not allowed_tools and isinstance(graph.checkpointer, MemorySaver):
+            # Without tools the graph is the single call_model node, and an in-process
+            # MemorySaver checkpoint is never read back, so the graph adds only dispatch cost.
+            return await self._direct_call(payload)
+        tool_query, file_id_trigger = self._extract_tool_triggers(payload.messages)
+        factory_token = _TURN_SESSION_FACTORY.set(session_factory)
+        try:
+            result = await graph.ainvoke(
+                {
+                    "model_alias": payload.model_alias,
+                    "messages": payload.messages,
+                    "max_output_tokens": payload.max_output_tokens,
+                    "tool_query": tool_query,
+                    "room_id": payload.room_id,
+                    "file_id_trigger": file_id_trigger,
+                },
+                config={"configurable": {"thread_id": payload.thread_id}},
+            )
+        finally:
+            _TURN_SESSION_FACTORY.reset(factory_token)
         raw_tool_events = result.get("tool_events") or []
         tool_calls = tuple(
             ToolCallRecord(
@@ -326,6 +382,13 @@ def _build_checkpointer():
         return MemorySaver()
 
 
+@lru_cache(maxsize=1)
+def _get_checkpointer():
+    # One saver per process: every compiled graph shares it, so the Postgres import and
+    # connection setup happen once rather than on each compile.
+    return _build_checkpointer()
+
+
 def _setup_checkpointer_once(checkpointer: object) -> None:
     global _POSTGRES_CHECKPOINTER_SETUP_DONE
     if _POSTGRES_CHECKPOINTER_SETUP_DONE:
@@ -13,10 +13,16 @@ from apps.api.app.services.llm.gateway import GatewayMessage, GatewayRequest, Ga
 _LOGGER = logging.getLogger(__name__)
 
 
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+
+
 def _strip_json_fences(text: str) -> str:
     """Strip markdown code fences that LLMs often wrap JSON in."""
     text = text.strip()
-    match = re.search(r"```(?:json)?\s*(.*?)\s*```", text, re.DOTALL)
+    # Most routing replies are bare JSON; a substring probe is cheaper than running the regex.
+    if "```" not in text:
+        return text
+    match = _JSON_FENCE.search(text)
     if match:
         return match.group(1)
     return text
@@ -140,6 +146,9 @@ async def route_turn(
         raise ValueError("route_turn requires at least one available agent.")
 
     fallback = OrchestratorRoutingDecision(selected_agent_keys=(agents[0].agent_key,))
+    if len(agents) == 1:
+        # A single-agent room has exactly one possible route; skip the manager round-trip.
+        return fallback
     response = await gateway.generate(
         GatewayRequest(
             model_alias=manager_model_alias,
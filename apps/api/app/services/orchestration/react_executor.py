@@ -2,18 +2,20 @@ from __future__ import annotations
 
 import json
 import logging
-from math import ceil
 from typing import Any
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
 from langgraph.prebuilt import create_react_agent
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from apps.api.app.services.llm.gateway import (
     GatewayMessage,
     GatewayRequest,
     GatewayUsage,
     LlmGateway,
+    estimate_messages_tokens,
+    estimate_tokens,
+    read_usage_metadata,
 )
 from apps.api.app.services.orchestration.mode_executor import ToolCallRecord, TurnExecutionInput, TurnExecutionOutput
 from apps.api.app.services.tools.file_tool import FileReadTool, TOOL_NAME as FILE_TOOL_NAME
@@ -28,10 +30,6 @@ from pantheon_llm.openrouter_langchain import SUPPORTED_LLMS, get_chat_model
 _LOGGER = logging.getLogger(__name__)
 
 
-def _estimate_tokens(text: str) -> int:
-    return max(1, ceil(len(text) / 4 * 1.25))
-
-
 def _to_langchain_messages(messages: list[GatewayMessage]) -> list[BaseMessage]:
     converted: list[BaseMessage] = []
     for message in messages:
@@ -76,8 +74,8 @@ def _extract_final_ai_message(messages: list[BaseMessage]) -> AIMessage | None:
 
 def _extract_usage(message: AIMessage | None, *, fallback_messages: list[GatewayMessage], fallback_text: str) -> GatewayUsage:
     if message is None:
-        input_tokens = sum(_estimate_tokens(item.content) for item in fallback_messages)
-        output_tokens = _estimate_tokens(fallback_text)
+        input_tokens = estimate_messages_tokens(fallback_messages)
+        output_tokens = estimate_tokens(fallback_text)
         return GatewayUsage(
             input_tokens_fresh=input_tokens,
             input_tokens_cached=0,
@@ -86,17 +84,13 @@ def _extract_usage(message: AIMessage | None, *, fallback_messages: list[Gateway
         )
 
     usage_metadata: dict[str, Any] = getattr(message, "usage_metadata", {}) or {}
-    input_tokens = int(usage_metadata.get("input_tokens") or 0)
-    output_tokens = int(usage_metadata.get("output_tokens") or 0)
-    total_tokens = int(usage_metadata.get("total_tokens") or 0)
-    input_details: dict[str, Any] = usage_metadata.get("input_token_details") or {}
-    cached_tokens = int(input_details.get("cache_read") or input_details.get("cached_tokens") or 0)
+    input_tokens, output_tokens, total_tokens, cached_tokens = read_usage_metadata(usage_metadata)
 
     text = _extract_text_from_message(message)
     if input_tokens <= 0:
-        input_tokens = sum(_estimate_tokens(item.content) for item in fallback_messages)
+        input_tokens = estimate_messages_tokens(fallback_messages)
     if output_tokens <= 0:
-        output_tokens = _estimate_tokens(text)
+        output_tokens = estimate_tokens(text)
     if total_tokens <= 0:
         total_tokens = input_tokens + output_tokens
 
@@ -161,7 +155,9 @@ class ReactAgentExecutor:
             tool_calls=(),
         )
 
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput:
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput:
         allowed_tools = {name.strip().lower() for name in payload.allowed_tool_names if name and name.strip()}
         if not allowed_tools:
             return await self._run_direct(payload)
@@ -176,7 +172,7 @@ class ReactAgentExecutor:
                     turn_id="",
                     agent_key=None,
                     room_id=payload.room_id or None,
-                    db=db,
+                    session_factory=session_factory,
                     search_tool=self._search_tool,
                     telemetry_sink=telemetry.append,
                 )
@@ -189,7 +185,7 @@ class ReactAgentExecutor:
                     turn_id="",
                     agent_key=None,
                     room_id=payload.room_id or None,
-                    db=db,
+                    session_factory=session_factory,
                     file_tool=self._file_read_tool,
                     telemetry_sink=telemetry.append,
                 )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import json
+import orjson
 
 from apps.api.app.db.models import Agent
 
@@ -9,8 +9,8 @@ def get_permitted_tool_names(agent: Agent) -> list[str]:
     """Return canonical tool names an agent is allowed to invoke."""
     raw = agent.tool_permissions_json or "[]"
     try:
-        parsed = json.loads(raw)
-    except (TypeError, json.JSONDecodeError):
+        parsed = orjson.loads(raw)
+    except (TypeError, orjson.JSONDecodeError):
         return []
     if not isinstance(parsed, list):
         return []
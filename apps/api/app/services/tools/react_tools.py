@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import json
 import time
 from dataclasses import dataclass
 from typing import Callable
 
+import orjson
 from langchain_core.tools import tool
-from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from apps.api.app.services.tools.file_tool import FileReadTool
 from apps.api.app.services.tools.search_tool import SearchTool
@@ -24,6 +25,16 @@ class ToolInvocationTelemetry:
 TelemetrySink = Callable[[ToolInvocationTelemetry], None]
 
 
+# Tools are rebuilt per turn around request-scoped state, but their argument schemas never
+# change. Declaring them once skips @tool's per-call signature inspection and model build.
+class _SearchArgs(BaseModel):
+    query: str
+
+
+class _FileReadArgs(BaseModel):
+    file_id: str
+
+
 def _emit_telemetry(sink: TelemetrySink | None, telemetry: ToolInvocationTelemetry) -> None:
     if sink is None:
         return
@@ -37,13 +48,13 @@ def make_web_search_tool(
     turn_id: str,
     agent_key: str | None,
     room_id: str | None,
-    db: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
     search_tool: SearchTool,
     telemetry_sink: TelemetrySink | None = None,
 ):
-    _ = (user_id, session_id, turn_id, agent_key, room_id, db)
+    _ = (user_id, session_id, turn_id, agent_key, room_id, session_factory)
 
-    @tool("search")
+    @tool("search", args_schema=_SearchArgs)
     async def web_search(query: str) -> str:
         """Search the web for current information and recent facts."""
         started = time.monotonic()
@@ -60,8 +71,8 @@ def make_web_search_tool(
                 telemetry_sink,
                 ToolInvocationTelemetry(
                     tool_name="search",
-                    input_json=json.dumps({"query": query}),
-                    output_json=json.dumps({"result_count": len(results)}),
+                    input_json=orjson.dumps({"query": query}).decode(),
+                    output_json=orjson.dumps({"result_count": len(results)}).decode(),
                     status="success",
                     latency_ms=int((time.monotonic() - started) * 1000),
                 ),
@@ -72,8 +83,8 @@ def make_web_search_tool(
                 telemetry_sink,
                 ToolInvocationTelemetry(
                     tool_name="search",
-                    input_json=json.dumps({"query": query}),
-                    output_json=json.dumps({"error": str(exc)}),
+                    input_json=orjson.dumps({"query": query}).decode(),
+                    output_json=orjson.dumps({"error": str(exc)}).decode(),
                     status="error",
                     latency_ms=int((time.monotonic() - started) * 1000),
                 ),
@@ -90,13 +101,13 @@ def make_read_file_tool(
     turn_id: str,
     agent_key: str | None,
     room_id: str | None,
-    db: AsyncSession,
+    session_factory: async_sessionmaker[AsyncSession],
     file_tool: FileReadTool,
     telemetry_sink: TelemetrySink | None = None,
 ):
     _ = (user_id, session_id, turn_id, agent_key)
 
-    @tool("file_read")
+    @tool("file_read", args_schema=_FileReadArgs)
     async def read_file(file_id: str) -> str:
         """Read an uploaded file by file id and return parsed content."""
         started = time.monotonic()
@@ -105,8 +116,8 @@ def make_read_file_tool(
                 telemetry_sink,
                 ToolInvocationTelemetry(
                     tool_name="file_read",
-                    input_json=json.dumps({"file_id": file_id}),
-                    output_json=json.dumps({"error": "file_read is unavailable outside room sessions"}),
+                    input_json=orjson.dumps({"file_id": file_id}).decode(),
+                    output_json=orjson.dumps({"error": "file_read is unavailable outside room sessions"}).decode(),
                     status="error",
                     latency_ms=int((time.monotonic() - started) * 1000),
                 ),
@@ -114,15 +125,18 @@ def make_read_file_tool(
             return "File read is unavailable outside room-scoped sessions."
 
         try:
-            result = await file_tool.read(file_id=file_id, room_id=room_id, db=db)
+            # A session per call holds a pooled connection only for the read itself, not
+            # across the LLM round-trips the agent makes before and after it.
+            async with session_factory() as db:
+                result = await file_tool.read(file_id=file_id, room_id=room_id, db=db)
             if result.status == "completed":
                 content = result.content or ""
                 _emit_telemetry(
                     telemetry_sink,
                     ToolInvocationTelemetry(
                         tool_name="file_read",
-                        input_json=json.dumps({"file_id": file_id}),
-                        output_json=json.dumps({"chars": len(content)}),
+                        input_json=orjson.dumps({"file_id": file_id}).decode(),
+                        output_json=orjson.dumps({"chars": len(content)}).decode(),
                         status="success",
                         latency_ms=int((time.monotonic() - started) * 1000),
                     ),
@@ -134,8 +148,8 @@ def make_read_file_tool(
                 telemetry_sink,
                 ToolInvocationTelemetry(
                     tool_name="file_read",
-                    input_json=json.dumps({"file_id": file_id}),
-                    output_json=json.dumps({"error": message, "result_status": result.status}),
+                    input_json=orjson.dumps({"file_id": file_id}).decode(),
+                    output_json=orjson.dumps({"error": message, "result_status": result.status}).decode(),
                     status="error",
                     latency_ms=int((time.monotonic() - started) * 1000),
                 ),
@@ -146,8 +160,8 @@ def make_read_file_tool(
                 telemetry_sink,
                 ToolInvocationTelemetry(
                     tool_name="file_read",
-                    input_json=json.dumps({"file_id": file_id}),
-                    output_json=json.dumps({"error": str(exc)}),
+                    input_json=orjson.dumps({"file_id": file_id}).decode(),
+                    output_json=orjson.dumps({"error": str(exc)}).decode(),
                     status="error",
                     latency_ms=int((time.monotonic() - started) * 1000),
                 ),
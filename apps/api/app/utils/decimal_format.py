@@ -1,9 +1,19 @@
 from __future__ import annotations
 
 from decimal import Decimal
+from functools import lru_cache
 
 
 def format_decimal(value: Decimal) -> str:
+    # Whole amounts (top-ups, grants, zero balances) skip the normalize/strip work entirely.
+    if value.is_finite() and value == value.to_integral_value():
+        return str(int(value))
+    return _format_fractional(value)
+
+
+@lru_cache(maxsize=4096)
+def _format_fractional(value: Decimal) -> str:
+    # Equal Decimals share a cache slot, which is safe because normalize() erases the difference.
     normalized = value.normalize()
     text = format(normalized, "f")
     if "." in text:
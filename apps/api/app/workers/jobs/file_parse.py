@@ -8,13 +8,14 @@ from collections.abc import Awaitable, Callable
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
-from supabase import create_client
+from supabase import Client, create_client
 
 from apps.api.app.core.config import get_settings
 from apps.api.app.db.models import UploadedFile
 
 _worker_engine: AsyncEngine | None = None
 _worker_session_factory: async_sessionmaker[AsyncSession] | None = None
+_supabase_client: Client | None = None
 
 
 def _raw_database_url() -> str:
@@ -58,9 +59,18 @@ def get_worker_session_factory() -> async_sessionmaker[AsyncSession]:
     return _worker_session_factory
 
 
+def get_supabase_client() -> Client:
+    # Built once per worker process; each job reuses its HTTP connection pool.
+    global _supabase_client
+    if _supabase_client is None:
+        settings = get_settings()
+        _supabase_client = create_client(settings.supabase_url, settings.supabase_service_role_key)
+    return _supabase_client
+
+
 async def _download_file_bytes(storage_key: str) -> bytes:
     settings = get_settings()
-    client = create_client(settings.supabase_url, settings.supabase_service_role_key)
+    client = get_supabase_client()
     data = await asyncio.to_thread(client.storage.from_(settings.supabase_storage_bucket).download, storage_key)
     if isinstance(data, bytes):
         return data
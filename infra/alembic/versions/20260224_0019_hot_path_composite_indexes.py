@@ -0,0 +1,88 @@
+"""add composite indexes for session, history, and ledger hot paths
+
+Revision ID: 20260224_0019
+Revises: 20260223_0018
+Create Date: 2026-02-24 09:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260224_0019"
+down_revision: Union[str, Sequence[str], None] = "20260223_0018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Already covered elsewhere, intentionally not duplicated here:
+# - turns (session_id, turn_index): uq_turns_session_turn_index
+# - llm_call_events (user_id, created_at): idx_llm_call_events_user_created_at
+
+
+def upgrade() -> None:
+    # Built concurrently so writes to these tables are not blocked for the whole build.
+    with op.get_context().autocommit_block():
+        # Turn history load and paginated message list order by (created_at, id) per session.
+        op.create_index(
+            "ix_messages_session_created_id",
+            "messages",
+            ["session_id", "created_at", "id"],
+            postgresql_concurrently=True,
+        )
+        # Latest summary lookup per session.
+        op.create_index(
+            "ix_session_summaries_session_created",
+            "session_summaries",
+            ["session_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+        # /users/me/transactions and admin ledger views.
+        op.create_index(
+            "ix_credit_transactions_user_created",
+            "credit_transactions",
+            ["user_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+        # Room agent roster ordered by position.
+        op.create_index(
+            "ix_room_agents_room_position",
+            "room_agents",
+            ["room_id", "position", "created_at"],
+            postgresql_concurrently=True,
+        )
+        # Soft-delete filters: only live rows are ever listed.
+        op.create_index(
+            "ix_sessions_room_active_created",
+            "sessions",
+            ["room_id", sa.text("created_at DESC")],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_rooms_owner_active_created",
+            "rooms",
+            ["owner_user_id", sa.text("created_at DESC")],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_rooms_owner_active_created", table_name="rooms", postgresql_concurrently=True)
+        op.drop_index("ix_sessions_room_active_created", table_name="sessions", postgresql_concurrently=True)
+        op.drop_index("ix_room_agents_room_position", table_name="room_agents", postgresql_concurrently=True)
+        op.drop_index(
+            "ix_credit_transactions_user_created",
+            table_name="credit_transactions",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_session_summaries_session_created",
+            table_name="session_summaries",
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_messages_session_created_id", table_name="messages", postgresql_concurrently=True)
@@ -0,0 +1,63 @@
+"""add covering (user_id, created_at, id) keyset indexes for usage and transaction lists
+
+Revision ID: 20260224_0020
+Revises: 20260224_0019
+Create Date: 2026-02-24 11:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260224_0020"
+down_revision: Union[str, Sequence[str], None] = "20260224_0019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /users/me/usage and /users/me/transactions seek on (created_at, id) < cursor per user and
+    # project a fixed column set; carrying it in the index leaf lets each page be an index-only scan.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_llm_call_events_user_created_id",
+            "llm_call_events",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_include=["model_alias", "credits_burned"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_credit_transactions_user_created_id",
+            "credit_transactions",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_include=["kind", "amount", "initiated_by", "note", "reference_id"],
+            postgresql_concurrently=True,
+        )
+        # Superseded: the keyset index above serves every (user_id, created_at) lookup.
+        op.drop_index(
+            "ix_credit_transactions_user_created",
+            table_name="credit_transactions",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_credit_transactions_user_created",
+            "credit_transactions",
+            ["user_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_credit_transactions_user_created_id",
+            table_name="credit_transactions",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_llm_call_events_user_created_id",
+            table_name="llm_call_events",
+            postgresql_concurrently=True,
+        )
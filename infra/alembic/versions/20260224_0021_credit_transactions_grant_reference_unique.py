@@ -0,0 +1,41 @@
+"""add partial unique index on grant reference_id for webhook idempotency
+
+Revision ID: 20260224_0021
+Revises: 20260224_0020
+Create Date: 2026-02-24 12:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260224_0021"
+down_revision: Union[str, Sequence[str], None] = "20260224_0020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stripe webhook idempotency looks up grants by payment intent id. Debits reuse the
+    # turn id across agents, so the uniqueness is scoped to grant rows only. Built
+    # concurrently so debits on this write-hot table are not blocked during the build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_credit_transactions_grant_reference_id",
+            "credit_transactions",
+            ["reference_id"],
+            unique=True,
+            postgresql_where=sa.text("kind = 'grant' AND reference_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_credit_transactions_grant_reference_id",
+            table_name="credit_transactions",
+            postgresql_concurrently=True,
+        )
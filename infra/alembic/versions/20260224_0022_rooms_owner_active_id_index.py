@@ -0,0 +1,35 @@
+"""add partial (owner_user_id, id) index for active room ownership checks
+
+Revision ID: 20260224_0022
+Revises: 20260224_0021
+Create Date: 2026-02-24 13:00:00
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "20260224_0022"
+down_revision: Union[str, Sequence[str], None] = "20260224_0021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every room-scoped route checks ownership of a live room first; with both predicates in
+    # the index and the soft-delete filter as its predicate, that check is an index-only scan.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_rooms_owner_active_id",
+            "rooms",
+            ["owner_user_id", "id"],
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_rooms_owner_active_id", table_name="rooms", postgresql_concurrently=True)
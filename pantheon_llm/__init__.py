@@ -1,5 +1,6 @@
 from .openrouter_langchain import (
     SUPPORTED_LLMS,
+    aclose_http_client,
     ainvoke_messages,
     ainvoke_text,
     get_chat_model,
@@ -14,4 +15,5 @@ __all__ = [
     "ainvoke_text",
     "invoke_messages",
     "ainvoke_messages",
+    "aclose_http_client",
 ]
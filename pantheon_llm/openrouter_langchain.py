@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Sequence
 
+import httpx
 from dotenv import load_dotenv
 from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_openai import ChatOpenAI
@@ -32,6 +34,32 @@ SUPPORTED_LLMS: dict[str, LlmSpec] = {
     "gpt_oss": LlmSpec(alias="gpt_oss", model_id="openai/gpt-oss-120b", tier="advanced"),
     "premium": LlmSpec(alias="premium", model_id="google/gemini-2.5-pro", tier="premium"),
 }
+_SUPPORTED_ALIASES = ", ".join(sorted(SUPPORTED_LLMS))
+
+
+# One pooled HTTP/2 client for every ChatOpenAI instance, so concurrent calls reuse warm
+# OpenRouter connections instead of each opening its own TCP+TLS session.
+_http_async_client: httpx.AsyncClient | None = None
+
+
+def get_http_async_client() -> httpx.AsyncClient:
+    global _http_async_client
+    if _http_async_client is None or _http_async_client.is_closed:
+        _http_async_client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30),
+        )
+    return _http_async_client
+
+
+async def aclose_http_client() -> None:
+    global _http_async_client
+    client, _http_async_client = _http_async_client, None
+    # Cached models hold the closed client; drop them so the next call builds fresh ones.
+    _cached_chat_model.cache_clear()
+    if client is not None:
+        await client.aclose()
 
 
 def _load_env() -> tuple[str, str]:
@@ -44,9 +72,16 @@ def _load_env() -> tuple[str, str]:
 
 
 def get_chat_model(alias: str, temperature: float = 0.0, max_tokens: int | None = None) -> ChatOpenAI:
+    # Positional call so keyword and positional callers share one cache entry.
+    return _cached_chat_model(alias, temperature, max_tokens)
+
+
+# Models are stateless config + clients, so one instance per (alias, temperature, max_tokens)
+# serves every call instead of re-reading .env and re-validating ChatOpenAI each time.
+@lru_cache(maxsize=128)
+def _cached_chat_model(alias: str, temperature: float, max_tokens: int | None) -> ChatOpenAI:
     if alias not in SUPPORTED_LLMS:
-        supported = ", ".join(sorted(SUPPORTED_LLMS.keys()))
-        raise ValueError(f"Unknown model alias '{alias}'. Supported: {supported}")
+        raise ValueError(f"Unknown model alias '{alias}'. Supported: {_SUPPORTED_ALIASES}")
 
     api_key, base_url = _load_env()
     spec = SUPPORTED_LLMS[alias]
@@ -63,6 +98,7 @@ def get_chat_model(alias: str, temperature: float = 0.0, max_tokens: int | None
             "HTTP-Referer": "https://pantheon.local",
             "X-Title": "Pantheon MVP",
         },
+        "http_async_client": get_http_async_client(),
     }
     if max_tokens is not None:
         kwargs["max_tokens"] = max_tokens
@@ -0,0 +1,21 @@
+"""App shared by route tests that sign users in through a ``get_current_user`` override."""
+
+from __future__ import annotations
+
+from fastapi import FastAPI
+
+from apps.api.app.main import create_app
+from apps.api.app.middleware.bearer_auth import BearerAuthMiddleware
+
+
+def _build_route_test_app() -> FastAPI:
+    test_app = create_app()
+    # These tests never send a Bearer token, so the middleware's anonymous 401 would answer
+    # before the override is consulted. get_current_user still returns 401 when not overridden.
+    test_app.user_middleware = [
+        middleware for middleware in test_app.user_middleware if middleware.cls is not BearerAuthMiddleware
+    ]
+    return test_app
+
+
+app = _build_route_test_app()
@@ -21,9 +21,11 @@ from apps.api.app.core.config import get_settings
 from apps.api.app.db.models import Base, LlmCallEvent, ModelPricing, PricingVersion, User
 from apps.api.app.db.session import get_db
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.main import app
+from apps.api.app.services.billing import pricing_admin
 from apps.api.app.services.usage.meter import get_model_multiplier, reload_pricing_cache
 
+from route_app import app
+
 
 class AdminPricingRoutesTests(unittest.TestCase):
     @classmethod
@@ -141,6 +143,32 @@ class AdminPricingRoutesTests(unittest.TestCase):
                 await session.commit()
 
         asyncio.run(reset_usage_events())
+        pricing_admin._active_pricing_version_cache.clear()
+
+    def _set_pricing_version_active(self, is_active: bool) -> None:
+        async def update() -> None:
+            async with self.session_factory() as session:
+                row = await session.scalar(select(PricingVersion).where(PricingVersion.version == "2026-02-20"))
+                row.is_active = is_active
+                await session.commit()
+
+        asyncio.run(update())
+
+    def test_active_pricing_version_cached_until_multiplier_update(self) -> None:
+        self.assertEqual(self.client.get("/api/v1/admin/pricing").status_code, 200)
+        self._set_pricing_version_active(False)
+        self.addCleanup(self._set_pricing_version_active, True)
+
+        cached = self.client.get("/api/v1/admin/pricing")
+        self.assertEqual(cached.status_code, 200)
+        self.assertEqual(cached.json()["pricing_version"], "2026-02-20")
+
+        response = self.client.patch(
+            "/api/v1/admin/pricing/deepseek",
+            json={"multiplier": 0.5, "pricing_version": "2026-02-20"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(pricing_admin._active_pricing_version_cache.get("active"))
 
     def test_update_multiplier_success(self) -> None:
         response = self.client.patch(
@@ -17,9 +17,10 @@ from apps.api.app.core.config import get_settings
 from apps.api.app.db.models import Base, User
 from apps.api.app.db.session import get_db
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.main import app
 from apps.api.app.services.billing.enforcement import set_enforcement_override
 
+from route_app import app
+
 
 class AdminSettingsRoutesTests(unittest.TestCase):
     @classmethod
@@ -20,7 +20,8 @@ from apps.api.app.core.config import get_settings
 from apps.api.app.db.models import Base, CreditTransaction, CreditWallet, User
 from apps.api.app.db.session import get_db
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.main import app
+
+from route_app import app
 
 
 class AdminWalletRoutesTests(unittest.TestCase):
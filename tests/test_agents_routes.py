@@ -11,7 +11,8 @@ from sqlalchemy.pool import StaticPool
 from apps.api.app.db.models import Agent, Base, User
 from apps.api.app.db.session import get_db
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.main import app
+
+from route_app import app
 
 
 class AgentRoutesTests(unittest.TestCase):
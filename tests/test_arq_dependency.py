@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from arq.connections import RedisSettings
+
+from apps.api.app.dependencies import arq as arq_dependency
+
+
+def _app(*, redis_settings: RedisSettings | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        state=SimpleNamespace(
+            arq_redis=None,
+            arq_redis_settings=redis_settings,
+            arq_redis_failed_at=None,
+            arq_redis_lock=asyncio.Lock(),
+        )
+    )
+
+
+class GetArqRedisPoolTests(unittest.TestCase):
+    def test_pool_is_opened_once_on_first_use(self) -> None:
+        app = _app(redis_settings=RedisSettings())
+        pool = object()
+
+        async def run() -> list[object]:
+            return list(await asyncio.gather(*(arq_dependency.get_arq_redis_pool(app) for _ in range(5))))
+
+        with patch.object(arq_dependency, "create_pool", new_callable=AsyncMock, return_value=pool) as mock_create:
+            pools = asyncio.run(run())
+
+        self.assertEqual(pools, [pool] * 5)
+        mock_create.assert_awaited_once()
+        self.assertIs(app.state.arq_redis, pool)
+
+    def test_unconfigured_redis_returns_none_without_connecting(self) -> None:
+        app = _app()
+        with patch.object(arq_dependency, "create_pool", new_callable=AsyncMock) as mock_create:
+            self.assertIsNone(asyncio.run(arq_dependency.get_arq_redis_pool(app)))
+        mock_create.assert_not_awaited()
+
+    def test_failed_connect_is_not_retried_immediately(self) -> None:
+        app = _app(redis_settings=RedisSettings())
+
+        async def run() -> tuple[object, object]:
+            first = await arq_dependency.get_arq_redis_pool(app)
+            second = await arq_dependency.get_arq_redis_pool(app)
+            return first, second
+
+        with patch.object(
+            arq_dependency,
+            "create_pool",
+            new_callable=AsyncMock,
+            side_effect=ConnectionError("redis down"),
+        ) as mock_create:
+            first, second = asyncio.run(run())
+
+        self.assertIsNone(first)
+        self.assertIsNone(second)
+        mock_create.assert_awaited_once()
+
+    def test_waiters_queued_on_a_failed_connect_do_not_reconnect(self) -> None:
+        app = _app(redis_settings=RedisSettings())
+
+        async def failing_connect(*_args, **_kwargs):
+            # Yield first so the other callers queue on the lock while this connect is in flight.
+            await asyncio.sleep(0)
+            raise ConnectionError("redis down")
+
+        async def run() -> list[object]:
+            return list(await asyncio.gather(*(arq_dependency.get_arq_redis_pool(app) for _ in range(5))))
+
+        with patch.object(
+            arq_dependency,
+            "create_pool",
+            new_callable=AsyncMock,
+            side_effect=failing_connect,
+        ) as mock_create:
+            pools = asyncio.run(run())
+
+        self.assertEqual(pools, [None] * 5)
+        mock_create.assert_awaited_once()
+
+    def test_lazy_connect_skips_arq_connect_retries(self) -> None:
+        app = _app(redis_settings=RedisSettings(conn_retries=5))
+        with patch.object(arq_dependency, "create_pool", new_callable=AsyncMock, return_value=object()) as mock_create:
+            asyncio.run(arq_dependency.get_arq_redis_pool(app))
+
+        self.assertEqual(mock_create.await_args.args[0].conn_retries, 0)
+        self.assertEqual(app.state.arq_redis_settings.conn_retries, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
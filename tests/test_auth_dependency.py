@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import os
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import jwt
+from cryptography.hazmat.primitives.asymmetric import ec
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from jwt.algorithms import ECAlgorithm
+
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "dummy-service-role-key")
+
+from apps.api.app.dependencies import auth as auth_dependency
+from apps.api.app.middleware.bearer_auth import BearerAuthMiddleware
+from apps.api.app.services.auth import supabase_auth
+from apps.api.app.services.auth.supabase_auth import verify_supabase_bearer_token
+
+
+def _token_with_exp(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode("utf-8")).decode("ascii").rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def _get_current_user(token: str) -> dict[str, str]:
+    return asyncio.run(auth_dependency.authenticate_bearer_token(token))
+
+
+class AuthenticateBearerTokenCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        auth_dependency._verified_user_cache.clear()
+
+    def tearDown(self) -> None:
+        auth_dependency._verified_user_cache.clear()
+
+    def test_verified_token_is_served_from_cache(self) -> None:
+        token = _token_with_exp(time.time() + 3600)
+        with patch.object(
+            auth_dependency,
+            "verify_supabase_bearer_token",
+            new_callable=AsyncMock,
+            return_value={"id": "user-1", "email": "user-1@example.com"},
+        ) as mock_verify:
+            first = _get_current_user(token)
+            second = _get_current_user(token)
+
+        self.assertEqual(first, {"user_id": "user-1", "email": "user-1@example.com"})
+        self.assertEqual(second, first)
+        mock_verify.assert_awaited_once_with(token, http_client=None)
+
+    def test_failed_verification_is_not_cached(self) -> None:
+        token = _token_with_exp(time.time() + 3600)
+        with patch.object(
+            auth_dependency,
+            "verify_supabase_bearer_token",
+            new_callable=AsyncMock,
+            side_effect=ValueError("Invalid or expired token."),
+        ) as mock_verify:
+            for _ in range(2):
+                with self.assertRaises(HTTPException) as ctx:
+                    _get_current_user(token)
+                self.assertEqual(ctx.exception.status_code, 401)
+
+        self.assertEqual(mock_verify.call_count, 2)
+
+    def test_expired_token_is_not_cached(self) -> None:
+        token = _token_with_exp(time.time() - 5)
+        with patch.object(
+            auth_dependency,
+            "verify_supabase_bearer_token",
+            new_callable=AsyncMock,
+            return_value={"id": "user-1", "email": None},
+        ) as mock_verify:
+            _get_current_user(token)
+            _get_current_user(token)
+
+        self.assertEqual(mock_verify.call_count, 2)
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: dict[str, bytes] = {}
+        self.expiries: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: bytes, ex: int | None = None) -> bool:
+        self.values[key] = value
+        if ex is not None:
+            self.expiries[key] = ex
+        return True
+
+
+class AuthenticateBearerTokenSharedCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        auth_dependency._verified_user_cache.clear()
+
+    def tearDown(self) -> None:
+        auth_dependency._verified_user_cache.clear()
+
+    def test_verified_user_is_written_to_shared_cache(self) -> None:
+        token = _token_with_exp(time.time() + 3600)
+        redis_pool = _FakeRedis()
+        with patch.object(
+            auth_dependency,
+            "verify_supabase_bearer_token",
+            new_callable=AsyncMock,
+            return_value={"id": "user-1", "email": "user-1@example.com"},
+        ):
+            asyncio.run(auth_dependency.authenticate_bearer_token(token, redis_pool=redis_pool))
+
+        (key,) = redis_pool.values
+        self.assertTrue(key.startswith("auth:user:"))
+        self.assertNotIn(token, key)
+        self.assertEqual(json.loads(redis_pool.values[key]), {"user_id": "user-1", "email": "user-1@example.com"})
+        self.assertGreaterEqual(redis_pool.expiries[key], 1)
+
+    def test_shared_cache_hit_skips_verification(self) -> None:
+        token = _token_with_exp(time.time() + 3600)
+        redis_pool = _FakeRedis()
+        redis_pool.values[f"auth:user:{auth_dependency._token_cache_key(token)}"] = json.dumps(
+            {"user_id": "user-2", "email": ""}
+        ).encode("utf-8")
+        with patch.object(auth_dependency, "verify_supabase_bearer_token", new_callable=AsyncMock) as mock_verify:
+            user = asyncio.run(auth_dependency.authenticate_bearer_token(token, redis_pool=redis_pool))
+
+        self.assertEqual(user, {"user_id": "user-2", "email": ""})
+        mock_verify.assert_not_awaited()
+
+    def test_redis_pool_is_only_resolved_after_a_local_cache_miss(self) -> None:
+        token = _token_with_exp(time.time() + 3600)
+        redis_pool = _FakeRedis()
+        pool_getter = AsyncMock(return_value=redis_pool)
+        with patch.object(
+            auth_dependency,
+            "verify_supabase_bearer_token",
+            new_callable=AsyncMock,
+            return_value={"id": "user-3", "email": ""},
+        ):
+            for _ in range(3):
+                asyncio.run(auth_dependency.authenticate_bearer_token(token, redis_pool_getter=pool_getter))
+
+        pool_getter.assert_awaited_once()
+        self.assertEqual(len(redis_pool.values), 1)
+
+
+class BearerAuthMiddlewareTests(unittest.TestCase):
+    def setUp(self) -> None:
+        auth_dependency._verified_user_cache.clear()
+        app = FastAPI()
+        app.add_middleware(BearerAuthMiddleware)
+
+        @app.get("/me")
+        async def me(current_user: dict[str, str] = Depends(auth_dependency.get_current_user)) -> dict[str, str]:
+            return current_user
+
+        @app.get("/public")
+        async def public() -> dict[str, str]:
+            return {"status": "ok"}
+
+        self.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        auth_dependency._verified_user_cache.clear()
+
+    def test_missing_token_is_rejected_on_protected_route(self) -> None:
+        response = self.client.get("/me")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "Missing Bearer token.")
+
+    def test_blank_bearer_token_is_treated_as_missing(self) -> None:
+        with patch.object(auth_dependency, "verify_supabase_bearer_token", new_callable=AsyncMock) as mock_verify:
+            response = self.client.get("/me", headers={"Authorization": "Bearer    "})
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["detail"], "Missing Bearer token.")
+        mock_verify.assert_not_awaited()
+
+    def test_verified_user_is_exposed_to_dependency(self) -> None:
+        token = _token_with_exp(time.time() + 3600)
+        with patch.object(
+            auth_dependency,
+            "verify_supabase_bearer_token",
+            new_callable=AsyncMock,
+            return_value={"id": "user-1", "email": "user-1@example.com"},
+        ):
+            response = self.client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"user_id": "user-1", "email": "user-1@example.com"})
+
+    def test_locally_cached_identity_does_not_open_redis_pool(self) -> None:
+        token = _token_with_exp(time.time() + 3600)
+        auth_dependency._verified_user_cache.set(
+            auth_dependency._token_cache_key(token), {"user_id": "user-1", "email": ""}
+        )
+        with patch("apps.api.app.middleware.bearer_auth.get_arq_redis_pool", new_callable=AsyncMock) as pool:
+            response = self.client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+        self.assertEqual(response.status_code, 200)
+        pool.assert_not_awaited()
+
+    def test_invalid_token_only_fails_routes_that_need_a_user(self) -> None:
+        headers = {"Authorization": "Bearer bad-token"}
+        with patch.object(
+            auth_dependency,
+            "verify_supabase_bearer_token",
+            new_callable=AsyncMock,
+            side_effect=ValueError("Invalid or expired token."),
+        ):
+            protected = self.client.get("/me", headers=headers)
+            public = self.client.get("/public", headers=headers)
+
+        self.assertEqual(protected.status_code, 401)
+        self.assertEqual(protected.json()["detail"], "Invalid or expired token.")
+        self.assertEqual(public.status_code, 200)
+
+
+class BearerAuthMiddlewareAnonymousRejectionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = FastAPI()
+        self.app.add_middleware(
+            BearerAuthMiddleware,
+            protected_prefix="/api/v1/",
+            public_paths=frozenset({"/api/v1/health"}),
+        )
+        self.route_calls = 0
+
+        @self.app.get("/api/v1/me")
+        async def me(current_user: dict[str, str] = Depends(auth_dependency.get_current_user)) -> dict[str, str]:
+            self.route_calls += 1
+            return current_user
+
+        @self.app.get("/api/v1/health")
+        async def health() -> dict[str, str]:
+            return {"status": "ok"}
+
+        self.client = TestClient(self.app)
+
+    def test_anonymous_request_is_rejected_before_routing(self) -> None:
+        for _ in range(2):
+            response = self.client.get("/api/v1/me")
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.json(), {"detail": "Missing Bearer token."})
+            self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertEqual(self.route_calls, 0)
+
+    def test_public_path_allows_anonymous_request(self) -> None:
+        response = self.client.get("/api/v1/health")
+        self.assertEqual(response.status_code, 200)
+
+    def test_dependency_overrides_do_not_change_anonymous_rejection(self) -> None:
+        self.app.dependency_overrides[auth_dependency.get_current_user] = lambda: {"user_id": "u", "email": ""}
+        try:
+            response = self.client.get("/api/v1/me")
+        finally:
+            self.app.dependency_overrides.clear()
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.route_calls, 0)
+
+
+class VerifySupabaseBearerTokenTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.signing_key = ec.generate_private_key(ec.SECP256R1())
+        public_jwk = ECAlgorithm.to_jwk(cls.signing_key.public_key(), as_dict=True)
+        cls.jwks = {"keys": [{**public_jwk, "kid": "key-1", "alg": "ES256", "use": "sig"}]}
+        cls.issuer = f"{os.environ['SUPABASE_URL'].rstrip('/')}/auth/v1"
+
+    def setUp(self) -> None:
+        supabase_auth._JWKS_CACHE.update(keys=None, fetched_at=0.0)
+        self.requests: list[httpx.Request] = []
+
+    def tearDown(self) -> None:
+        supabase_auth._JWKS_CACHE.update(keys=None, fetched_at=0.0)
+
+    def _es256_token(self, **overrides: object) -> str:
+        claims = {
+            "sub": "user-1",
+            "email": "user-1@example.com",
+            "aud": "authenticated",
+            "iss": self.issuer,
+            "exp": int(time.time()) + 3600,
+            **overrides,
+        }
+        return jwt.encode(claims, self.signing_key, algorithm="ES256", headers={"kid": "key-1"})
+
+    def _handler(self, user_response: httpx.Response | None = None):
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            if request.url.path.endswith("/.well-known/jwks.json"):
+                return httpx.Response(200, json=self.jwks)
+            if user_response is not None:
+                return user_response
+            return httpx.Response(200, json={"id": "user-remote", "email": "remote@example.com"})
+
+        return handler
+
+    def _verify(self, handler, *tokens: str) -> list[dict[str, str | None]]:
+        async def run() -> list[dict[str, str | None]]:
+            async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+                return [await verify_supabase_bearer_token(token, http_client=client) for token in tokens]
+
+        return asyncio.run(run())
+
+    def _paths(self) -> list[str]:
+        return [request.url.path for request in self.requests]
+
+    def test_asymmetric_token_is_verified_locally_with_cached_jwks(self) -> None:
+        token = self._es256_token()
+
+        users = self._verify(self._handler(), token, token)
+
+        self.assertEqual(users, [{"id": "user-1", "email": "user-1@example.com"}] * 2)
+        self.assertEqual(self._paths(), ["/auth/v1/.well-known/jwks.json"])
+
+    def test_expired_asymmetric_token_is_rejected_without_remote_call(self) -> None:
+        token = self._es256_token(exp=int(time.time()) - 60)
+
+        with self.assertRaises(ValueError):
+            self._verify(self._handler(), token)
+        self.assertNotIn("/auth/v1/user", self._paths())
+
+    def test_wrong_audience_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self._verify(self._handler(), self._es256_token(aud="anon-service"))
+
+    def test_unknown_kid_falls_back_to_remote_user_endpoint(self) -> None:
+        other_key = ec.generate_private_key(ec.SECP256R1())
+        token = jwt.encode(
+            {"sub": "user-1", "aud": "authenticated", "iss": self.issuer, "exp": int(time.time()) + 60},
+            other_key,
+            algorithm="ES256",
+            headers={"kid": "rotated-away"},
+        )
+
+        users = self._verify(self._handler(), token)
+
+        self.assertEqual(users, [{"id": "user-remote", "email": "remote@example.com"}])
+        self.assertEqual(self._paths(), ["/auth/v1/.well-known/jwks.json", "/auth/v1/user"])
+
+    def test_hs256_token_uses_remote_user_endpoint(self) -> None:
+        token = jwt.encode({"sub": "user-1"}, "legacy-jwt-secret-with-enough-length", algorithm="HS256")
+
+        users = self._verify(self._handler(), token)
+
+        self.assertEqual(users, [{"id": "user-remote", "email": "remote@example.com"}])
+        user_request = self.requests[-1]
+        self.assertEqual(user_request.url.path, "/auth/v1/user")
+        self.assertEqual(user_request.headers["Authorization"], f"Bearer {token}")
+        self.assertEqual(user_request.headers["apikey"], os.environ["SUPABASE_SERVICE_ROLE_KEY"])
+
+    def test_remote_rejection_raises_value_error(self) -> None:
+        token = jwt.encode({"sub": "user-1"}, "legacy-jwt-secret-with-enough-length", algorithm="HS256")
+        with self.assertRaises(ValueError):
+            self._verify(self._handler(httpx.Response(401, json={"msg": "invalid JWT"})), token)
+
+    def test_remote_upstream_error_is_not_reported_as_invalid_token(self) -> None:
+        token = jwt.encode({"sub": "user-1"}, "legacy-jwt-secret-with-enough-length", algorithm="HS256")
+        with self.assertRaises(httpx.HTTPStatusError):
+            self._verify(self._handler(httpx.Response(503)), token)
+
+    def test_malformed_token_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self._verify(self._handler(), "not-a-jwt")
+        self.assertEqual(self.requests, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import unittest
+from math import ceil, floor
+
+from apps.api.app.services.llm.gateway import estimate_tokens_for_length
+from apps.api.app.services.orchestration.context_manager import (
+    ContextBudgetExceeded,
+    ContextManager,
+    ContextMessage,
+    HistoryMessage,
+)
+
+# model_context_limit=2048 with max_output_tokens=256 leaves an input budget of
+# 2048 - 256 - 1024 = 768 tokens; a 400-char message estimates to 125 tokens.
+_LONG = "x" * 400
+
+
+def _manager(**overrides) -> ContextManager:
+    options = {
+        "max_output_tokens": 256,
+        "summary_trigger_ratio": 1.0,
+        "prune_trigger_ratio": 1.0,
+        "mandatory_summary_turn": 100,
+        "recent_turns_to_keep": 100,
+    }
+    options.update(overrides)
+    return ContextManager(**options)
+
+
+def _history(*entries: tuple[str, str]) -> list[HistoryMessage]:
+    return [
+        HistoryMessage(id=f"m{index}", role=role, content=content, turn_id=f"t{index // 2}")
+        for index, (role, content) in enumerate(entries)
+    ]
+
+
+def _contents(messages: list[ContextMessage]) -> list[tuple[str, str]]:
+    return [(message.role, message.content) for message in messages]
+
+
+class ContextManagerPrepareTests(unittest.TestCase):
+    def test_under_budget_keeps_everything_in_order(self) -> None:
+        history = _history(("user", "hello"), ("assistant", "hi there"))
+        context = _manager().prepare(
+            model_context_limit=2048,
+            system_messages=[ContextMessage(role="system", content="Room mode: manual")],
+            history_messages=history,
+            latest_summary_text="earlier",
+            turn_count_since_last_summary=0,
+            user_input="next",
+        )
+
+        self.assertEqual(
+            _contents(context.messages),
+            [
+                ("system", "Room mode: manual"),
+                ("system", "Session summary: earlier"),
+                ("user", "hello"),
+                ("assistant", "hi there"),
+                ("user", "next"),
+            ],
+        )
+        self.assertEqual(context.input_budget, 768)
+        self.assertEqual(context.estimated_input_tokens_before, 6 + 8 + 2 + 3 + 2)
+        self.assertEqual(context.estimated_input_tokens_after_summary, context.estimated_input_tokens_before)
+        self.assertEqual(context.estimated_input_tokens_after_prune, context.estimated_input_tokens_before)
+        self.assertFalse(context.summary_triggered)
+        self.assertFalse(context.prune_triggered)
+
+    def test_mandatory_summary_folds_older_turns_after_system_messages(self) -> None:
+        history = _history(("user", "a"), ("assistant", "b"), ("user", "c"), ("assistant", "d"))
+        context = _manager(mandatory_summary_turn=1, recent_turns_to_keep=1).prepare(
+            model_context_limit=2048,
+            system_messages=[ContextMessage(role="system", content="sys")],
+            history_messages=history,
+            latest_summary_text="old",
+            turn_count_since_last_summary=1,
+            user_input="e",
+        )
+
+        self.assertTrue(context.summary_triggered)
+        self.assertEqual(context.generated_summary_text, "[user] a\n[assistant] b")
+        self.assertEqual((context.summary_from_message_id, context.summary_to_message_id), ("m0", "m1"))
+        self.assertEqual(
+            _contents(context.messages),
+            [
+                ("system", "sys"),
+                ("system", "Session summary: [user] a\n[assistant] b"),
+                ("system", "Session summary: old"),
+                ("user", "c"),
+                ("assistant", "d"),
+                ("user", "e"),
+            ],
+        )
+        self.assertEqual(context.estimated_input_tokens_before, 1 + 7 + 1 + 1 + 1 + 1 + 1)
+        self.assertEqual(context.estimated_input_tokens_after_summary, 1 + 13 + 7 + 1 + 1 + 1)
+
+    def test_prune_drops_earliest_assistant_messages_first(self) -> None:
+        history = _history(*[("user" if index % 2 == 0 else "assistant", _LONG) for index in range(8)])
+        context = _manager().prepare(
+            model_context_limit=2048,
+            system_messages=[ContextMessage(role="system", content="sys")],
+            history_messages=history,
+            latest_summary_text=None,
+            turn_count_since_last_summary=0,
+            user_input="hi",
+        )
+
+        self.assertTrue(context.prune_triggered)
+        self.assertEqual(context.estimated_input_tokens_after_summary, 1 + 8 * 125 + 1)
+        self.assertEqual(context.estimated_input_tokens_after_prune, 1 + 6 * 125 + 1)
+        self.assertEqual(
+            [message.role for message in context.messages],
+            ["system", "user", "user", "user", "assistant", "user", "assistant", "user"],
+        )
+
+    def test_prune_falls_back_to_oldest_messages_once_assistants_are_gone(self) -> None:
+        history = _history(("user", _LONG), ("user", _LONG), ("assistant", _LONG), ("user", _LONG + "!"))
+        context = _manager().prepare(
+            model_context_limit=2048,
+            system_messages=[ContextMessage(role="system", content="y" * 1600)],
+            history_messages=history,
+            latest_summary_text=None,
+            turn_count_since_last_summary=0,
+            user_input="hi",
+        )
+
+        self.assertTrue(context.prune_triggered)
+        self.assertEqual([message.content for message in context.messages[1:]], [_LONG, _LONG + "!", "hi"])
+        self.assertEqual(context.estimated_input_tokens_after_prune, 500 + 125 + 126 + 1)
+
+    def test_overflow_reports_unpruned_estimate(self) -> None:
+        history = _history(("user", _LONG), ("assistant", _LONG))
+        with self.assertRaises(ContextBudgetExceeded) as raised:
+            _manager().prepare(
+                model_context_limit=2048,
+                system_messages=[ContextMessage(role="system", content="z" * 3000)],
+                history_messages=history,
+                latest_summary_text=None,
+                turn_count_since_last_summary=0,
+                user_input="hi",
+            )
+
+        self.assertEqual(raised.exception.input_budget, 768)
+        self.assertEqual(raised.exception.estimated_tokens, 938 + 250 + 1)
+
+
+class ContextManagerArithmeticTests(unittest.TestCase):
+    def test_integer_estimate_matches_float_formula(self) -> None:
+        for length in range(0, 20_000):
+            self.assertEqual(estimate_tokens_for_length(length), max(1, ceil(length / 4 * 1.25)), length)
+
+    def test_integer_reserves_match_float_formula(self) -> None:
+        manager = _manager(max_output_tokens=1_000_000)
+        for limit in range(2048, 300_000, 7):
+            context = manager.prepare(
+                model_context_limit=limit,
+                system_messages=[],
+                history_messages=[],
+                latest_summary_text=None,
+                turn_count_since_last_summary=0,
+                user_input="hi",
+            )
+            self.assertEqual(context.output_reserve, floor(limit * 0.20), limit)
+            self.assertEqual(context.overhead_reserve, max(1024, floor(limit * 0.05)), limit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,16 @@ class DecimalFormatTests(unittest.TestCase):
     def test_format_decimal_strips_trailing_zeros(self) -> None:
         self.assertEqual(format_decimal(Decimal("5.2500")), "5.25")
 
+    def test_format_decimal_whole_amounts(self) -> None:
+        self.assertEqual(format_decimal(Decimal("100.00000000")), "100")
+        self.assertEqual(format_decimal(Decimal("-3.0000")), "-3")
+        self.assertEqual(format_decimal(Decimal("1E+2")), "100")
+
+    def test_format_decimal_equal_values_share_output(self) -> None:
+        self.assertEqual(format_decimal(Decimal("0.5000")), "0.5")
+        self.assertEqual(format_decimal(Decimal("0.5")), "0.5")
+        self.assertEqual(format_decimal(Decimal("-0.00010000")), "-0.0001")
+
 
 if __name__ == "__main__":
     unittest.main()
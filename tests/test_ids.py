@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import time
+import unittest
+import uuid
+
+from apps.api.app.utils.ids import uuid7
+
+
+class Uuid7Tests(unittest.TestCase):
+    def test_version_and_variant(self) -> None:
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_embeds_current_unix_millis(self) -> None:
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+        self.assertTrue(before <= value.int >> 80 <= after)
+
+    def test_later_ids_sort_after_earlier_ones(self) -> None:
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        self.assertLess(str(first), str(second))
+
+
+if __name__ == "__main__":
+    unittest.main()
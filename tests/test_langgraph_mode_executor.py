@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import nullcontext
 import json
 import os
 from dataclasses import dataclass, field
@@ -21,7 +22,7 @@ from apps.api.app.services.orchestration.mode_executor import (
     LangGraphModeExecutor,
     TurnExecutionInput,
 )
-from apps.api.app.services.tools.file_tool import DefaultFileReadTool
+from apps.api.app.services.tools.file_tool import DefaultFileReadTool, FileReadResult
 from apps.api.app.services.tools.search_tool import SearchResult
 
 # Keep import-time settings self-contained for CI/local test runs.
@@ -71,7 +72,7 @@ class LangGraphModeExecutorTests(unittest.TestCase):
 
         async def run():
             return await executor.run_turn(
-                db=None,  # type: ignore[arg-type]
+                session_factory=None,  # type: ignore[arg-type]
                 payload=TurnExecutionInput(
                     model_alias="deepseek",
                     messages=[
@@ -89,6 +90,28 @@ class LangGraphModeExecutorTests(unittest.TestCase):
         self.assertEqual(output.usage.total_tokens, 18)
         self.assertEqual(len(gateway.calls), 1)
 
+    def test_run_turn_without_tools_skips_graph_dispatch_for_memory_checkpointer(self) -> None:
+        gateway = FakeGateway()
+        executor = LangGraphModeExecutor(llm_gateway=gateway)
+
+        async def run():
+            return await executor.run_turn(
+                session_factory=None,  # type: ignore[arg-type]
+                payload=TurnExecutionInput(
+                    model_alias="deepseek",
+                    messages=[GatewayMessage(role="user", content="u")],
+                    max_output_tokens=256,
+                    thread_id="thread-direct-1",
+                ),
+            )
+
+        with patch.object(mode_executor, "_get_checkpointer", return_value=MemorySaver()):
+            output = asyncio.run(run())
+        self.assertEqual(output.text, "graph-response")
+        self.assertEqual(output.tool_calls, ())
+        graph = executor._graphs[()]
+        self.assertIsNone(graph.checkpointer.get_tuple({"configurable": {"thread_id": "thread-direct-1"}}))
+
     def test_run_turn_uses_search_tool_when_permitted_and_query_present(self) -> None:
         gateway = FakeGateway()
         search_tool = FakeSearchTool()
@@ -96,7 +119,7 @@ class LangGraphModeExecutorTests(unittest.TestCase):
 
         async def run():
             return await executor.run_turn(
-                db=None,  # type: ignore[arg-type]
+                session_factory=None,  # type: ignore[arg-type]
                 payload=TurnExecutionInput(
                     model_alias="deepseek",
                     messages=[
@@ -130,7 +153,7 @@ class LangGraphModeExecutorTests(unittest.TestCase):
 
         async def run():
             return await executor.run_turn(
-                db=None,  # type: ignore[arg-type]
+                session_factory=None,  # type: ignore[arg-type]
                 payload=TurnExecutionInput(
                     model_alias="deepseek",
                     messages=[
@@ -151,6 +174,86 @@ class LangGraphModeExecutorTests(unittest.TestCase):
         self.assertFalse(any("Tool(search) results" in message.content for message in injected_messages))
         self.assertEqual(output.tool_calls, ())
 
+    def test_search_and_file_read_run_concurrently(self) -> None:
+        gateway = FakeGateway()
+        started: list[str] = []
+
+        class RendezvousSearchTool:
+            async def search(self, query: str, max_results: int = 5) -> list[SearchResult]:
+                _ = query, max_results
+                started.append("search")
+                # Only completes if file_read starts while this search is still pending.
+                while "file_read" not in started:
+                    await asyncio.sleep(0)
+                return []
+
+        class RendezvousFileReadTool:
+            async def read(self, *, file_id: str, room_id: str, db) -> FileReadResult:
+                _ = file_id, room_id, db
+                started.append("file_read")
+                while "search" not in started:
+                    await asyncio.sleep(0)
+                return FileReadResult(status="completed", content="body", error=None)
+
+        executor = LangGraphModeExecutor(
+            llm_gateway=gateway,
+            search_tool=RendezvousSearchTool(),
+            file_read_tool=RendezvousFileReadTool(),
+        )
+
+        async def run():
+            return await asyncio.wait_for(
+                executor.run_turn(
+                    session_factory=nullcontext,  # type: ignore[arg-type]
+                    payload=TurnExecutionInput(
+                        model_alias="deepseek",
+                        messages=[
+                            GatewayMessage(role="user", content="search: news"),
+                            GatewayMessage(role="user", content="file: f-1"),
+                        ],
+                        max_output_tokens=256,
+                        thread_id="thread-concurrent-1",
+                        allowed_tool_names=("search", "file_read"),
+                    ),
+                ),
+                timeout=5,
+            )
+
+        output = asyncio.run(run())
+        self.assertEqual([call.tool_name for call in output.tool_calls], ["search", "file_read"])
+        self.assertEqual([call.status for call in output.tool_calls], ["success", "success"])
+        tool_messages = [message.content for message in gateway.calls[0] if message.role == "system"]
+        self.assertEqual(len(tool_messages), 2)
+        self.assertTrue(tool_messages[0].startswith("Tool(search) results"))
+        self.assertTrue(tool_messages[1].startswith("Tool(file_read) content"))
+
+    def test_checkpointer_is_built_once_and_shared_across_compiled_graphs(self) -> None:
+        mode_executor._get_checkpointer.cache_clear()
+        self.addCleanup(mode_executor._get_checkpointer.cache_clear)
+        executor = LangGraphModeExecutor(llm_gateway=FakeGateway(), search_tool=FakeSearchTool())
+        with patch.object(mode_executor, "_build_checkpointer", side_effect=MemorySaver) as build:
+            search_graph = executor._get_compiled_graph({"search"})
+            plain_graph = executor._get_compiled_graph(set())
+        build.assert_called_once()
+        self.assertIs(search_graph.checkpointer, plain_graph.checkpointer)
+
+    def test_extract_tool_triggers_uses_newest_user_message_for_each_trigger(self) -> None:
+        executor = LangGraphModeExecutor(llm_gateway=FakeGateway())
+        messages = [
+            GatewayMessage(role="user", content="search: older query"),
+            GatewayMessage(role="user", content="  FILE: file-1 "),
+            GatewayMessage(role="user", content="Search for newer query"),
+            GatewayMessage(role="assistant", content="file: not-from-user"),
+            GatewayMessage(role="user", content="   "),
+        ]
+        self.assertEqual(executor._extract_tool_triggers(messages), ("newer query", "file-1"))
+        # An empty trigger on the newest match decides the result; older messages are not consulted.
+        self.assertEqual(
+            executor._extract_tool_triggers([*messages, GatewayMessage(role="user", content="search:  ")]),
+            (None, "file-1"),
+        )
+        self.assertEqual(executor._extract_tool_triggers([GatewayMessage(role="system", content="search: x")]), (None, None))
+
     def test_build_checkpointer_logs_warning_and_uses_memory_fallback(self) -> None:
         with patch.object(mode_executor, "_LOGGER") as logger:
             mode_executor._POSTGRES_CHECKPOINTER_SETUP_DONE = False
@@ -311,18 +414,17 @@ class FileReadNodeTests(unittest.TestCase):
         file_id, room_id = self._seed_uploaded_file(parse_status="completed", parsed_text="test content")
 
         async def run() -> None:
-            async with self.session_factory() as session:
-                return await executor.run_turn(
-                    db=session,
-                    payload=TurnExecutionInput(
-                        model_alias="deepseek",
-                        messages=[GatewayMessage(role="user", content=f"file: {file_id}")],
-                        max_output_tokens=256,
-                        thread_id="file-thread-1",
-                        allowed_tool_names=("file_read",),
-                        room_id=room_id,
-                    ),
-                )
+            return await executor.run_turn(
+                session_factory=self.session_factory,
+                payload=TurnExecutionInput(
+                    model_alias="deepseek",
+                    messages=[GatewayMessage(role="user", content=f"file: {file_id}")],
+                    max_output_tokens=256,
+                    thread_id="file-thread-1",
+                    allowed_tool_names=("file_read",),
+                    room_id=room_id,
+                ),
+            )
 
         output = asyncio.run(run())
         self.assertEqual(len(output.tool_calls), 1)
@@ -331,6 +433,36 @@ class FileReadNodeTests(unittest.TestCase):
         self.assertEqual(len(gateway.calls), 1)
         self.assertTrue(any("Tool(file_read) content" in message.content for message in gateway.calls[0]))
 
+    def test_file_read_graph_is_compiled_once_and_reads_with_each_turns_session_factory(self) -> None:
+        gateway = FakeGateway()
+        executor = LangGraphModeExecutor(
+            llm_gateway=gateway,
+            search_tool=FakeSearchTool(),
+            file_read_tool=DefaultFileReadTool(),
+        )
+        seeded = [
+            self._seed_uploaded_file(parse_status="completed", parsed_text=f"content {index}") for index in range(2)
+        ]
+
+        async def run_one(index: int, file_id: str, room_id: str):
+            return await executor.run_turn(
+                session_factory=self.session_factory,
+                payload=TurnExecutionInput(
+                    model_alias="deepseek",
+                    messages=[GatewayMessage(role="user", content=f"file: {file_id}")],
+                    max_output_tokens=256,
+                    thread_id=f"file-thread-cached-{index}",
+                    allowed_tool_names=("file_read",),
+                    room_id=room_id,
+                ),
+            )
+
+        outputs = [asyncio.run(run_one(index, file_id, room_id)) for index, (file_id, room_id) in enumerate(seeded)]
+        self.assertEqual([output.tool_calls[0].status for output in outputs], ["success", "success"])
+        self.assertEqual(list(executor._graphs), [("file_read",)])
+        self.assertTrue(any("content 0" in message.content for message in gateway.calls[0]))
+        self.assertTrue(any("content 1" in message.content for message in gateway.calls[1]))
+
     def test_file_read_permitted_and_pending(self) -> None:
         gateway = FakeGateway()
         executor = LangGraphModeExecutor(
@@ -341,18 +473,17 @@ class FileReadNodeTests(unittest.TestCase):
         file_id, room_id = self._seed_uploaded_file(parse_status="pending")
 
         async def run() -> None:
-            async with self.session_factory() as session:
-                return await executor.run_turn(
-                    db=session,
-                    payload=TurnExecutionInput(
-                        model_alias="deepseek",
-                        messages=[GatewayMessage(role="user", content=f"file: {file_id}")],
-                        max_output_tokens=256,
-                        thread_id="file-thread-2",
-                        allowed_tool_names=("file_read",),
-                        room_id=room_id,
-                    ),
-                )
+            return await executor.run_turn(
+                session_factory=self.session_factory,
+                payload=TurnExecutionInput(
+                    model_alias="deepseek",
+                    messages=[GatewayMessage(role="user", content=f"file: {file_id}")],
+                    max_output_tokens=256,
+                    thread_id="file-thread-2",
+                    allowed_tool_names=("file_read",),
+                    room_id=room_id,
+                ),
+            )
 
         output = asyncio.run(run())
         self.assertEqual(len(output.tool_calls), 1)
@@ -370,7 +501,7 @@ class FileReadNodeTests(unittest.TestCase):
 
         async def run() -> None:
             return await executor.run_turn(
-                db=None,  # type: ignore[arg-type]
+                session_factory=None,  # type: ignore[arg-type]
                 payload=TurnExecutionInput(
                     model_alias="deepseek",
                     messages=[GatewayMessage(role="user", content=f"file: {uuid4()}")],
@@ -397,21 +528,20 @@ class FileReadNodeTests(unittest.TestCase):
         file_id, room_id = self._seed_uploaded_file(parse_status="completed", parsed_text="combined content")
 
         async def run() -> None:
-            async with self.session_factory() as session:
-                return await executor.run_turn(
-                    db=session,
-                    payload=TurnExecutionInput(
-                        model_alias="deepseek",
-                        messages=[
-                            GatewayMessage(role="user", content="search: latest ai news"),
-                            GatewayMessage(role="user", content=f"file: {file_id}"),
-                        ],
-                        max_output_tokens=256,
-                        thread_id="file-search-thread-1",
-                        allowed_tool_names=("search", "file_read"),
-                        room_id=room_id,
-                    ),
-                )
+            return await executor.run_turn(
+                session_factory=self.session_factory,
+                payload=TurnExecutionInput(
+                    model_alias="deepseek",
+                    messages=[
+                        GatewayMessage(role="user", content="search: latest ai news"),
+                        GatewayMessage(role="user", content=f"file: {file_id}"),
+                    ],
+                    max_output_tokens=256,
+                    thread_id="file-search-thread-1",
+                    allowed_tool_names=("search", "file_read"),
+                    room_id=room_id,
+                ),
+            )
 
         output = asyncio.run(run())
         self.assertEqual(search_tool.calls, ["latest ai news"])
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessageChunk
+
+from apps.api.app.services.llm.gateway import GatewayMessage, GatewayRequest, GatewayUsage, OpenRouterLlmGateway
+
+
+class FakeStreamingModel:
+    def __init__(self, chunks: list[AIMessageChunk], error: Exception | None = None) -> None:
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    async def astream(self, messages):
+        _ = messages
+        try:
+            for chunk in self.chunks:
+                await asyncio.sleep(0)
+                yield chunk
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.closed = True
+
+
+def _request() -> GatewayRequest:
+    return GatewayRequest(
+        model_alias="deepseek",
+        messages=[GatewayMessage(role="user", content="hello")],
+        max_output_tokens=64,
+    )
+
+
+class GatewayStreamTests(unittest.TestCase):
+    def _stream(self, model: FakeStreamingModel, consume):
+        async def run():
+            with patch("apps.api.app.services.llm.gateway.get_chat_model", return_value=model):
+                stream_ctx = await OpenRouterLlmGateway().stream(_request())
+                return await consume(stream_ctx)
+
+        return asyncio.run(run())
+
+    def test_stream_yields_deltas_then_resolves_usage(self) -> None:
+        model = FakeStreamingModel(
+            [
+                AIMessageChunk(content="Hel", response_metadata={"model_name": "fake/provider"}),
+                AIMessageChunk(content="lo"),
+                AIMessageChunk(
+                    content="",
+                    usage_metadata={
+                        "input_tokens": 9,
+                        "output_tokens": 2,
+                        "total_tokens": 11,
+                        "input_token_details": {"cache_read": 4},
+                    },
+                ),
+            ]
+        )
+
+        async def consume(stream_ctx):
+            deltas = [delta async for delta in stream_ctx.chunks]
+            return deltas, await stream_ctx.usage_future, await stream_ctx.provider_model_future
+
+        deltas, usage, provider_model = self._stream(model, consume)
+        self.assertEqual(deltas, ["Hel", "lo"])
+        self.assertEqual(
+            usage,
+            GatewayUsage(input_tokens_fresh=5, input_tokens_cached=4, output_tokens=2, total_tokens=11),
+        )
+        self.assertEqual(provider_model, "fake/provider")
+
+    def test_stream_estimates_usage_when_provider_omits_it(self) -> None:
+        model = FakeStreamingModel([AIMessageChunk(content="a" * 30), AIMessageChunk(content="b" * 34)])
+
+        async def consume(stream_ctx):
+            _ = [delta async for delta in stream_ctx.chunks]
+            return await stream_ctx.usage_future
+
+        usage = self._stream(model, consume)
+        # 64 streamed chars -> ceil(64 / 4 * 1.25) = 20; "hello" -> 2.
+        self.assertEqual(usage.output_tokens, 20)
+        self.assertEqual(usage.input_tokens_fresh, 2)
+        self.assertEqual(usage.total_tokens, 22)
+
+    def test_stream_reraises_upstream_error_after_delivered_deltas(self) -> None:
+        model = FakeStreamingModel([AIMessageChunk(content="partial")], error=RuntimeError("upstream reset"))
+
+        async def consume(stream_ctx):
+            deltas: list[str] = []
+            with self.assertRaisesRegex(RuntimeError, "upstream reset"):
+                async for delta in stream_ctx.chunks:
+                    deltas.append(delta)
+            with self.assertRaises(RuntimeError):
+                await stream_ctx.usage_future
+            return deltas
+
+        self.assertEqual(self._stream(model, consume), ["partial"])
+
+    def test_stream_stops_upstream_when_consumer_closes_early(self) -> None:
+        model = FakeStreamingModel([AIMessageChunk(content=str(index)) for index in range(500)])
+
+        async def consume(stream_ctx):
+            first = await anext(stream_ctx.chunks)
+            await stream_ctx.chunks.aclose()
+            await asyncio.sleep(0)
+            return first, model.closed
+
+        self.assertEqual(self._stream(model, consume), ("0", True))
+
+
+class GatewayAliasTests(unittest.TestCase):
+    def test_unknown_alias_is_rejected_by_the_chat_model_lookup(self) -> None:
+        request = GatewayRequest(
+            model_alias="not-a-model",
+            messages=[GatewayMessage(role="user", content="hello")],
+            max_output_tokens=64,
+        )
+        for call in (OpenRouterLlmGateway().generate, OpenRouterLlmGateway().stream):
+            with self.subTest(call=call.__name__):
+                with self.assertRaisesRegex(ValueError, "Unknown model alias 'not-a-model'. Supported: "):
+                    asyncio.run(call(request))
+
+
+if __name__ == "__main__":
+    unittest.main()
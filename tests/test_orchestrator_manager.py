@@ -126,6 +126,22 @@ class OrchestratorManagerTests(unittest.TestCase):
         self.assertEqual(decision.selected_agent_key, "writer")
         logger.warning.assert_called()
 
+    def test_route_turn_single_agent_skips_manager_call(self) -> None:
+        gateway = FakeGateway(response_text='{"selected_agent_keys":["ghost"]}')
+        agents = [_agent("writer", "Writes polished output.")]
+
+        async def run():
+            return await route_turn(
+                agents=agents,
+                user_input="Draft the intro.",
+                gateway=gateway,
+                manager_model_alias="deepseek",
+            )
+
+        decision = asyncio.run(run())
+        self.assertEqual(decision.selected_agent_keys, ("writer",))
+        self.assertEqual(gateway.calls, [])
+
 
 class StripJsonFencesTests(unittest.TestCase):
     def test_strips_json_fences(self) -> None:
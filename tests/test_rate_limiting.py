@@ -19,9 +19,8 @@ os.environ.setdefault("API_CORS_ALLOWED_ORIGINS", "http://localhost:3000")
 
 from apps.api.app.core.config import get_settings
 from apps.api.app.db.models import Agent, Base, Session, User
-from apps.api.app.db.session import get_db
+from apps.api.app.db.session import get_db, get_session_factory
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.main import app
 from apps.api.app.services.llm.gateway import (
     GatewayRequest,
     GatewayResponse,
@@ -36,6 +35,8 @@ from apps.api.app.services.orchestration.mode_executor import (
 )
 from apps.api.app.services.usage.recorder import UsageRecord, get_usage_recorder
 
+from route_app import app
+
 
 @dataclass
 class FakeRedisPool:
@@ -96,8 +97,10 @@ class FakeGateway:
 
 @dataclass
 class FakeModeExecutor:
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput:
-        _ = db
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput:
+        _ = session_factory
         _ = payload
         return TurnExecutionOutput(
             text="ok",
@@ -157,6 +160,7 @@ class RateLimitingTests(unittest.TestCase):
             return {"user_id": cls.current_user_id, "email": cls.current_email}
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_session_factory] = lambda: cls.session_factory
         app.dependency_overrides[get_current_user] = override_current_user
         app.dependency_overrides[get_llm_gateway] = lambda: cls.fake_gateway
         app.dependency_overrides[get_mode_executor] = lambda: cls.fake_mode_executor
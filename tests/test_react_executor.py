@@ -1,11 +1,16 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from apps.api.app.services.llm.gateway import GatewayMessage, GatewayRequest, GatewayResponse, GatewayUsage
 from apps.api.app.services.orchestration.mode_executor import TurnExecutionInput
@@ -101,7 +106,7 @@ class ReactExecutorTests(unittest.TestCase):
             with patch("apps.api.app.services.orchestration.react_executor.create_react_agent", side_effect=stub_create):
                 output = asyncio.run(
                     executor.run_turn(
-                        db=None,  # type: ignore[arg-type]
+                        session_factory=None,  # type: ignore[arg-type]
                         payload=TurnExecutionInput(
                             model_alias="deepseek",
                             messages=[GatewayMessage(role="user", content="search for latest ai")],
@@ -161,7 +166,7 @@ class ReactExecutorTests(unittest.TestCase):
             with patch("apps.api.app.services.orchestration.react_executor.create_react_agent", side_effect=stub_create):
                 output = asyncio.run(
                     executor.run_turn(
-                        db=None,  # type: ignore[arg-type]
+                        session_factory=nullcontext,  # type: ignore[arg-type]
                         payload=TurnExecutionInput(
                             model_alias="deepseek",
                             messages=[GatewayMessage(role="user", content="read this file")],
@@ -178,6 +183,69 @@ class ReactExecutorTests(unittest.TestCase):
         self.assertEqual(len(output.tool_calls), 1)
         self.assertEqual(output.tool_calls[0].tool_name, "file_read")
 
+    def test_react_agent_file_tool_holds_no_connection_across_llm_calls(self) -> None:
+        gateway = FakeGateway()
+        search_tool = FakeSearchTool()
+        checked_out: dict[str, int] = {}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmpdir, 'pool.db')}")
+            session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+            class QueryingFileReadTool:
+                async def read(self, *, file_id: str, room_id: str, db):
+                    _ = (file_id, room_id)
+                    await db.execute(text("SELECT 1"))
+                    checked_out["during_tool"] = engine.pool.checkedout()
+                    return type("Result", (), {"status": "completed", "content": "file text", "error": None})()
+
+            executor = ReactAgentExecutor(gateway, search_tool, QueryingFileReadTool())
+
+            class StubAgent:
+                async def ainvoke(self, payload):
+                    _ = payload
+                    # The model calls on either side of the tool stand in for the LLM round-trips.
+                    checked_out["before_tool"] = engine.pool.checkedout()
+                    file_result = await stub_create.tools[0].ainvoke({"file_id": "file-1"})
+                    checked_out["after_tool"] = engine.pool.checkedout()
+                    return {
+                        "messages": [
+                            ToolMessage(content=file_result, tool_call_id="call_3"),
+                            AIMessage(content="done", response_metadata={"model_name": "fake/react-model"}),
+                        ]
+                    }
+
+            def stub_create(*, model, tools):
+                _ = model
+                stub_create.tools = tools
+                return StubAgent()
+
+            async def run():
+                try:
+                    return await executor.run_turn(
+                        session_factory=session_factory,
+                        payload=TurnExecutionInput(
+                            model_alias="deepseek",
+                            messages=[GatewayMessage(role="user", content="read this file")],
+                            max_output_tokens=256,
+                            thread_id="t5",
+                            allowed_tool_names=("file_read",),
+                            room_id="room-1",
+                        ),
+                    )
+                finally:
+                    await engine.dispose()
+
+            with patch("apps.api.app.services.orchestration.react_executor.get_chat_model", return_value=object()):
+                with patch(
+                    "apps.api.app.services.orchestration.react_executor.create_react_agent",
+                    side_effect=stub_create,
+                ):
+                    output = asyncio.run(run())
+
+        self.assertEqual(output.tool_calls[0].status, "success")
+        self.assertEqual(checked_out, {"before_tool": 0, "during_tool": 1, "after_tool": 0})
+
     def test_react_agent_no_tool_call(self) -> None:
         gateway = FakeGateway()
         search_tool = FakeSearchTool()
@@ -202,7 +270,7 @@ class ReactExecutorTests(unittest.TestCase):
             with patch("apps.api.app.services.orchestration.react_executor.create_react_agent", return_value=StubAgent()):
                 output = asyncio.run(
                     executor.run_turn(
-                        db=None,  # type: ignore[arg-type]
+                        session_factory=None,  # type: ignore[arg-type]
                         payload=TurnExecutionInput(
                             model_alias="deepseek",
                             messages=[GatewayMessage(role="user", content="hello")],
@@ -224,7 +292,7 @@ class ReactExecutorTests(unittest.TestCase):
 
         output = asyncio.run(
             executor.run_turn(
-                db=None,  # type: ignore[arg-type]
+                session_factory=None,  # type: ignore[arg-type]
                 payload=TurnExecutionInput(
                     model_alias="deepseek",
                     messages=[GatewayMessage(role="user", content="no tools")],
@@ -22,9 +22,10 @@ from apps.api.app.dependencies.auth import get_current_user
 from apps.api.app.db.models import Agent, Base, Room, RoomAgent, UploadedFile, User
 from apps.api.app.db.session import get_db
 from apps.api.app.dependencies.arq import get_arq_redis
-from apps.api.app.main import app
 from apps.api.app.services.storage.supabase_storage import get_storage_service
 
+from route_app import app
+
 
 @dataclass
 class FakeStorageService:
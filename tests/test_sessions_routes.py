@@ -38,10 +38,9 @@ from apps.api.app.db.models import (
     TurnContextAudit,
     User,
 )
-from apps.api.app.db.session import get_db
+from apps.api.app.db.session import get_db, get_session_factory
 from apps.api.app.dependencies.auth import get_current_user
 from apps.api.app.core.config import get_settings
-from apps.api.app.main import app
 from apps.api.app.services.llm.gateway import (
     GatewayRequest,
     GatewayResponse,
@@ -49,6 +48,7 @@ from apps.api.app.services.llm.gateway import (
     StreamingContext,
     get_llm_gateway,
 )
+from apps.api.app.services.orchestration.context_manager import ContextManager
 from apps.api.app.services.orchestration.mode_executor import (
     ToolCallRecord,
     TurnExecutionInput,
@@ -59,8 +59,11 @@ from apps.api.app.services.orchestration.orchestrator_manager import (
     OrchestratorRoundDecision,
     OrchestratorRoutingDecision,
 )
+from apps.api.app.services.orchestration.summary_generator import generate_summary_text
 from apps.api.app.services.usage.recorder import UsageRecord, get_usage_recorder
 
+from route_app import app
+
 
 @dataclass
 class FakeGateway:
@@ -173,8 +176,10 @@ class FakeManagerGateway:
 class FakeModeExecutor:
     gateway: FakeGateway
 
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput:
-        _ = db
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput:
+        _ = session_factory
         response = await self.gateway.generate(
             GatewayRequest(
                 model_alias=payload.model_alias,
@@ -194,8 +199,10 @@ class PartialFailModeExecutor:
     gateway: FakeGateway
     fail_aliases: set[str] = field(default_factory=set)
 
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput:
-        _ = db
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput:
+        _ = session_factory
         if payload.model_alias in self.fail_aliases:
             raise RuntimeError(f"forced failure for {payload.model_alias}")
         response = await self.gateway.generate(
@@ -213,19 +220,24 @@ class PartialFailModeExecutor:
 
 
 class ConflictInjectingModeExecutor:
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput:
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput:
         session_id, turn_index_str, _ = payload.thread_id.split(":", 2)
-        db.add(
-            Turn(
-                id=str(uuid4()),
-                session_id=session_id,
-                turn_index=int(turn_index_str),
-                mode="orchestrator",
-                user_input="conflict-seed",
-                assistant_output="seed",
-                status="completed",
+        # A concurrent request commits the same turn index while this turn's LLM call runs.
+        async with session_factory() as db:
+            db.add(
+                Turn(
+                    id=str(uuid4()),
+                    session_id=session_id,
+                    turn_index=int(turn_index_str),
+                    mode="orchestrator",
+                    user_input="conflict-seed",
+                    assistant_output="seed",
+                    status="completed",
+                )
             )
-        )
+            await db.commit()
         return TurnExecutionOutput(
             text="ok",
             provider_model="conflict/injector",
@@ -239,8 +251,10 @@ class ConflictInjectingModeExecutor:
 
 
 class FakeToolTelemetryModeExecutor:
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput:
-        _ = db
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput:
+        _ = session_factory
         tool_calls: tuple[ToolCallRecord, ...] = ()
         last_user = ""
         for message in payload.messages:
@@ -302,6 +316,7 @@ class SessionTurnRoutesTests(unittest.TestCase):
             return {"user_id": "primary-user", "email": "primary-user@example.com"}
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_session_factory] = lambda: cls.session_factory
         app.dependency_overrides[get_current_user] = override_current_user
         app.dependency_overrides[get_llm_gateway] = lambda: cls.fake_manager_gateway
         app.dependency_overrides[get_mode_executor] = lambda: cls.fake_mode_executor
@@ -845,6 +860,71 @@ class SessionTurnRoutesTests(unittest.TestCase):
         )
         self.assertEqual(turn_response.status_code, 201)
 
+    def _assert_summary_generated_before_turn_insert(self, turn_path: str) -> None:
+        room_id = self._seed_room(
+            owner_user_id="primary-user",
+            owner_email="primary-user@example.com",
+            room_name=f"Summary Ordering Room {turn_path}",
+        )
+        self._seed_agent(room_id=room_id, agent_key="researcher", model_alias="deepseek")
+        session_response = self.client.post(f"/api/v1/rooms/{room_id}/sessions")
+        self.assertEqual(session_response.status_code, 201)
+        session_id = session_response.json()["id"]
+        turns_before_request: list[int] = [0]
+        turn_counts_at_summary: list[tuple[int, int]] = []
+
+        async def count_turns() -> int:
+            async with self.session_factory() as db:
+                return int(await db.scalar(select(func.count(Turn.id)).where(Turn.session_id == session_id)) or 0)
+
+        async def recording_generate_summary_text(**kwargs):
+            # The test engine shares one connection, so a Turn row already inserted by the
+            # request's write transaction would be visible here before its commit.
+            turn_counts_at_summary.append((turns_before_request[0], await count_turns()))
+            return await generate_summary_text(**kwargs)
+
+        summarizing_context_manager = ContextManager(
+            max_output_tokens=256,
+            summary_trigger_ratio=1.0,
+            prune_trigger_ratio=1.0,
+            mandatory_summary_turn=1,
+            recent_turns_to_keep=1,
+        )
+        with patch(
+            "apps.api.app.api.v1.routes.sessions._build_context_manager",
+            return_value=summarizing_context_manager,
+        ), patch(
+            "apps.api.app.api.v1.routes.sessions.generate_summary_text",
+            side_effect=recording_generate_summary_text,
+        ):
+            for index in range(3):
+                turns_before_request[0] = index
+                if turn_path == "stream":
+                    with self.client.stream(
+                        "POST",
+                        f"/api/v1/sessions/{session_id}/turns/stream",
+                        json={"message": f"Turn {index}"},
+                    ) as response:
+                        self.assertEqual(response.status_code, 200)
+                        "".join(response.iter_text())
+                else:
+                    response = self.client.post(
+                        f"/api/v1/sessions/{session_id}/turns",
+                        json={"message": f"Turn {index}"},
+                    )
+                    self.assertEqual(response.status_code, 201)
+
+        self.assertTrue(turn_counts_at_summary)
+        for turns_before, turns_seen in turn_counts_at_summary:
+            self.assertEqual(turns_seen, turns_before)
+        self.assertEqual(asyncio.run(count_turns()), 3)
+
+    def test_create_turn_generates_summary_before_opening_write_transaction(self) -> None:
+        self._assert_summary_generated_before_turn_insert("turns")
+
+    def test_streaming_turn_generates_summary_before_opening_write_transaction(self) -> None:
+        self._assert_summary_generated_before_turn_insert("stream")
+
     def test_turn_response_summary_fallback_is_false_when_no_summary(self) -> None:
         room_id = self._seed_room(
             owner_user_id="primary-user",
@@ -2090,8 +2170,8 @@ class SessionTurnRoutesTests(unittest.TestCase):
     def test_orchestrator_synthesis_message_persisted(self) -> None:
         self.fake_gateway.calls.clear()
         self.fake_manager_gateway.calls.clear()
+        # Single-agent rooms skip the routing call, so the manager only evaluates and synthesizes.
         self.fake_manager_gateway.response_texts = [
-            '{"selected_agent_key":"writer"}',
             '{"continue": false}',
             "Manager synthesis text.",
         ]
@@ -2132,8 +2212,8 @@ class SessionTurnRoutesTests(unittest.TestCase):
     def test_orchestrator_synthesis_in_turn_output(self) -> None:
         self.fake_gateway.calls.clear()
         self.fake_manager_gateway.calls.clear()
+        # Single-agent rooms skip the routing call, so the manager only evaluates and synthesizes.
         self.fake_manager_gateway.response_texts = [
-            '{"selected_agent_key":"writer"}',
             '{"continue": false}',
             "Consolidated answer.",
         ]
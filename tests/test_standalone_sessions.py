@@ -34,9 +34,8 @@ from apps.api.app.db.models import (
     TurnContextAudit,
     User,
 )
-from apps.api.app.db.session import get_db
+from apps.api.app.db.session import get_db, get_session_factory
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.main import app
 from apps.api.app.services.llm.gateway import GatewayUsage, get_llm_gateway
 from apps.api.app.services.orchestration.mode_executor import (
     TurnExecutionInput,
@@ -44,6 +43,8 @@ from apps.api.app.services.orchestration.mode_executor import (
     get_mode_executor,
 )
 
+from route_app import app
+
 
 @dataclass
 class FakeManagerGateway:
@@ -71,8 +72,10 @@ class FakeManagerGateway:
 class FakeModeExecutor:
     calls: list[TurnExecutionInput] = field(default_factory=list)
 
-    async def run_turn(self, db: AsyncSession, payload: TurnExecutionInput) -> TurnExecutionOutput:
-        _ = db
+    async def run_turn(
+        self, session_factory: async_sessionmaker[AsyncSession], payload: TurnExecutionInput
+    ) -> TurnExecutionOutput:
+        _ = session_factory
         self.calls.append(payload)
         user_texts = [msg.content for msg in payload.messages if msg.role == "user"]
         response_text = " | ".join(user_texts) if user_texts else "ok"
@@ -119,6 +122,7 @@ class StandaloneSessionsTests(unittest.TestCase):
             return {"user_id": "standalone-user", "email": "standalone@example.com"}
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_session_factory] = lambda: cls.session_factory
         app.dependency_overrides[get_current_user] = override_current_user
         app.dependency_overrides[get_llm_gateway] = lambda: cls.fake_manager_gateway
         app.dependency_overrides[get_mode_executor] = lambda: cls.fake_mode_executor
@@ -23,7 +23,8 @@ from apps.api.app.core.config import get_settings
 from apps.api.app.db.models import Base, CreditTransaction, CreditWallet, User
 from apps.api.app.db.session import get_db
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.main import app
+
+from route_app import app
 
 
 class TopUpRoutesTests(unittest.TestCase):
@@ -244,6 +245,59 @@ class TopUpRoutesTests(unittest.TestCase):
 
         self.assertEqual(asyncio.run(fetch_balance()), Decimal("50"))
 
+    def test_webhook_grants_despite_leftover_redis_key(self) -> None:
+        class _ClaimedRedis:
+            async def set(self, *_args, **_kwargs) -> bool:
+                return False
+
+        event = {
+            "type": "payment_intent.succeeded",
+            "data": {
+                "object": {
+                    "id": "pi_test_redis_claimed",
+                    "metadata": {"user_id": self.user_id, "credits": "10"},
+                }
+            },
+        }
+        app.state.arq_redis = _ClaimedRedis()
+        try:
+            with patch("apps.api.app.api.v1.routes.webhooks.construct_webhook_event", return_value=event):
+                response = self.client.post("/webhooks/stripe", content="{}", headers={"Stripe-Signature": "sig"})
+        finally:
+            app.state.arq_redis = None
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+        async def fetch_wallet() -> CreditWallet | None:
+            async with self.session_factory() as session:
+                return await session.scalar(select(CreditWallet).where(CreditWallet.user_id == self.user_id))
+
+        self.assertEqual(asyncio.run(fetch_wallet()).balance, Decimal("10"))
+
+    def test_webhook_ignores_unhandled_event_type_before_verification(self) -> None:
+        with patch("apps.api.app.api.v1.routes.webhooks.construct_webhook_event") as mock_construct:
+            response = self.client.post(
+                "/webhooks/stripe",
+                content=b'{"type": "charge.updated", "data": {"object": {}}}',
+                headers={"Stripe-Signature": "sig"},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ignored"})
+        mock_construct.assert_not_called()
+
+    def test_webhook_still_verifies_handled_event_type(self) -> None:
+        with patch(
+            "apps.api.app.api.v1.routes.webhooks.construct_webhook_event",
+            side_effect=ValueError("bad signature"),
+        ):
+            response = self.client.post(
+                "/webhooks/stripe",
+                content=b'{"type": "payment_intent.succeeded", "data": {"object": {}}}',
+                headers={"Stripe-Signature": "forged"},
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"detail": "invalid stripe signature"})
+
     def test_webhook_rejects_bad_signature(self) -> None:
         with patch(
             "apps.api.app.api.v1.routes.webhooks.construct_webhook_event",
@@ -253,6 +307,24 @@ class TopUpRoutesTests(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.json(), {"detail": "invalid stripe signature"})
 
+    def test_webhook_without_secret_rejects_malformed_payload(self) -> None:
+        os.environ["STRIPE_WEBHOOK_SECRET"] = ""
+        get_settings.cache_clear()
+        response = self.client.post("/webhooks/stripe", content=b"{not json")
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json(), {"detail": "malformed webhook payload"})
+
+    def test_webhook_rejects_oversized_payload(self) -> None:
+        with patch("apps.api.app.api.v1.routes.webhooks.construct_webhook_event") as mock_construct:
+            response = self.client.post(
+                "/webhooks/stripe",
+                content=b"x" * (256 * 1024 + 1),
+                headers={"Stripe-Signature": "sig"},
+            )
+        self.assertEqual(response.status_code, 413)
+        self.assertEqual(response.json(), {"detail": "webhook payload too large"})
+        mock_construct.assert_not_called()
+
     def test_admin_grant_increases_balance(self) -> None:
         self.__class__.current_user_id = self.__class__.admin_user_id
         self.__class__.current_user_email = self.__class__.admin_email
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 import os
+import tempfile
 import unittest
+from unittest.mock import patch
 from uuid import uuid4
 
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 
 # Keep import-time settings self-contained for CI/local test runs.
 os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
@@ -17,18 +19,23 @@ os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "dummy-service-role-key")
 os.environ.setdefault("API_CORS_ALLOWED_ORIGINS", "http://localhost:3000")
 
 from apps.api.app.db.models import Base, CreditTransaction, CreditWallet, LlmCallEvent, User
-from apps.api.app.db.session import get_db
+from apps.api.app.db.session import get_db, get_db_readonly, get_readonly_session_factory
 from apps.api.app.dependencies.auth import get_current_user
-from apps.api.app.main import app
+from apps.api.app.services.billing.wallet import WalletService
+
+from route_app import app
 
 
 class UsersRoutesTests(unittest.TestCase):
     @classmethod
     def setUpClass(cls) -> None:
+        # File-backed with one connection per session: list endpoints overlap their COUNT
+        # and page queries on two sessions, which a single shared StaticPool connection cannot serve.
+        cls.db_dir = tempfile.TemporaryDirectory()
         cls.engine = create_async_engine(
-            "sqlite+aiosqlite:///:memory:",
+            f"sqlite+aiosqlite:///{cls.db_dir.name}/users_routes.db",
             connect_args={"check_same_thread": False},
-            poolclass=StaticPool,
+            poolclass=NullPool,
         )
         cls.session_factory = async_sessionmaker(
             bind=cls.engine,
@@ -53,6 +60,8 @@ class UsersRoutesTests(unittest.TestCase):
             return {"user_id": cls.auth_user_id, "email": cls.auth_email}
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_db_readonly] = override_get_db
+        app.dependency_overrides[get_readonly_session_factory] = lambda: cls.session_factory
         app.dependency_overrides[get_current_user] = override_current_user
         cls.client = TestClient(app)
 
@@ -66,6 +75,7 @@ class UsersRoutesTests(unittest.TestCase):
             await cls.engine.dispose()
 
         asyncio.run(shutdown_db())
+        cls.db_dir.cleanup()
 
     def _set_auth_user(self, *, user_id: str, email: str) -> None:
         self.__class__.auth_user_id = user_id
@@ -100,7 +110,14 @@ class UsersRoutesTests(unittest.TestCase):
         asyncio.run(insert_row())
         return wallet_id
 
-    def _seed_usage_event(self, *, user_id: str, model_alias: str, credits_burned: Decimal) -> str:
+    def _seed_usage_event(
+        self,
+        *,
+        user_id: str,
+        model_alias: str,
+        credits_burned: Decimal,
+        created_at: datetime | None = None,
+    ) -> str:
         event_id = str(uuid4())
 
         async def insert_row() -> None:
@@ -129,7 +146,7 @@ class UsersRoutesTests(unittest.TestCase):
                         status="success",
                         pricing_version="2026-02-20",
                         request_id=None,
-                        created_at=datetime.now(timezone.utc),
+                        created_at=created_at or datetime.now(timezone.utc),
                     )
                 )
                 await session.commit()
@@ -168,6 +185,16 @@ class UsersRoutesTests(unittest.TestCase):
         asyncio.run(insert_row())
         return tx_id
 
+    def _stage_debit(self, *, user_id: str, amount: float, reference_id: str) -> None:
+        async def run() -> None:
+            async with self.session_factory() as session:
+                await WalletService().stage_debit(
+                    session, user_id=user_id, credits_burned=amount, reference_id=reference_id
+                )
+                await session.commit()
+
+        asyncio.run(run())
+
     def test_get_wallet_no_existing_wallet(self) -> None:
         user_id = f"user-{uuid4()}"
         email = f"{user_id}@example.com"
@@ -196,6 +223,26 @@ class UsersRoutesTests(unittest.TestCase):
         self.assertEqual(response.json()["user_id"], user_id)
         self.assertEqual(response.json()["balance"], "5.25")
 
+    def test_get_wallet_existing_wallet_does_not_commit(self) -> None:
+        user_id = f"user-{uuid4()}"
+        email = f"{user_id}@example.com"
+        self._set_auth_user(user_id=user_id, email=email)
+        self._seed_user(user_id=user_id, email=email)
+        self._seed_wallet(user_id=user_id, balance=Decimal("2.5"))
+
+        commit_count = {"value": 0}
+        original_commit = AsyncSession.commit
+
+        async def counting_commit(self: AsyncSession, *args, **kwargs):
+            commit_count["value"] += 1
+            return await original_commit(self, *args, **kwargs)
+
+        with patch.object(AsyncSession, "commit", counting_commit):
+            response = self.client.get("/api/v1/users/me/wallet")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["balance"], "2.5")
+        self.assertEqual(commit_count["value"], 0)
+
     def test_get_usage_empty(self) -> None:
         user_id = f"user-{uuid4()}"
         email = f"{user_id}@example.com"
@@ -204,7 +251,7 @@ class UsersRoutesTests(unittest.TestCase):
 
         response = self.client.get("/api/v1/users/me/usage")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json(), {"events": [], "total": 0})
+        self.assertEqual(response.json(), {"events": [], "total": None, "has_more": False, "next_cursor": None})
 
     def test_get_usage_filters_by_user(self) -> None:
         requesting_user_id = f"user-{uuid4()}"
@@ -226,7 +273,7 @@ class UsersRoutesTests(unittest.TestCase):
             credits_burned=Decimal("2.0"),
         )
 
-        response = self.client.get("/api/v1/users/me/usage?limit=50&offset=0")
+        response = self.client.get("/api/v1/users/me/usage?limit=50&include_total=true")
         self.assertEqual(response.status_code, 200)
         body = response.json()
         self.assertEqual(body["total"], 1)
@@ -243,7 +290,7 @@ class UsersRoutesTests(unittest.TestCase):
 
         response = self.client.get("/api/v1/users/me/transactions")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.json(), {"transactions": [], "total": 0})
+        self.assertEqual(response.json(), {"transactions": [], "total": None, "has_more": False, "next_cursor": None})
 
     def test_get_transactions_returns_own_only(self) -> None:
         requesting_user_id = f"user-{uuid4()}"
@@ -273,7 +320,7 @@ class UsersRoutesTests(unittest.TestCase):
             reference_id="turn-other",
         )
 
-        response = self.client.get("/api/v1/users/me/transactions")
+        response = self.client.get("/api/v1/users/me/transactions?include_total=true")
         self.assertEqual(response.status_code, 200)
         body = response.json()
         self.assertEqual(body["total"], 1)
@@ -299,12 +346,148 @@ class UsersRoutesTests(unittest.TestCase):
                 reference_id=f"turn-{index}",
             )
 
-        response = self.client.get("/api/v1/users/me/transactions?limit=2&offset=0")
+        response = self.client.get("/api/v1/users/me/transactions?limit=2&include_total=true")
         self.assertEqual(response.status_code, 200)
         body = response.json()
         self.assertEqual(body["total"], 5)
+        self.assertTrue(body["has_more"])
+        self.assertEqual(len(body["transactions"]), 2)
+
+    def test_get_transactions_skips_total_by_default(self) -> None:
+        user_id = f"user-{uuid4()}"
+        email = f"{user_id}@example.com"
+        self._set_auth_user(user_id=user_id, email=email)
+        self._seed_user(user_id=user_id, email=email)
+        wallet_id = self._seed_wallet(user_id=user_id, balance=Decimal("100.0"))
+        for index in range(2):
+            self._seed_transaction(
+                wallet_id=wallet_id,
+                user_id=user_id,
+                amount=Decimal("-1.0"),
+                kind="debit",
+                note=f"tx-{index}",
+                reference_id=f"turn-{index}",
+            )
+
+        response = self.client.get("/api/v1/users/me/transactions?limit=2")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertIsNone(body["total"])
+        self.assertFalse(body["has_more"])
+        self.assertIsNone(body["next_cursor"])
         self.assertEqual(len(body["transactions"]), 2)
 
+    def test_get_transactions_keyset_cursor_walks_all_pages(self) -> None:
+        user_id = f"user-{uuid4()}"
+        email = f"{user_id}@example.com"
+        self._set_auth_user(user_id=user_id, email=email)
+        self._seed_user(user_id=user_id, email=email)
+        wallet_id = self._seed_wallet(user_id=user_id, balance=Decimal("100.0"))
+        seeded_ids = {
+            self._seed_transaction(
+                wallet_id=wallet_id,
+                user_id=user_id,
+                amount=Decimal("-1.0"),
+                kind="debit",
+                note=f"tx-{index}",
+                reference_id=f"turn-{index}",
+            )
+            for index in range(5)
+        }
+
+        seen_ids: list[str] = []
+        params: dict[str, str | int] = {"limit": 2}
+        for _ in range(5):
+            response = self.client.get("/api/v1/users/me/transactions", params=params)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen_ids.extend(item["id"] for item in body["transactions"])
+            if body["next_cursor"] is None:
+                break
+            params = {
+                "limit": 2,
+                "cursor_created_at": body["next_cursor"]["created_at"],
+                "cursor_id": body["next_cursor"]["id"],
+            }
+        self.assertEqual(len(seen_ids), 5)
+        self.assertEqual(set(seen_ids), seeded_ids)
+
+    def test_get_transactions_conditional_get_returns_304_until_new_rows(self) -> None:
+        user_id = f"user-{uuid4()}"
+        email = f"{user_id}@example.com"
+        self._set_auth_user(user_id=user_id, email=email)
+        self._seed_user(user_id=user_id, email=email)
+        wallet_id = self._seed_wallet(user_id=user_id, balance=Decimal("10.0"))
+        self._seed_transaction(
+            wallet_id=wallet_id,
+            user_id=user_id,
+            amount=Decimal("-1.0"),
+            kind="debit",
+            note="tx-0",
+            reference_id="turn-0",
+        )
+
+        first = self.client.get("/api/v1/users/me/transactions")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+
+        unchanged = self.client.get("/api/v1/users/me/transactions", headers={"If-None-Match": etag})
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.headers["etag"], etag)
+
+        self._stage_debit(user_id=user_id, amount=2.0, reference_id="turn-1")
+        changed = self.client.get("/api/v1/users/me/transactions", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+        self.assertEqual(len(changed.json()["transactions"]), 2)
+
+    def test_get_usage_etag_changes_for_rows_committed_below_the_newest_timestamp(self) -> None:
+        user_id = f"user-{uuid4()}"
+        email = f"{user_id}@example.com"
+        self._set_auth_user(user_id=user_id, email=email)
+        self._seed_user(user_id=user_id, email=email)
+        self._seed_wallet(user_id=user_id, balance=Decimal("10.0"))
+        self._seed_usage_event(user_id=user_id, model_alias="deepseek", credits_burned=Decimal("1.0"))
+
+        first = self.client.get("/api/v1/users/me/usage")
+        etag = first.headers["etag"]
+
+        # recorded_at is stamped before commit, so a slower turn can commit an older row.
+        self._seed_usage_event(
+            user_id=user_id,
+            model_alias="deepseek",
+            credits_burned=Decimal("0.5"),
+            created_at=datetime.now(timezone.utc) - timedelta(minutes=1),
+        )
+        self._stage_debit(user_id=user_id, amount=0.5, reference_id="turn-late")
+        changed = self.client.get("/api/v1/users/me/usage", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.json()["events"]), 2)
+
+    def test_list_etags_differ_between_usage_and_transactions(self) -> None:
+        user_id = f"user-{uuid4()}"
+        email = f"{user_id}@example.com"
+        self._set_auth_user(user_id=user_id, email=email)
+        self._seed_user(user_id=user_id, email=email)
+        self._seed_wallet(user_id=user_id, balance=Decimal("10.0"))
+
+        usage_etag = self.client.get("/api/v1/users/me/usage").headers["etag"]
+        response = self.client.get("/api/v1/users/me/transactions", headers={"If-None-Match": usage_etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_get_transactions_rejects_partial_cursor(self) -> None:
+        response = self.client.get("/api/v1/users/me/transactions?cursor_id=abc")
+        self.assertEqual(response.status_code, 422)
+
+    def test_partial_cursor_is_rejected_before_conditional_short_circuit(self) -> None:
+        user_id = f"user-{uuid4()}"
+        email = f"{user_id}@example.com"
+        self._set_auth_user(user_id=user_id, email=email)
+        self._seed_user(user_id=user_id, email=email)
+        for path in ("/api/v1/users/me/usage", "/api/v1/users/me/transactions"):
+            response = self.client.get(f"{path}?cursor_id=abc", headers={"If-None-Match": "*"})
+            self.assertEqual(response.status_code, 422, path)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import StaticPool
 
 from apps.api.app.db.models import Base, CreditTransaction, CreditWallet
-from apps.api.app.services.billing.wallet import WalletService
+from apps.api.app.services.billing.wallet import DebitResult, WalletService
 
 
 class WalletServiceTests(unittest.TestCase):
@@ -100,6 +100,51 @@ class WalletServiceTests(unittest.TestCase):
         self.assertEqual(first_id, second_id)
         self.assertEqual(wallet_count, 1)
 
+    def test_ensure_wallet_falls_back_to_existing_row_on_conflict(self) -> None:
+        service = WalletService()
+        user_id = f"user-{uuid4()}"
+        existing_wallet_id = self._seed_wallet(user_id=user_id, balance=Decimal("3"))
+
+        async def run() -> tuple[str, bool]:
+            async with self.session_factory() as session:
+                # Simulate losing the race: the initial lookup misses, then the real insert conflicts.
+                real_scalar = session.scalar
+                calls = 0
+
+                async def scalar_missing_first(statement, *args, **kwargs):
+                    nonlocal calls
+                    calls += 1
+                    if calls == 1:
+                        return None
+                    return await real_scalar(statement, *args, **kwargs)
+
+                with patch.object(session, "scalar", side_effect=scalar_missing_first):
+                    wallet, created = await service.ensure_wallet(session, user_id=user_id)
+                return wallet.id, created
+
+        wallet_id, created = asyncio.run(run())
+        self.assertEqual(wallet_id, existing_wallet_id)
+        self.assertFalse(created)
+
+    def test_ensure_wallet_debit_on_new_wallet_persists(self) -> None:
+        service = WalletService()
+        user_id = f"user-{uuid4()}"
+
+        async def run() -> bool:
+            async with self.session_factory() as session:
+                _, created = await service.ensure_wallet(session, user_id=user_id)
+                await service.stage_debit(session, user_id=user_id, credits_burned=1.5)
+                await session.commit()
+                return created
+
+        async def fetch_balance() -> Decimal:
+            async with self.session_factory() as session:
+                wallet = await session.scalar(select(CreditWallet).where(CreditWallet.user_id == user_id))
+                return wallet.balance
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(asyncio.run(fetch_balance()), Decimal("-1.5"))
+
     def test_stage_debit_reduces_balance(self) -> None:
         service = WalletService()
         user_id = f"user-{uuid4()}"
@@ -148,6 +193,101 @@ class WalletServiceTests(unittest.TestCase):
         self.assertEqual(kind, "debit")
         self.assertEqual(amount, Decimal("-0.5"))
 
+    def test_stage_debits_applies_one_update_with_running_balances(self) -> None:
+        service = WalletService()
+        user_id = f"user-{uuid4()}"
+        self._seed_wallet(user_id=user_id, balance=Decimal("10.0"))
+
+        async def run() -> tuple[list[Decimal], list[Decimal]]:
+            async with self.session_factory() as session:
+                results = await service.stage_debits(
+                    session,
+                    user_id=user_id,
+                    credits_burned=[0.5, 1.25, 2.0],
+                    reference_id="turn-4",
+                    note="turn:turn-4",
+                )
+                await session.commit()
+                rows = await session.scalars(
+                    select(CreditTransaction.amount).where(CreditTransaction.user_id == user_id)
+                )
+                return [result.new_balance for result in results], sorted(rows.all())
+
+        balances, amounts = asyncio.run(run())
+        self.assertEqual(balances, [Decimal("9.5"), Decimal("8.25"), Decimal("6.25")])
+        self.assertEqual(amounts, [Decimal("-2.0"), Decimal("-1.25"), Decimal("-0.5")])
+
+    def test_stage_grant_invalidates_cached_balance(self) -> None:
+        service = WalletService()
+        user_id = f"user-{uuid4()}"
+        self._seed_wallet(user_id=user_id, balance=Decimal("5"))
+        service.balance_cache.set(user_id, Decimal("5"))
+
+        async def run() -> None:
+            async with self.session_factory() as session:
+                await service.stage_grant(session, user_id=user_id, amount=2.0)
+                await session.commit()
+
+        asyncio.run(run())
+        self.assertIsNone(service.balance_cache.get(user_id))
+
+    def test_balance_cache_is_invalidated_at_commit_not_at_staging(self) -> None:
+        service = WalletService()
+        user_id = f"user-{uuid4()}"
+        self._seed_wallet(user_id=user_id, balance=Decimal("5"))
+
+        async def run() -> tuple[Decimal | None, Decimal | None]:
+            async with self.session_factory() as session:
+                await service.stage_debit(session, user_id=user_id, credits_burned=1.0)
+                # A concurrent GET /me/wallet between staging and commit re-caches the old balance.
+                service.balance_cache.set(user_id, Decimal("5"))
+                before_commit = service.balance_cache.get(user_id)
+                await session.commit()
+                return before_commit, service.balance_cache.get(user_id)
+
+        before_commit, after_commit = asyncio.run(run())
+        self.assertEqual(before_commit, Decimal("5"))
+        self.assertIsNone(after_commit)
+
+    def test_stage_grant_and_debit_refresh_loaded_wallet(self) -> None:
+        service = WalletService()
+        user_id = f"user-{uuid4()}"
+        self._seed_wallet(user_id=user_id, balance=Decimal("5"))
+
+        async def run() -> tuple[Decimal, Decimal]:
+            async with self.session_factory() as session:
+                wallet = await service.get_or_create_wallet(session, user_id=user_id)
+                await service.stage_grant(session, user_id=user_id, amount=2.0)
+                result = await service.stage_debit(session, user_id=user_id, credits_burned=0.5)
+                await session.commit()
+                return wallet.balance, result.new_balance
+
+        loaded_balance, new_balance = asyncio.run(run())
+        self.assertEqual(loaded_balance, Decimal("6.5"))
+        self.assertEqual(new_balance, Decimal("6.5"))
+
+    def test_stage_grant_once_skips_duplicate_reference(self) -> None:
+        service = WalletService()
+        user_id = f"user-{uuid4()}"
+        self._seed_wallet(user_id=user_id, balance=Decimal("1"))
+
+        async def grant() -> DebitResult | None:
+            async with self.session_factory() as session:
+                result = await service.stage_grant_once(session, user_id=user_id, amount=4.0, reference_id="pi_once")
+                await session.commit()
+                return result
+
+        async def fetch_balance() -> Decimal:
+            async with self.session_factory() as session:
+                wallet = await session.scalar(select(CreditWallet).where(CreditWallet.user_id == user_id))
+                return wallet.balance
+
+        first = asyncio.run(grant())
+        second = asyncio.run(grant())
+        self.assertIsNotNone(first)
+        self.assertIsNone(second)
+        self.assertEqual(asyncio.run(fetch_balance()), Decimal("5"))
+
     def test_stage_debit_does_not_commit(self) -> None:
         service = WalletService()
         user_id = f"user-{uuid4()}"